@@ -4,67 +4,114 @@ Pure class API endpoints for all AI capabilities
 No emojis, professional naming, high-class design
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Query
-from fastapi.responses import FileResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Query, Request, Response, Depends
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Literal
 from datetime import datetime
+import asyncio
+import hashlib
 import logging
+import mimetypes
 import os
+import tempfile
 from pathlib import Path
 import uuid
 
 from ultimate_gemini_engine import TRONGeminiEngine, EngineCapabilities
+from image_asset_store import image_store, supports_format, THUMBNAIL_WIDTH
+from image_pipeline import image_postprocessor, PipelineOverloadedError
+from live_session_bridge import LiveSessionBridge, live_metrics
+from chat_session_manager import chat_sessions, ChatSessionNotFoundError
+from file_upload_cache import UPLOAD_DIR, upload_cache
+from code_execution_pool import code_executor
+from json_serialization import json_response, dumps
+from request_tracing import TracedRoute
+from event_loop_monitor import loop_monitor
+from tenant_scheduler import tenant_scheduler, tenant_admission, TenantTicket, resolve_tenant
+from request_deadlines import request_guard, deadline_metrics, deadline_policy, DEADLINE_HEADER
+from health_prober import health_prober
+from response_models import (
+    ChatResponse, ImageGenerationResponse, WebResearchResponse, CodeExecutionResponse,
+    BrowserControlResponse, FileCreationResponse, FileAnalysisResponse, DatasetAnalysisResponse,
+    LiveInteractionResponse, WorkflowResponse, SystemAnalyticsResponse, CapabilityInfoResponse,
+    ResponseShape, response_shape
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once by main via logging_pipeline; request lines carry
+# sizes as structured fields rather than prompt text
 logger = logging.getLogger(__name__)
 
-# Initialize router and engine
-router = APIRouter(prefix="/api/ultimate-ai", tags=["ultimate-ai"])
-tron_engine = TRONGeminiEngine()
-
-# CORS middleware for cross-origin requests
-router.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# WebSocket close code for a rejected live stream; sent before accept it surfaces as an HTTP 403
+WS_TRY_AGAIN_LATER = 1013
+
+# Initialize router; the engine is constructed on first use to keep imports cheap
+router = APIRouter(prefix="/api/ultimate-ai", tags=["ultimate-ai"], route_class=TracedRoute)
+_tron_engine: Optional[TRONGeminiEngine] = None
+
+def get_tron_engine() -> TRONGeminiEngine:
+    """Return the shared engine instance, creating it on first use"""
+    global _tron_engine
+    if _tron_engine is None:
+        _tron_engine = TRONGeminiEngine()
+    return _tron_engine
 
 # =============================================================================
 # REQUEST MODELS
 # =============================================================================
 
-class ImageGenerationRequest(BaseModel):
+class PrioritizedRequest(BaseModel):
+    priority: Optional[Literal["interactive", "batch"]] = Field(
+        default=None,
+        description="Scheduling lane; overrides the X-Priority header. Batch uses only spare capacity"
+    )
+
+class ChatRequest(PrioritizedRequest):
+    message: str = Field(..., description="User message")
+    session_id: Optional[str] = Field(default=None, description="Session ID issued by a previous turn; omit to start a new one")
+
+class ImageGenerationRequest(PrioritizedRequest):
     prompt: str = Field(..., description="Image generation prompt")
-    config: Optional[Dict[str, Any]] = Field(default=None, description="Additional configuration")
+    config: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Additional configuration; 'post_processing' lists operations such as "
+                    "resize, thumbnail, convert, strip_exif and perceptual_hash"
+    )
 
-class WebResearchRequest(BaseModel):
+class WebResearchRequest(PrioritizedRequest):
     query: str = Field(..., description="Research query")
     context: Optional[str] = Field(default=None, description="Additional context")
 
-class CodeExecutionRequest(BaseModel):
+class CodeExecutionRequest(PrioritizedRequest):
     code: str = Field(..., description="Code to execute")
     language: str = Field(default="python", description="Programming language")
     context: Optional[str] = Field(default=None, description="Additional context")
+    analyze: bool = Field(default=False, description="Also ask the model to analyze the code and its output")
 
-class BrowserControlRequest(BaseModel):
+class BrowserControlRequest(PrioritizedRequest):
     task_description: str = Field(..., description="Browser automation task")
     url: Optional[str] = Field(default=None, description="Target URL")
 
-class FileCreationRequest(BaseModel):
+class FileCreationRequest(PrioritizedRequest):
     content: str = Field(..., description="File content")
     filename: str = Field(..., description="File name without extension")
-    format: str = Field(default="txt", description="File format")
+    format: str = Field(default="txt", description="File format: pdf, docx, xlsx (CSV rows) or any text extension")
 
-class LiveInteractionRequest(BaseModel):
+class FileAnalysisRequest(PrioritizedRequest):
+    prompt: str = Field(..., description="What to analyze or extract")
+    file_ids: List[str] = Field(..., min_length=1, description="Upload IDs returned by /upload-file")
+
+class DatasetAnalysisRequest(PrioritizedRequest):
+    file_id: str = Field(..., description="Upload ID of a CSV/TSV/XLSX file returned by /upload-file")
+    question: Optional[str] = Field(default=None, description="Specific question about the data")
+    include_insights: bool = Field(default=True, description="Ask the model to interpret the summary")
+
+class LiveInteractionRequest(PrioritizedRequest):
     interaction_type: str = Field(..., description="Type of interaction: audio, video, text")
     data: Dict[str, Any] = Field(..., description="Interaction data")
 
-class WorkflowRequest(BaseModel):
+class WorkflowRequest(PrioritizedRequest):
     workflow_description: str = Field(..., description="Workflow description")
     tasks: List[Dict[str, Any]] = Field(..., description="Tasks to execute")
 
@@ -76,125 +123,295 @@ class WorkflowRequest(BaseModel):
 async def get_system_status():
     """Get comprehensive system status and health"""
     try:
-        analytics = tron_engine.get_system_analytics()
-        capabilities = tron_engine.get_capability_info()
+        analytics = get_tron_engine().get_system_analytics()
+        capabilities = get_tron_engine().get_capability_info()
         
-        return {
+        return json_response({
             "system": "operational",
             "timestamp": datetime.now().isoformat(),
             "analytics": analytics,
             "capabilities": capabilities,
             "uptime": "active"
-        }
+        })
     except Exception as e:
         logger.error(f"Status check failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"System status check failed: {str(e)}")
 
-@router.get("/capabilities")
+@router.get("/capabilities", response_model=CapabilityInfoResponse)
 async def get_capabilities():
     """Get detailed information about available capabilities"""
     try:
-        return tron_engine.get_capability_info()
+        return json_response(get_tron_engine().get_capability_info())
     except Exception as e:
         logger.error(f"Capabilities retrieval failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Capabilities retrieval failed: {str(e)}")
 
-@router.post("/generate-image")
-async def generate_image(request: ImageGenerationRequest):
+@router.post("/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest, shape: ResponseShape = Depends(response_shape(ChatResponse)),
+               ticket: TenantTicket = Depends(tenant_admission("text_generation"))):
+    """Multi-turn text chat; history is kept server-side per session"""
+    try:
+        logger.info("Chat request", extra={"session_id": request.session_id, "message_chars": len(request.message)})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().chat(
+                message=request.message,
+                session_id=request.session_id,
+                tenant=ticket.tenant
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
+    except ChatSessionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Chat API failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+@router.delete("/chat/{session_id}")
+async def delete_chat_session(session_id: str, request: Request):
+    """End a chat session and discard its history"""
+    try:
+        tenant, _ = resolve_tenant(request)
+        deleted = await chat_sessions.delete(session_id, tenant)
+        return {
+            "success": True,
+            "session_id": session_id,
+            "deleted": deleted,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Chat session deletion failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Chat session deletion failed: {str(e)}")
+
+@router.post("/generate-image", response_model=ImageGenerationResponse)
+async def generate_image(request: ImageGenerationRequest, shape: ResponseShape = Depends(response_shape(ImageGenerationResponse)),
+                         ticket: TenantTicket = Depends(tenant_admission("image_generation"))):
     """Generate professional images using Gemini 2.5 Flash Image"""
     try:
-        logger.info(f"Image generation request: {request.prompt[:100]}...")
-        result = await tron_engine.generate_image(
-            prompt=request.prompt,
-            config=request.config
-        )
-        return result
+        logger.info("Image generation request", extra={"prompt_chars": len(request.prompt)})
+        if request.config and "post_processing" in request.config:
+            try:
+                image_postprocessor.validate(request.config["post_processing"])
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().generate_image(
+                prompt=request.prompt,
+                config=request.config
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
+    except PipelineOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except Exception as e:
         logger.error(f"Image generation API failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Image generation failed: {str(e)}")
 
-@router.post("/research-web")
-async def research_web(request: WebResearchRequest):
+@router.post("/research-web", response_model=WebResearchResponse)
+async def research_web(request: WebResearchRequest, shape: ResponseShape = Depends(response_shape(WebResearchResponse)),
+                       ticket: TenantTicket = Depends(tenant_admission("web_research"))):
     """Conduct real-time web research with Google Search grounding"""
     try:
-        logger.info(f"Web research request: {request.query[:100]}...")
-        result = await tron_engine.research_web(
-            query=request.query,
-            context=request.context
-        )
-        return result
+        logger.info("Web research request", extra={"query_chars": len(request.query)})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().research_web(
+                query=request.query,
+                context=request.context
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Web research API failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Web research failed: {str(e)}")
 
-@router.post("/execute-code")
-async def execute_code(request: CodeExecutionRequest):
+@router.post("/execute-code", response_model=CodeExecutionResponse)
+async def execute_code(request: CodeExecutionRequest, shape: ResponseShape = Depends(response_shape(CodeExecutionResponse)),
+                       ticket: TenantTicket = Depends(tenant_admission("code_execution"))):
     """Execute code in Python sandbox environment"""
     try:
-        logger.info(f"Code execution request: {request.language}, length: {len(request.code)}")
-        result = await tron_engine.execute_code(
-            code=request.code,
-            language=request.language,
-            context=request.context
-        )
-        return result
+        logger.info("Code execution request", extra={"language": request.language, "code_chars": len(request.code)})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().execute_code(
+                code=request.code,
+                language=request.language,
+                context=request.context,
+                analyze=request.analyze
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Code execution API failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Code execution failed: {str(e)}")
 
-@router.post("/control-browser")
-async def control_browser(request: BrowserControlRequest):
+@router.post("/execute-code/stream")
+async def execute_code_stream(request: CodeExecutionRequest,
+                              ticket: TenantTicket = Depends(tenant_admission("code_execution"))):
+    """Execute Python code and stream stdout/stderr as newline-delimited JSON"""
+    if not code_executor.enabled:
+        raise HTTPException(status_code=501, detail="Local code execution is disabled on this server")
+    if request.language.lower() != "python":
+        raise HTTPException(status_code=400, detail="Streaming execution supports Python only")
+    
+    # StreamingResponse cancels the body on disconnect itself, so the guard only enforces the deadline
+    ticket.deadline = deadline_policy.resolve(ticket.capability, ticket.request.headers.get(DEADLINE_HEADER))
+    ticket.request = None
+    
+    async def event_stream():
+        try:
+            async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+                async for event in code_executor.stream(request.code):
+                    yield dumps(event) + b"\n"
+        except HTTPException as e:
+            # Headers are already sent, so a deadline or queue rejection ends the stream with an error event
+            yield dumps({"type": "result", "ok": False, "status": e.status_code, "error": e.detail}) + b"\n"
+    
+    logger.info("Streaming code execution request", extra={"code_chars": len(request.code)})
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+@router.post("/control-browser", response_model=BrowserControlResponse)
+async def control_browser(request: BrowserControlRequest, shape: ResponseShape = Depends(response_shape(BrowserControlResponse)),
+                          ticket: TenantTicket = Depends(tenant_admission("browser_control"))):
     """Control web browsers using Computer Use model"""
     try:
-        logger.info(f"Browser control request: {request.task_description[:100]}...")
-        result = await tron_engine.control_browser(
-            task_description=request.task_description,
-            url=request.url
-        )
-        return result
+        logger.info("Browser control request", extra={"task_chars": len(request.task_description), "url": request.url})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().control_browser(
+                task_description=request.task_description,
+                url=request.url
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Browser control API failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Browser control failed: {str(e)}")
 
-@router.post("/create-file")
-async def create_file(request: FileCreationRequest):
+@router.post("/create-file", response_model=FileCreationResponse)
+async def create_file(request: FileCreationRequest, shape: ResponseShape = Depends(response_shape(FileCreationResponse)),
+                      ticket: TenantTicket = Depends(tenant_admission("file_creation"))):
     """Create and save files in any format"""
     try:
-        logger.info(f"File creation request: {request.filename}.{request.format}")
-        result = await tron_engine.create_file(
-            content=request.content,
-            filename=request.filename,
-            format_type=request.format
-        )
-        return result
+        logger.info("File creation request", extra={"format": request.format, "content_chars": len(request.content)})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().create_file(
+                content=request.content,
+                filename=request.filename,
+                format_type=request.format
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"File creation API failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"File creation failed: {str(e)}")
 
-@router.post("/live-interaction")
-async def live_interaction(request: LiveInteractionRequest):
+@router.post("/analyze-files", response_model=FileAnalysisResponse)
+async def analyze_files(request: FileAnalysisRequest, shape: ResponseShape = Depends(response_shape(FileAnalysisResponse)),
+                        ticket: TenantTicket = Depends(tenant_admission("file_analysis"))):
+    """Analyze uploaded images and documents with the vision model"""
+    try:
+        logger.info("File analysis request", extra={"file_count": len(request.file_ids)})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().analyze_files(
+                prompt=request.prompt,
+                file_ids=request.file_ids
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"File analysis API failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"File analysis failed: {str(e)}")
+
+@router.post("/analyze-dataset", response_model=DatasetAnalysisResponse)
+async def analyze_dataset(request: DatasetAnalysisRequest, shape: ResponseShape = Depends(response_shape(DatasetAnalysisResponse)),
+                          ticket: TenantTicket = Depends(tenant_admission("data_analysis"))):
+    """Summarize large tabular uploads in parallel chunks"""
+    try:
+        logger.info("Dataset analysis request", extra={"file_id": request.file_id})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().analyze_dataset(
+                file_id=request.file_id,
+                question=request.question,
+                include_insights=request.include_insights
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Dataset analysis API failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Dataset analysis failed: {str(e)}")
+
+@router.post("/live-interaction", response_model=LiveInteractionResponse)
+async def live_interaction(request: LiveInteractionRequest, shape: ResponseShape = Depends(response_shape(LiveInteractionResponse)),
+                           ticket: TenantTicket = Depends(tenant_admission("live_interactions"))):
     """Handle real-time voice/video interactions"""
     try:
-        logger.info(f"Live interaction request: {request.interaction_type}")
-        result = await tron_engine.live_interaction(
-            interaction_type=request.interaction_type,
-            data=request.data
-        )
-        return result
+        logger.info("Live interaction request", extra={"interaction_type": request.interaction_type})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().live_interaction(
+                interaction_type=request.interaction_type,
+                data=request.data
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Live interaction API failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Live interaction failed: {str(e)}")
 
-@router.post("/execute-workflow")
-async def execute_workflow(request: WorkflowRequest):
+@router.websocket("/live")
+async def live_stream(websocket: WebSocket, interaction_type: str = "audio"):
+    """Stream audio and text both ways over a persistent live session"""
+    # Admitted like any engine call, before the upgrade is accepted; the session then
+    # counts against the tenant's open live session cap until it closes
+    tenant, _ = resolve_tenant(websocket)
+    try:
+        tenant_scheduler.check_rate(tenant, "live_interactions")
+        with tenant_scheduler.live_session(tenant):
+            await _serve_live_stream(websocket, interaction_type)
+    except HTTPException as e:
+        logger.info("Live stream rejected", extra={"tenant": tenant, "reason": e.detail})
+        await websocket.close(code=WS_TRY_AGAIN_LATER, reason=e.detail)
+
+async def _serve_live_stream(websocket: WebSocket, interaction_type: str):
+    await websocket.accept()
+    started = datetime.now()
+    logger.info("Live stream opened", extra={"interaction_type": interaction_type})
+    try:
+        async with get_tron_engine().open_live_session(interaction_type) as session:
+            await LiveSessionBridge(websocket, interaction_type).run(session)
+    except WebSocketDisconnect:
+        logger.info("Live stream closed by client")
+    except Exception as e:
+        logger.error(f"Live stream failed: {str(e)}")
+        try:
+            await websocket.send_json({"type": "error", "detail": f"Live stream failed: {str(e)}"})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
+    finally:
+        # A stream's duration is not a response time; it is recorded with the live metrics instead
+        live_metrics.session_duration.record((datetime.now() - started).total_seconds())
+        get_tron_engine()._track_metrics("live_interactions", None)
+
+@router.post("/execute-workflow", response_model=WorkflowResponse)
+async def execute_workflow(request: WorkflowRequest, shape: ResponseShape = Depends(response_shape(WorkflowResponse)),
+                           ticket: TenantTicket = Depends(tenant_admission("workflows"))):
     """Execute multi-task workflows combining all capabilities"""
     try:
-        logger.info(f"Workflow execution request: {request.workflow_description[:100]}...")
-        result = await tron_engine.execute_workflow(
-            workflow_description=request.workflow_description,
-            tasks=request.tasks
-        )
-        return result
+        logger.info("Workflow execution request", extra={"task_count": len(request.tasks)})
+        async with request_guard(ticket), tenant_scheduler.slot(ticket, request.priority):
+            result = await get_tron_engine().execute_workflow(
+                workflow_description=request.workflow_description,
+                tasks=request.tasks
+            )
+        return json_response(shape.apply(result))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Workflow execution API failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(e)}")
@@ -216,7 +433,7 @@ async def download_file(filename: str):
         return FileResponse(
             path=file_path,
             filename=filename,
-            media_type='application/octet-stream'
+            media_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
         )
     except HTTPException:
         raise
@@ -224,15 +441,53 @@ async def download_file(filename: str):
         logger.error(f"File download failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"File download failed: {str(e)}")
 
+@router.get("/images/{image_id}")
+async def get_image(
+    image_id: str,
+    request: Request,
+    format: Optional[str] = Query(default=None, description="Transcode to png, jpeg, webp or avif"),
+    width: Optional[int] = Query(default=None, ge=16, le=4096, description="Resize to this width"),
+    thumbnail: bool = Query(default=False, description="Return a small preview rendition")
+):
+    """Serve generated images as binary content with long-lived caching"""
+    try:
+        if format:
+            format = format.lower()
+            if not supports_format(format):
+                raise HTTPException(status_code=415, detail=f"Unsupported image format: {format}")
+        if thumbnail:
+            width = min(width or THUMBNAIL_WIDTH, THUMBNAIL_WIDTH)
+        
+        # Variants are content-addressed, so the ETag never changes for a given URL
+        etag = f'"{image_id}-{format or "orig"}-{width or 0}"'
+        cache_headers = {
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "ETag": etag
+        }
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+        
+        variant = await asyncio.to_thread(image_store.get_variant, image_id, format, width)
+        if variant is None:
+            raise HTTPException(status_code=404, detail="Image not found")
+        
+        file_path, media_type = variant
+        return FileResponse(path=file_path, media_type=media_type, headers=cache_headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Image delivery failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Image delivery failed: {str(e)}")
+
 # =============================================================================
 # ANALYTICS AND MONITORING ENDPOINTS
 # =============================================================================
 
-@router.get("/analytics")
+@router.get("/analytics", response_model=SystemAnalyticsResponse)
 async def get_system_analytics():
     """Get comprehensive system analytics and monitoring data"""
     try:
-        return tron_engine.get_system_analytics()
+        return json_response(get_tron_engine().get_system_analytics())
     except Exception as e:
         logger.error(f"Analytics retrieval failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analytics retrieval failed: {str(e)}")
@@ -241,7 +496,7 @@ async def get_system_analytics():
 async def get_capability_usage():
     """Get detailed capability usage statistics"""
     try:
-        analytics = tron_engine.get_system_analytics()
+        analytics = get_tron_engine().get_system_analytics()
         return {
             "capability_usage": analytics["capability_usage"],
             "total_requests": analytics["total_requests"],
@@ -255,7 +510,7 @@ async def get_capability_usage():
 async def get_performance_metrics():
     """Get detailed performance metrics"""
     try:
-        analytics = tron_engine.get_system_analytics()
+        analytics = get_tron_engine().get_system_analytics()
         return {
             "performance_metrics": analytics["performance_metrics"],
             "error_rate": analytics["error_rate"],
@@ -270,7 +525,7 @@ async def get_performance_metrics():
 async def get_models_status():
     """Get status of all AI models"""
     try:
-        capabilities = tron_engine.get_capability_info()
+        capabilities = get_tron_engine().get_capability_info()
         return {
             "models_status": capabilities["models_status"],
             "capabilities_status": capabilities["capabilities"],
@@ -280,6 +535,31 @@ async def get_models_status():
         logger.error(f"Models status retrieval failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Models status retrieval failed: {str(e)}")
 
+@router.get("/analytics/event-loop")
+async def get_event_loop_diagnostics():
+    """Get event-loop lag percentiles and recent blocking callbacks with their stacks"""
+    try:
+        return {
+            "event_loop": loop_monitor.get_metrics(),
+            "recent_blocking_events": loop_monitor.recent_blocking_events(),
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Event loop diagnostics retrieval failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Event loop diagnostics retrieval failed: {str(e)}")
+
+@router.get("/analytics/tenants")
+async def get_tenant_scheduling():
+    """Get per-lane and per-tenant queue depth, wait times and rate-limit rejections"""
+    try:
+        return {
+            "scheduler": tenant_scheduler.get_metrics(),
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Tenant scheduling retrieval failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Tenant scheduling retrieval failed: {str(e)}")
+
 # =============================================================================
 # UPLOAD ENDPOINTS
 # =============================================================================
@@ -289,24 +569,30 @@ async def upload_file(file: UploadFile = File(...)):
     """Handle file uploads for processing"""
     try:
         # Create upload directory
-        upload_dir = Path(tempfile.gettempdir()) / "tron_ai_uploads"
-        upload_dir.mkdir(exist_ok=True)
+        UPLOAD_DIR.mkdir(exist_ok=True)
         
         # Generate unique filename
         file_extension = Path(file.filename).suffix if file.filename else ""
         unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = upload_dir / unique_filename
+        file_path = UPLOAD_DIR / unique_filename
         
-        # Save uploaded file
+        # Save uploaded file in chunks, hashing as we go so later analysis
+        # requests can reuse remote uploads without re-reading the file
+        sha = hashlib.sha256()
+        size = 0
         with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+            while chunk := await file.read(1024 * 1024):
+                sha.update(chunk)
+                size += len(chunk)
+                buffer.write(chunk)
+        upload_cache.record_digest(file_path, sha.hexdigest())
         
         return {
             "success": True,
             "filename": unique_filename,
             "original_filename": file.filename,
-            "size": len(content),
+            "size": size,
+            "digest": f"sha256:{sha.hexdigest()}",
             "path": str(file_path),
             "timestamp": datetime.now().isoformat()
         }
@@ -331,7 +617,7 @@ async def health_check():
 async def get_metrics():
     """Prometheus-compatible metrics endpoint"""
     try:
-        analytics = tron_engine.get_system_analytics()
+        analytics = get_tron_engine().get_system_analytics()
         
         metrics = {
             "tron_ai_total_requests": analytics["total_requests"],
@@ -345,6 +631,32 @@ async def get_metrics():
         for capability, count in analytics["capability_usage"].items():
             metrics[f"tron_ai_capability_{capability}_usage"] = count
         
+        # Event-loop lag percentiles and blocking callback count
+        loop_metrics = loop_monitor.get_metrics()
+        for key in ("lag_p50_ms", "lag_p95_ms", "lag_p99_ms", "lag_max_ms", "blocking_events"):
+            metrics[f"tron_ai_event_loop_{key}"] = loop_metrics[key]
+        
+        # Engine slot occupancy across all tenants
+        scheduler_metrics = tenant_scheduler.get_metrics()
+        for key in ("in_flight", "queued", "tracked_tenants", "batch_limit"):
+            metrics[f"tron_ai_scheduler_{key}"] = scheduler_metrics[key]
+        for lane, lane_metrics in scheduler_metrics["lanes"].items():
+            for key in ("queued", "in_flight", "wait_p50_ms", "wait_p99_ms"):
+                metrics[f"tron_ai_scheduler_{lane}_{key}"] = lane_metrics[key]
+        
+        # Work abandoned at its deadline versus by the client, queued or mid model call
+        deadlines = deadline_metrics.get_metrics()
+        for key in ("expired_queued", "expired_in_flight", "cancelled_queued", "cancelled_in_flight"):
+            metrics[f"tron_ai_requests_{key}"] = deadlines[key]
+        
+        # Cached outcome of the background health probes
+        health = health_prober.get_metrics()
+        metrics["tron_ai_ready"] = int(health["ready"])
+        for name, check in health["checks"].items():
+            metrics[f"tron_ai_health_{name}_ok"] = int(check["status"] != "failed")
+            if check["latency_ms"] is not None:
+                metrics[f"tron_ai_health_{name}_latency_ms"] = check["latency_ms"]
+        
         return metrics
     except Exception as e:
         logger.error(f"Metrics retrieval failed: {str(e)}")
@@ -355,4 +667,4 @@ async def get_metrics():
 # =============================================================================
 
 # Export router for use in main application
-__all__ = ["router", "tron_engine"]
\ No newline at end of file
+__all__ = ["router", "get_tron_engine"]
\ No newline at end of file
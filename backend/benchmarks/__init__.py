@@ -0,0 +1,4 @@
+"""
+TRON Ultimate AI Platform - Benchmarks
+Run from the backend directory, e.g. python -m benchmarks.bench_code_execution
+"""
@@ -0,0 +1,82 @@
+"""
+TRON Ultimate AI Platform - Code Execution Benchmark
+Executions per second of the pre-started single-use worker pool versus a fresh interpreter per run
+
+Usage: python -m benchmarks.bench_code_execution [--runs N] [--workers N]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import subprocess
+
+from code_execution_pool import CodeExecutionPool
+
+SNIPPET = "total = sum(i * i for i in range(1000))\nprint(total)"
+
+
+async def bench_warm_pool(runs: int, workers: int) -> dict:
+    pool = CodeExecutionPool(size=workers, enabled=True)
+    await pool.start()
+    try:
+        # Latency a request sees while a pre-started worker is idle (the pool is not saturated)
+        warm_ms = 0.0
+        for _ in range(runs):
+            while pool.get_metrics()["idle_workers"] < pool.size:
+                await asyncio.sleep(0.01)
+            started = time.perf_counter()
+            await pool.execute(SNIPPET)
+            warm_ms += (time.perf_counter() - started) * 1000
+
+        # Back-to-back runs are bounded by how fast single-use workers are replaced
+        started = time.perf_counter()
+        for _ in range(runs):
+            await pool.execute(SNIPPET)
+        sequential = time.perf_counter() - started
+
+        # Concurrent runs measure pool throughput
+        started = time.perf_counter()
+        await asyncio.gather(*(pool.execute(SNIPPET) for _ in range(runs)))
+        concurrent = time.perf_counter() - started
+    finally:
+        await pool.shutdown()
+
+    return {
+        "warm_latency_ms": warm_ms / runs,
+        "sequential_per_second": runs / sequential,
+        "sequential_latency_ms": sequential / runs * 1000,
+        "concurrent_per_second": runs / concurrent
+    }
+
+
+def bench_cold_spawn(runs: int) -> dict:
+    started = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run([sys.executable, "-c", SNIPPET], capture_output=True, check=True)
+    elapsed = time.perf_counter() - started
+    return {"per_second": runs / elapsed, "latency_ms": elapsed / runs * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--cold-runs", type=int, default=20)
+    args = parser.parse_args()
+
+    warm = asyncio.run(bench_warm_pool(args.runs, args.workers))
+    cold = bench_cold_spawn(args.cold_runs)
+
+    print(f"Warm pool ({args.workers} workers, {args.runs} runs)")
+    print(f"  idle worker: {warm['warm_latency_ms']:7.2f} ms/exec")
+    print(f"  sequential:  {warm['sequential_per_second']:8.1f} exec/s  {warm['sequential_latency_ms']:7.2f} ms/exec")
+    print(f"  concurrent:  {warm['concurrent_per_second']:8.1f} exec/s")
+    print(f"Cold interpreter ({args.cold_runs} runs)")
+    print(f"  sequential:  {cold['per_second']:8.1f} exec/s  {cold['latency_ms']:7.2f} ms/exec")
+    # Workers are single-use, so sustained throughput is bounded by replacement; the win is request latency
+    print(f"Latency speedup with an idle worker: {cold['latency_ms'] / warm['warm_latency_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+TRON Ultimate AI Platform - Hot Path Micro-Benchmarks
+Per-operation cost of the request overhead we control, compared against a stored baseline
+
+Covers request model validation, engine metrics and analytics, the capability
+catalog, prompt construction, response serialization and database row building.
+Exits non-zero when a case is slower than its baseline by more than the threshold.
+Samples are taken in rounds across all cases, so a slow spell on a shared machine
+costs every case one sample instead of every sample of a few cases. A fixed
+calibration workload is timed in every round too, and each case is compared as
+its cost relative to the calibration sample of the same round, so a VM that
+runs twice as fast or slow for a while does not move the result. Memory layout
+still shifts whole groups of cases by 30-50% in some processes, so results are
+the per-case median over several processes (--runs: 3, or 5 when saving a baseline).
+
+Usage:
+    python -m benchmarks.bench_hot_paths                    # compare with baseline.json
+    python -m benchmarks.bench_hot_paths --save-baseline    # record a new baseline
+    python -m benchmarks.bench_hot_paths --filter prompt --output results.json
+"""
+
+import sys
+import json
+import time
+import timeit
+import inspect
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, Any, List
+
+from pydantic import BaseModel
+
+import api_router
+import prompt_builder
+from json_serialization import dumps
+from payload_blob_store import PayloadOffloader, LocalPayloadBlobStore
+from supabase_database_manager import SupabaseDatabaseManager
+from ultimate_gemini_engine import TRONGeminiEngine
+from benchmarks.bench_serialization import build_payloads
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEATS = 9
+DEFAULT_RUNS = 3
+DEFAULT_BASELINE_RUNS = 5
+# Short samples keep several processes affordable; the median over rounds absorbs their jitter
+SAMPLE_SECONDS = 0.05
+CALIBRATION_CASE = "calibration"
+
+# One representative payload per request model in api_router
+REQUEST_SAMPLES = {
+    "PrioritizedRequest": {"priority": "batch"},
+    "ChatRequest": {"message": "Summarize the quarterly report", "session_id": "5f0c6a1e"},
+    "ImageGenerationRequest": {"prompt": "A city skyline at dusk", "config": {"post_processing": [{"op": "thumbnail"}]}},
+    "WebResearchRequest": {"query": "state of solid-state batteries", "context": "for an investor brief"},
+    "CodeExecutionRequest": {"code": "print(sum(range(10)))", "language": "python", "analyze": True},
+    "BrowserControlRequest": {"task_description": "Find the pricing page", "url": "https://example.com"},
+    "FileCreationRequest": {"content": "# Report\n\nBody text", "filename": "report", "format": "pdf"},
+    "FileAnalysisRequest": {"prompt": "Extract the totals", "file_ids": ["a.png", "b.pdf"]},
+    "DatasetAnalysisRequest": {"file_id": "data.csv", "question": "Which region grew fastest?"},
+    "LiveInteractionRequest": {"interaction_type": "text", "data": {"text": "hello", "locale": "en-US"}},
+    "WorkflowRequest": {
+        "workflow_description": "Quarterly market report",
+        "tasks": [{"type": "web_research", "id": i, "params": {"query": f"topic {i}"}} for i in range(20)]
+    }
+}
+
+
+def calibration_workload() -> List[str]:
+    """Interpreter work that no change in this repo can speed up or slow down"""
+    items = {f"key{i}": [i, str(i), i * 0.5] for i in range(32)}
+    return sorted(f"{key}={value[1]}" for key, value in items.items())
+
+
+def build_cases() -> Dict[str, Callable[[], Any]]:
+    cases: Dict[str, Callable[[], Any]] = {CALIBRATION_CASE: calibration_workload}
+
+    # Request model validation, for every *Request model the router declares
+    for name, model in inspect.getmembers(api_router, inspect.isclass):
+        if name.endswith("Request") and issubclass(model, BaseModel) and model is not BaseModel:
+            sample = REQUEST_SAMPLES.get(name)
+            if sample is None:
+                raise SystemExit(f"No benchmark sample for request model {name}; add one to REQUEST_SAMPLES")
+            cases[f"validate.{name}"] = lambda model=model, sample=sample: model.model_validate(sample)
+
+    # Engine bookkeeping
+    engine = TRONGeminiEngine()
+    for i in range(1000):
+        engine._track_metrics("web_research", 0.5 + i % 7 * 0.1)
+    cases["engine.track_metrics"] = lambda: engine._track_metrics("text_generation", 0.42)
+    cases["engine.get_system_analytics"] = engine.get_system_analytics
+    cases["engine.get_capability_info"] = engine.get_capability_info
+    cases["engine.build_capability_info"] = engine._build_capability_info
+
+    # Prompt construction
+    execution = {"stdout": "45\n" * 50, "stderr": "", "error": None}
+    workflow_tasks = REQUEST_SAMPLES["WorkflowRequest"]["tasks"]
+    dataset_summary = {"rows": 200000, "columns": {f"c{i}": {"type": "numeric", "mean": 1.5, "std": 0.2} for i in range(40)}}
+    turns = [("u" if i % 2 == 0 else "m", "A short exchange about the report. " * 4) for i in range(12)]
+    cases["prompt.chat_summary"] = lambda: prompt_builder.build_chat_summary_prompt("Earlier summary.", turns)
+    cases["prompt.image"] = lambda: prompt_builder.build_image_prompt("A city skyline at dusk")
+    cases["prompt.research"] = lambda: prompt_builder.build_research_prompt("solid-state batteries", "investor brief")
+    cases["prompt.code_analysis"] = lambda: prompt_builder.build_code_prompt("print(sum(range(10)))", "python", None, execution)
+    cases["prompt.code_remote"] = lambda: prompt_builder.build_code_prompt("fn main() {}", "rust")
+    cases["prompt.browser"] = lambda: prompt_builder.build_browser_prompt("Find the pricing page", "https://example.com")
+    cases["prompt.dataset"] = lambda: prompt_builder.build_dataset_prompt(dataset_summary, "Which column varies most?")
+    cases["prompt.live"] = lambda: prompt_builder.build_live_prompt("text", {"text": "hello", "locale": "en-US"})
+    cases["prompt.workflow"] = lambda: prompt_builder.build_workflow_prompt("Quarterly market report", workflow_tasks)
+    # Budgeted builds as the engine runs them: one that fits and one that must shrink its input
+    oversized_tasks = [{"type": "web_research", "query": "Competitor pricing update " * 40} for _ in range(200)]
+    cases["prompt.live_budgeted"] = lambda: prompt_builder.build_live_prompt(
+        "text", {"text": "hello", "locale": "en-US"}, prompt_builder.PROMPT_BUDGETS["live_interactions"])
+    cases["prompt.workflow_over_budget"] = lambda: prompt_builder.build_workflow_prompt(
+        "Quarterly market report", oversized_tasks, prompt_builder.PROMPT_BUDGETS["workflows"])
+
+    # Response serialization
+    for endpoint, payload in build_payloads().items():
+        key = endpoint.split(" ", 1)[1].strip("/").replace("/", "_").replace("-", "_")
+        cases[f"serialize.{key}"] = lambda payload=payload: dumps(payload)
+
+    # Database row building, including the inline payload offload check
+    offloader = PayloadOffloader(LocalPayloadBlobStore())
+    small_result = build_payloads()["POST /chat"]
+    cases["db.build_request_row"] = lambda: SupabaseDatabaseManager.build_request_row(
+        "5f0c6a1e-0000-4000-8000-000000000000", "text_generation", "gemini-2.5-flash",
+        "Summarize the quarterly report", small_result, 0.42
+    )
+    cases["db.build_metric_row"] = lambda: SupabaseDatabaseManager.build_metric_row("image_generation_time", 1.2)
+    cases["db.offload_inline_payload"] = lambda: offloader.offload(small_result)
+    return cases
+
+
+def measure(cases: Dict[str, Callable[[], Any]], repeats: int) -> Dict[str, Dict[str, float]]:
+    """Nanoseconds per call: size a loop count per case, then take one sample of every case per round"""
+    timers = {name: timeit.Timer(func) for name, func in cases.items()}
+    loops = {}
+    for name, timer in timers.items():
+        number, seconds = timer.autorange()
+        loops[name] = max(1, round(number * SAMPLE_SECONDS / seconds))
+    samples: Dict[str, List[float]] = {name: [] for name in cases}
+    for _ in range(repeats):
+        for name, timer in timers.items():
+            samples[name].append(timer.timeit(loops[name]) / loops[name] * 1e9)
+    calibration = samples[CALIBRATION_CASE]
+    return {
+        name: {
+            "median_ns": statistics.median(values),
+            "min_ns": min(values),
+            # Cost in calibration units, paired round by round so drift in machine speed cancels
+            "relative": statistics.median(value / reference for value, reference in zip(values, calibration)),
+            "loops": loops[name]
+        }
+        for name, values in samples.items()
+    }
+
+
+def measure_in_processes(name_filter: str, repeats: int, runs: int) -> Dict[str, Dict[str, float]]:
+    """Per-case median of the medians from separate benchmark processes"""
+    reports = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for run in range(runs):
+            output = Path(scratch) / f"run{run}.json"
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_hot_paths", "--filter", name_filter,
+                 "--repeats", str(repeats), "--runs", "1", "--baseline", str(Path(scratch) / "none.json"),
+                 "--output", str(output)],
+                cwd=Path(__file__).resolve().parent.parent, stdout=subprocess.DEVNULL, check=True
+            )
+            reports.append(json.loads(output.read_text())["results"])
+    return {
+        name: {
+            "median_ns": statistics.median(report[name]["median_ns"] for report in reports),
+            "min_ns": min(report[name]["min_ns"] for report in reports),
+            "relative": statistics.median(report[name]["relative"] for report in reports),
+            "loops": reports[0][name]["loops"]
+        }
+        for name in reports[0]
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--output", type=Path, help="Also write results to this JSON file")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Sampling rounds over all cases")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"Allowed slowdown ratio (default: baseline's, else {DEFAULT_THRESHOLD})")
+    parser.add_argument("--runs", type=int, default=None,
+                        help=f"Separate processes to measure in (default: {DEFAULT_BASELINE_RUNS} when saving, else {DEFAULT_RUNS})")
+    args = parser.parse_args()
+
+    runs = args.runs or (DEFAULT_BASELINE_RUNS if args.save_baseline else DEFAULT_RUNS)
+    if runs > 1:
+        results = measure_in_processes(args.filter, args.repeats, runs)
+    else:
+        cases = {name: func for name, func in build_cases().items()
+                 if args.filter in name or name == CALIBRATION_CASE}
+        results = measure(cases, args.repeats)
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    default_threshold = args.threshold
+    if default_threshold is None:
+        default_threshold = baseline.get("threshold", DEFAULT_THRESHOLD) if baseline else DEFAULT_THRESHOLD
+    overrides = baseline.get("thresholds", {}) if baseline else {}
+    references = (baseline or {}).get("results", {})
+
+    if CALIBRATION_CASE in references:
+        speed = references[CALIBRATION_CASE]["median_ns"] / results[CALIBRATION_CASE]["median_ns"]
+        print(f"Machine speed vs baseline: {speed:.2f}x (changes below are relative to calibration)")
+
+    regressions = []
+    print(f"{'case':<40} {'median':>12} {'baseline':>12} {'change':>8}")
+    for name, result in results.items():
+        reference = references.get(name)
+        line = f"{name:<40} {result['median_ns'] / 1000:>10.2f}us"
+        if reference and name != CALIBRATION_CASE:
+            if "relative" in reference:
+                change = result["relative"] / reference["relative"] - 1
+            else:
+                change = result["median_ns"] / reference["median_ns"] - 1
+            line += f" {reference['median_ns'] / 1000:>10.2f}us {change:>+7.0%}"
+            if change > overrides.get(name, default_threshold):
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        report["threshold"] = default_threshold
+        report["thresholds"] = overrides
+        if baseline and args.filter:
+            # Partial runs update only the cases they measured; relative costs stay comparable
+            measured = {name: result for name, result in results.items() if name != CALIBRATION_CASE}
+            report["results"] = {**references, **measured}
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if regressions:
+        print(f"FAIL: {len(regressions)} case(s) slower than baseline: {', '.join(regressions)}")
+        sys.exit(1)
+    print("PASS" if baseline else "No baseline found; run with --save-baseline to record one")
+
+
+if __name__ == "__main__":
+    main()
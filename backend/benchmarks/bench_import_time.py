@@ -0,0 +1,112 @@
+"""
+TRON Ultimate AI Platform - Import Time Budget
+Profiles `import main` with -X importtime and fails when startup regresses
+
+Exits non-zero when the median import time exceeds the budget or when a
+heavy module that must load lazily is imported at startup.
+
+Usage: python -m benchmarks.bench_import_time [--budget-ms N] [--runs N] [--top N]
+"""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_BUDGET_MS = 1500
+
+# Modules that must only be imported on first use, never by `import main`
+LAZY_MODULES = [
+    "google.generativeai",
+    "supabase",
+    "pandas",
+    "numpy",
+    "PIL",
+    "reportlab",
+    "docx",
+    "openpyxl",
+    "zstandard",
+    "brotli",
+    "redis",
+    "uvicorn"
+]
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+PROBE = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    "import main\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print('IMPORT_SECONDS=' + str(elapsed))\n"
+    "print('EAGER_MODULES=' + ','.join(m for m in {modules!r} if m in sys.modules))\n"
+)
+
+
+def run_probe() -> tuple:
+    """Import main in a fresh interpreter; return (seconds, eager heavy modules, importtime lines)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(modules=LAZY_MODULES)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    # Application logging also goes to stdout, so pick out the probe's own lines
+    values = dict(
+        line.split("=", 1) for line in completed.stdout.splitlines()
+        if line.startswith(("IMPORT_SECONDS=", "EAGER_MODULES="))
+    )
+    eager = [name for name in values["EAGER_MODULES"].split(",") if name]
+    return float(values["IMPORT_SECONDS"]), eager, completed.stderr.splitlines()
+
+
+def top_modules(importtime_lines: list, limit: int) -> list:
+    """Modules with the highest self import time"""
+    entries = []
+    for line in importtime_lines:
+        match = IMPORT_LINE.match(line)
+        if match:
+            entries.append((int(match.group(1)), int(match.group(2)), match.group(4)))
+    return sorted(entries, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("TRON_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # The first run warms the bytecode cache and is not counted
+    run_probe()
+    samples, eager, lines = [], [], []
+    for _ in range(args.runs):
+        seconds, eager, lines = run_probe()
+        samples.append(seconds * 1000)
+
+    median_ms = statistics.median(samples)
+    print(f"import main: median {median_ms:.1f} ms, min {min(samples):.1f} ms, max {max(samples):.1f} ms "
+          f"(budget {args.budget_ms:.0f} ms)")
+    print(f"Top {args.top} modules by self time:")
+    print(f"  {'self ms':>8}  {'cumulative ms':>13}  module")
+    for self_us, cumulative_us, name in top_modules(lines, args.top):
+        print(f"  {self_us / 1000:8.1f}  {cumulative_us / 1000:13.1f}  {name}")
+
+    failures = []
+    if median_ms > args.budget_ms:
+        failures.append(f"startup import time {median_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    if eager:
+        failures.append(f"modules that must load lazily were imported at startup: {', '.join(eager)}")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+TRON Ultimate AI Platform - Response Shaping Benchmark
+Bytes on the wire and serialization time for full, compact (?compact=true) and projected (?fields=) results
+
+Each capability result carries inputs the size the frontend typically sends.
+Results are weighted by a traffic mix (request share per endpoint, override with
+--mix "chat=50,execute-workflow=5") and reported per endpoint and per average
+request, both as raw JSON and after the negotiated compression.
+
+Usage: python -m benchmarks.bench_response_shaping [--runs N] [--mix SPEC]
+"""
+
+import time
+import random
+import argparse
+from typing import Dict, Tuple
+
+import response_models
+from response_models import ResponseShape, ALWAYS_INCLUDED
+from response_compression import available_encodings, compress_body
+from json_serialization import TRONJSONResponse
+from tenant_scheduler import parse_tenant_map
+from benchmarks.bench_serialization import _result
+
+# Assumed share of requests per endpoint; pass --mix with measured shares when available
+DEFAULT_MIX = {
+    "chat": 40,
+    "research-web": 20,
+    "execute-code": 12,
+    "generate-image": 10,
+    "live-interaction": 8,
+    "control-browser": 5,
+    "execute-workflow": 5
+}
+
+# What a client typically reads from each result when it projects
+TYPICAL_FIELDS = {
+    "chat": "session_id,response",
+    "research-web": "results",
+    "execute-code": "execution,analysis",
+    "generate-image": "images",
+    "live-interaction": "response",
+    "control-browser": "results,actions",
+    "execute-workflow": "results,task_count"
+}
+
+
+VOCABULARY = (
+    "battery grid storage cost capacity cycle supplier market share quarter revenue margin pricing plan "
+    "customer churn forecast model sensor latency region cathode anode electrolyte density yield policy "
+    "tariff contract renewal audit risk segment launch roadmap survey interview benchmark dataset"
+).split()
+
+
+def prose(words: int, rng: random.Random) -> str:
+    """Varied text, so compressed sizes are not flattered by repetition"""
+    return " ".join(rng.choice(VOCABULARY) + (f" {rng.randint(1, 9999)}" if rng.random() < 0.1 else "")
+                    for _ in range(words)) + "."
+
+
+def build_results() -> Dict[str, Tuple[dict, type]]:
+    """Capability results with echoed inputs at typical request sizes"""
+    rng = random.Random(42)
+    code = "import pandas as pd\n" + "".join(
+        f"df['{rng.choice(VOCABULARY)}_{i}'] = df.{rng.choice(VOCABULARY)} * {rng.randint(2, 99)}\n" for i in range(150))
+    tasks = [{"type": "web_research", "config": {"query": f"Competitor {i} pricing and positioning", "depth": 2,
+                                                  "sources": ["news", "filings", "reviews"]}} for i in range(40)]
+    frames = {"transcript": [{"speaker": "user", "text": prose(45, rng), "offset_ms": i * 800} for i in range(60)],
+              "locale": "en-US"}
+    images = [{"id": f"{i:032x}", "url": f"/api/ultimate-ai/images/{i}", "thumbnail_url": f"/api/ultimate-ai/images/{i}?thumbnail=true",
+               "content_type": "image/png", "size_bytes": 1_200_000, "width": 1024, "height": 1024} for i in range(2)]
+    return {
+        "chat": (_result(session_id="5f0c6a1e", response=prose(270, rng), turn_count=8, context_tokens=2100,
+                         summarized_turns=0, prompt_tokens=None), response_models.ChatResponse),
+        "research-web": (_result(query="State of solid-state batteries for grid storage", results=prose(2700, rng),
+                                 context=prose(1125, rng), prompt_tokens=1400), response_models.WebResearchResponse),
+        "execute-code": (_result(code=code, language="python", executed=True,
+                                 execution={"stdout": "ok\n" * 40, "stderr": "", "error": None, "duration": 0.2},
+                                 analysis=prose(450, rng), results=prose(450, rng), execution_time=0.9, context=None,
+                                 prompt_tokens=2300), response_models.CodeExecutionResponse),
+        "generate-image": (_result(images=images, prompt=prose(60, rng), prompt_tokens=90),
+                           response_models.ImageGenerationResponse),
+        "live-interaction": (_result(interaction_type="text", response=prose(135, rng), data=frames, prompt_tokens=3200),
+                             response_models.LiveInteractionResponse),
+        "control-browser": (_result(task=prose(60, rng),
+                                    url="https://example.com/pricing", actions=[], results=prose(360, rng),
+                                    prompt_tokens=260), response_models.BrowserControlResponse),
+        "execute-workflow": (_result(workflow="Quarterly competitor report", tasks=tasks, results=prose(1800, rng),
+                                     task_count=len(tasks), prompt_tokens=2600), response_models.WorkflowResponse)
+    }
+
+
+def shapes(endpoint: str, model) -> Dict[str, ResponseShape]:
+    fields = frozenset(TYPICAL_FIELDS[endpoint].split(","))
+    return {
+        "full": ResponseShape(),
+        "compact": ResponseShape(exclude=model.echoed_fields),
+        "fields": ResponseShape(include=fields | ALWAYS_INCLUDED)
+    }
+
+
+def serialize_us(shape: ResponseShape, result: dict, runs: int) -> float:
+    """Best of five batches, per call"""
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(runs):
+            TRONJSONResponse(shape.apply(result)).body
+        best = min(best, time.perf_counter() - started)
+    return best / runs * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--mix", default="", help="Request share per endpoint, e.g. chat=50,execute-workflow=5")
+    args = parser.parse_args()
+
+    mix = {**DEFAULT_MIX, **parse_tenant_map(args.mix)}
+    total_share = sum(mix.values())
+    encoding = available_encodings()[0]
+    modes = ("full", "compact", "fields")
+    weighted = {mode: {"bytes": 0.0, "wire": 0.0, "us": 0.0} for mode in modes}
+
+    print(f"{'endpoint':<18} {'share':>6}  " + "  ".join(f"{mode + ' B':>10} {encoding + ' B':>9} {'us':>6}" for mode in modes))
+    for endpoint, (result, model) in build_results().items():
+        share = mix.get(endpoint, 0) / total_share
+        row = []
+        for mode, shape in shapes(endpoint, model).items():
+            body = TRONJSONResponse(shape.apply(result)).body
+            wire = len(compress_body(encoding, body)[0])
+            elapsed = serialize_us(shape, result, args.runs)
+            row.append(f"{len(body):>10} {wire:>9} {elapsed:>6.1f}")
+            weighted[mode]["bytes"] += share * len(body)
+            weighted[mode]["wire"] += share * wire
+            weighted[mode]["us"] += share * elapsed
+        print(f"{endpoint:<18} {share:>6.1%}  " + "  ".join(row))
+
+    full = weighted["full"]
+    print(f"\nPer average request ({encoding} on the wire):")
+    for mode in modes:
+        stats = weighted[mode]
+        print(f"  {mode:<8} {stats['bytes']:>9.0f} B raw ({1 - stats['bytes'] / full['bytes']:>6.1%} saved)  "
+              f"{stats['wire']:>8.0f} B wire ({1 - stats['wire'] / full['wire']:>6.1%} saved)  "
+              f"{stats['us']:>6.1f} us serialize ({1 - stats['us'] / full['us']:>6.1%} saved)")
+
+
+if __name__ == "__main__":
+    main()
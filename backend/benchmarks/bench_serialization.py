@@ -0,0 +1,93 @@
+"""
+TRON Ultimate AI Platform - Response Serialization Benchmark
+Encoding cost per endpoint: FastAPI's default jsonable_encoder + stdlib json
+path versus returning a TRONJSONResponse directly
+
+Usage: python -m benchmarks.bench_serialization [--runs N]
+"""
+
+import json
+import time
+import uuid
+import argparse
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from json_serialization import TRONJSONResponse
+from ultimate_gemini_engine import TRONGeminiEngine
+
+PARAGRAPH = (
+    "Grounded findings summarise the current state of the topic, cite the sources that were "
+    "consulted and note where the evidence disagrees. "
+)
+
+
+def _result(**fields) -> dict:
+    base = {"success": True, "model": "gemini-2.5-pro", "processing_time": 1.234,
+            "timestamp": datetime.now().isoformat()}
+    base.update(fields)
+    return base
+
+
+def build_payloads() -> dict:
+    """Representative response bodies keyed by endpoint"""
+    engine = TRONGeminiEngine()
+    tasks = [
+        {"type": "web_research", "id": i, "params": {"query": f"topic {i}", "depth": 3, "sources": ["a", "b", "c"]}}
+        for i in range(200)
+    ]
+    images = [
+        {"id": uuid.uuid4().hex, "url": f"/api/ultimate-ai/images/{i}", "thumbnail_url": f"/api/ultimate-ai/images/{i}?thumbnail=true",
+         "content_type": "image/png", "size_bytes": 1_200_000, "width": 1024, "height": 1024,
+         "metadata": {"phash": "c3a1f0e4d2b59687"}, "stage_timings": {"resize": 0.01, "convert": 0.02}}
+        for i in range(4)
+    ]
+    return {
+        "POST /chat": _result(session_id=uuid.uuid4().hex, response=PARAGRAPH * 8, turn_count=12,
+                              context_tokens=3100, summarized_turns=4),
+        "POST /generate-image": _result(images=images, prompt="A city skyline at dusk"),
+        "POST /research-web": _result(query="state of solid-state batteries", results=PARAGRAPH * 500, context=None),
+        "POST /execute-code": _result(code="print(1)", language="python", executed=True,
+                                      execution={"stdout": "1\n" * 2000, "stderr": "", "exit_code": 0, "duration": 0.01},
+                                      analysis=None, results="1\n" * 2000, execution_time=0.01),
+        "POST /execute-workflow": _result(workflow="Quarterly market report", tasks=tasks,
+                                          results=PARAGRAPH * 300, task_count=len(tasks)),
+        "GET /capabilities": engine.get_capability_info(),
+        "GET /analytics": engine.get_system_analytics()
+    }
+
+
+def encode_default(payload: dict) -> bytes:
+    """What FastAPI does for a route returning a plain dict without a response model"""
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def encode_fast(payload: dict) -> bytes:
+    return TRONJSONResponse(payload).body
+
+
+def time_per_call(encode, payload: dict, runs: int) -> float:
+    encode(payload)
+    started = time.perf_counter()
+    for _ in range(runs):
+        encode(payload)
+    return (time.perf_counter() - started) / runs * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<24} {'bytes':>9} {'default us':>11} {'orjson us':>10} {'speedup':>8}")
+    for endpoint, payload in build_payloads().items():
+        size = len(encode_fast(payload))
+        default_us = time_per_call(encode_default, payload, args.runs)
+        fast_us = time_per_call(encode_fast, payload, args.runs)
+        print(f"{endpoint:<24} {size:>9} {default_us:>11.1f} {fast_us:>10.1f} {default_us / fast_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+TRON Ultimate AI Platform - Serverless Handler Benchmark
+Cold-start and warm-invocation latency of the Netlify function running the real app
+
+Cold starts run in fresh interpreters: module import, then the first invocation
+(backend import plus application startup), then a second, warm invocation.
+Warm invocations reuse one handler in this process. Gemini and Supabase are
+replaced by the in-process fakes with zero latency, so only platform overhead is measured.
+
+Usage: python -m benchmarks.bench_serverless [--cold-runs N] [--warm-runs N]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import importlib.util
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[2]
+FUNCTION_PATH = REPO_DIR / "netlify" / "functions" / "api" / "index.py"
+FAKE_ENV = {
+    "TRON_FAKE_SERVICES": "gemini,supabase",
+    "TRON_FAKE_GEMINI_LATENCY": "fixed:0",
+    "TRON_FAKE_SUPABASE_LATENCY": "fixed:0",
+    "GEMINI_API_KEY": "offline",
+    "LOG_LEVEL": "WARNING",
+    # Every invocation comes from one client address; the per-tenant rate limit would answer 429
+    "TRON_TENANT_RATE": "0"
+}
+
+EVENTS = {
+    "GET /health": {"httpMethod": "GET", "path": "/health", "headers": {}},
+    "GET /capabilities": {"httpMethod": "GET", "path": "/api/ultimate-ai/capabilities",
+                          "headers": {"accept-encoding": "br"}},
+    "POST /chat": {"httpMethod": "POST", "path": "/.netlify/functions/api/api/ultimate-ai/chat",
+                   "headers": {"content-type": "application/json"},
+                   "body": json.dumps({"message": "Summarize the quarterly report"})},
+    "POST /research-web": {"httpMethod": "POST", "path": "/api/ultimate-ai/research-web",
+                           "headers": {"content-type": "application/json"},
+                           "body": json.dumps({"query": "solid-state batteries"})}
+}
+
+# Runs in a fresh interpreter; prints one JSON line of timings
+COLD_SCRIPT = """
+import sys, json, time, importlib.util
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("netlify_api", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+event = {"httpMethod": "GET", "path": "/health", "headers": {}}
+first = module.handler(event, None)
+invoked = time.perf_counter()
+module.handler(event, None)
+warm = time.perf_counter()
+print(json.dumps({
+    "status": first["statusCode"],
+    "import_ms": (imported - started) * 1000,
+    "first_invocation_ms": (invoked - imported) * 1000,
+    "second_invocation_ms": (warm - invoked) * 1000,
+    "modules": len(sys.modules)
+}))
+"""
+
+
+def load_function():
+    spec = importlib.util.spec_from_file_location("netlify_api", FUNCTION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_cold(runs: int) -> dict:
+    env = {**os.environ, **FAKE_ENV, "TRON_LOG_FILE": os.devnull}
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-c", COLD_SCRIPT, str(FUNCTION_PATH)],
+                                   capture_output=True, text=True, env=env, check=True)
+        timings = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings["process_ms"] = (time.perf_counter() - started) * 1000
+        samples.append(timings)
+    return {key: statistics.median(sample[key] for sample in samples)
+            for key in ("import_ms", "first_invocation_ms", "second_invocation_ms", "process_ms", "modules")}
+
+
+def bench_warm(runs: int) -> dict:
+    os.environ.update({**FAKE_ENV, "TRON_LOG_FILE": os.devnull})
+    function = load_function()
+    function.handler(EVENTS["GET /health"], None)
+    app = function.adapter.app
+    results = {}
+    for name, event in EVENTS.items():
+        latencies = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            response = function.handler(event, None)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response["statusCode"] != 200:
+                raise SystemExit(f"{name} returned {response['statusCode']}: {response['body'][:200]}")
+        latencies.sort()
+        results[name] = {"p50_ms": latencies[len(latencies) // 2],
+                         "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]}
+    if function.adapter.app is not app:
+        raise SystemExit("Warm invocations rebuilt the application")
+    function.adapter.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--warm-runs", type=int, default=200)
+    args = parser.parse_args()
+
+    cold = bench_cold(args.cold_runs)
+    print(f"Cold start (median of {args.cold_runs} fresh interpreters)")
+    print(f"  function import:       {cold['import_ms']:8.1f} ms")
+    print(f"  first invocation:      {cold['first_invocation_ms']:8.1f} ms  (backend import + startup)")
+    print(f"  second invocation:     {cold['second_invocation_ms']:8.1f} ms")
+    print(f"  whole process:         {cold['process_ms']:8.1f} ms  ({cold['modules']:.0f} modules loaded)")
+
+    warm = bench_warm(args.warm_runs)
+    print(f"Warm invocations ({args.warm_runs} per event, one reused handler)")
+    for name, stats in warm.items():
+        print(f"  {name:<22} p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
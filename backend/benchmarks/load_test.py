@@ -0,0 +1,442 @@
+"""
+TRON Ultimate AI Platform - Offline Load Test
+Open-loop load against a local server whose Gemini and Supabase clients are in-process fakes
+
+Starts uvicorn with TRON_FAKE_SERVICES=gemini,supabase, drives every HTTP endpoint
+under /api/ultimate-ai and WS /live at the target request rate and reports throughput,
+p50/p99 latency, error rate per endpoint and the resident memory of the server processes.
+A WS /live sample is one full session: connect, one text or audio turn answered by the
+fake Gemini's streamed frames, close.
+Needs no network access or API credentials.
+
+Usage:
+    python -m benchmarks.load_test --rps 50 --duration 30
+    python -m benchmarks.load_test --workers 4 --gemini-latency lognormal:1200:0.5 --error-rate 0.02
+    python -m benchmarks.load_test --url http://127.0.0.1:8000    # existing server, no RSS sampling
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import httpx
+import websockets
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+API = "/api/ultimate-ai"
+STARTUP_TIMEOUT = 60
+RSS_INTERVAL = 0.5
+LIVE_TURN_TIMEOUT = 30
+# 20 ms of 16 kHz PCM16 silence per frame, half a second per audio turn
+LIVE_AUDIO_FRAME = bytes(640)
+LIVE_AUDIO_FRAMES = 25
+
+SAMPLE_CSV = "region,quarter,revenue,units\n" + "\n".join(
+    f"{region},Q{q},{1000 + i * 37 % 500},{10 + i % 13}"
+    for i, (region, q) in enumerate((r, q) for r in ("north", "south", "east", "west") for q in range(1, 5))
+)
+SAMPLE_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010800000000"
+    "3a7e9b550000000a49444154789c636000000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+class Scenario:
+    """Endpoint mix: each entry is (name, weight, request builder)"""
+
+    def __init__(self, state: Dict[str, Any]):
+        self.state = state
+        self.entries: List[Tuple[str, int, Callable[[], Dict[str, Any]]]] = [
+            ("GET /status", 2, lambda: {"method": "GET", "url": f"{API}/status"}),
+            ("GET /capabilities", 2, lambda: {"method": "GET", "url": f"{API}/capabilities"}),
+            ("GET /health", 2, lambda: {"method": "GET", "url": f"{API}/health"}),
+            ("GET /metrics", 1, lambda: {"method": "GET", "url": f"{API}/metrics"}),
+            ("GET /analytics", 1, lambda: {"method": "GET", "url": f"{API}/analytics"}),
+            ("GET /analytics/capabilities-usage", 1, lambda: {"method": "GET", "url": f"{API}/analytics/capabilities-usage"}),
+            ("GET /analytics/performance", 1, lambda: {"method": "GET", "url": f"{API}/analytics/performance"}),
+            ("GET /analytics/models-status", 1, lambda: {"method": "GET", "url": f"{API}/analytics/models-status"}),
+            ("GET /analytics/event-loop", 1, lambda: {"method": "GET", "url": f"{API}/analytics/event-loop"}),
+            ("POST /chat", 12, self.chat),
+            ("DELETE /chat/{session_id}", 1, self.end_chat),
+            ("POST /generate-image", 4, lambda: self.post("/generate-image", {"prompt": "A city skyline at dusk"})),
+            ("POST /research-web", 6, lambda: self.post("/research-web", {"query": "solid-state batteries"})),
+            ("POST /execute-code", 4, lambda: self.post("/execute-code", {
+                "code": "print(sum(range(1000)))", "language": "python", "analyze": random.random() < 0.5
+            })),
+            ("POST /execute-code/stream", 2, lambda: self.post("/execute-code/stream", {
+                "code": "for i in range(3):\n    print(i)", "language": "python"
+            })),
+            ("POST /control-browser", 3, lambda: self.post("/control-browser", {
+                "task_description": "Find the pricing page", "url": "https://example.com"
+            })),
+            ("POST /create-file", 3, lambda: self.post("/create-file", {
+                "content": "# Report\n\n" + "Body text. " * 200, "filename": "report",
+                "format": random.choice(["txt", "md", "pdf", "docx", "xlsx"])
+            })),
+            ("POST /analyze-files", 3, lambda: self.post("/analyze-files", {
+                "prompt": "Describe this image", "file_ids": [self.state["image_upload"]]
+            })),
+            ("POST /analyze-dataset", 3, lambda: self.post("/analyze-dataset", {
+                "file_id": self.state["dataset_upload"], "question": "Which region grew fastest?"
+            })),
+            ("POST /live-interaction", 2, lambda: self.post("/live-interaction", {
+                "interaction_type": "text", "data": {"text": "hello"}
+            })),
+            ("WS /live", 2, lambda: {"websocket": f"{API}/live", "interaction_type": random.choice(["text", "audio"])}),
+            ("POST /execute-workflow", 2, lambda: self.post("/execute-workflow", {
+                "workflow_description": "Quarterly market report",
+                "tasks": [{"type": "web_research", "params": {"query": f"topic {i}"}} for i in range(5)]
+            })),
+            ("POST /upload-file", 2, lambda: {
+                "method": "POST", "url": f"{API}/upload-file",
+                "files": {"file": ("data.csv", SAMPLE_CSV.encode(), "text/csv")}
+            }),
+            ("GET /download/{filename}", 2, lambda: {"method": "GET", "url": self.state["download_url"]}),
+            ("GET /images/{image_id}", 3, lambda: {
+                "method": "GET", "url": self.state["image_url"],
+                "params": random.choice([{}, {"thumbnail": "true"}, {"format": "webp", "width": 128}])
+            }),
+        ]
+        self.names = [name for name, _, _ in self.entries]
+        self.weights = [weight for _, weight, _ in self.entries]
+        self.builders = {name: builder for name, _, builder in self.entries}
+
+    @staticmethod
+    def post(path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"method": "POST", "url": f"{API}{path}", "json": body}
+
+    def chat(self) -> Dict[str, Any]:
+        # Mostly continue existing conversations so session history is exercised
+        sessions = self.state["chat_sessions"]
+        session_id = random.choice(sessions) if sessions and random.random() < 0.8 else None
+        return self.post("/chat", {"message": "Summarize the quarterly report", "session_id": session_id})
+
+    def end_chat(self) -> Dict[str, Any]:
+        sessions = self.state["chat_sessions"]
+        session_id = sessions.pop(random.randrange(len(sessions))) if len(sessions) > 4 else "unknown-session"
+        return {"method": "DELETE", "url": f"{API}/chat/{session_id}"}
+
+    def pick(self) -> Tuple[str, Dict[str, Any]]:
+        name = random.choices(self.names, self.weights)[0]
+        return name, self.builders[name]()
+
+
+class Results:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.status_codes: Dict[int, int] = {}
+        self.dropped = 0
+
+    def record(self, name: str, latency: float, ok: bool, status: int):
+        self.latencies.setdefault(name, []).append(latency)
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def is_success(response: httpx.Response) -> bool:
+    """HTTP errors and application-level {"success": false} both count as failures"""
+    if response.status_code >= 400:
+        return False
+    if response.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = response.json()
+        except ValueError:
+            return False
+        return not (isinstance(body, dict) and body.get("success") is False)
+    return True
+
+
+async def wait_turn_complete(websocket) -> bool:
+    async for message in websocket:
+        if isinstance(message, str) and json.loads(message).get("type") == "turn_complete":
+            return True
+    return False
+
+
+async def live_session(base_url: httpx.URL, request: Dict[str, Any]) -> Tuple[bool, int]:
+    """One WS /live turn; succeeds when the server streams a reply ending in turn_complete"""
+    ws_base = base_url.copy_with(scheme="wss" if base_url.scheme == "https" else "ws")
+    url = f"{str(ws_base).rstrip('/')}{request['websocket']}?interaction_type={request['interaction_type']}"
+    try:
+        async with websockets.connect(url) as websocket:
+            if request["interaction_type"] == "audio":
+                for _ in range(LIVE_AUDIO_FRAMES):
+                    await websocket.send(LIVE_AUDIO_FRAME)
+                await websocket.send(json.dumps({"type": "audio_end"}))
+            else:
+                await websocket.send(json.dumps({"type": "text", "text": "hello"}))
+            if await asyncio.wait_for(wait_turn_complete(websocket), LIVE_TURN_TIMEOUT):
+                return True, 101
+    except websockets.InvalidStatusCode as e:
+        return False, e.status_code
+    except (websockets.WebSocketException, OSError, asyncio.TimeoutError):
+        pass
+    return False, 0
+
+
+async def send(client: httpx.AsyncClient, name: str, request: Dict[str, Any], results: Results,
+               state: Dict[str, Any]):
+    started = time.perf_counter()
+    if "websocket" in request:
+        ok, status = await live_session(client.base_url, request)
+        results.record(name, time.perf_counter() - started, ok, status)
+        return
+    try:
+        response = await client.request(**request)
+        await response.aread()
+        ok = is_success(response)
+        status = response.status_code
+    except httpx.HTTPError:
+        ok, status = False, 0
+    results.record(name, time.perf_counter() - started, ok, status)
+
+    if ok and name == "POST /chat":
+        session_id = response.json().get("session_id")
+        if session_id and session_id not in state["chat_sessions"]:
+            state["chat_sessions"].append(session_id)
+
+
+async def setup(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Create the uploads, image and file that the read endpoints refer to"""
+    async def upload(filename: str, content: bytes, mime_type: str) -> str:
+        response = await client.post(f"{API}/upload-file", files={"file": (filename, content, mime_type)})
+        response.raise_for_status()
+        return response.json()["filename"]
+
+    image = (await client.post(f"{API}/generate-image", json={"prompt": "setup image"})).json()
+    created = (await client.post(f"{API}/create-file", json={"content": "setup", "filename": "setup"})).json()
+    if not image.get("images") or not created.get("download_url"):
+        raise SystemExit(f"Setup failed: {image.get('error') or created.get('error')}")
+    return {
+        "image_upload": await upload("image.png", SAMPLE_PNG, "image/png"),
+        "dataset_upload": await upload("data.csv", SAMPLE_CSV.encode(), "text/csv"),
+        "image_url": image["images"][0]["url"],
+        "download_url": created["download_url"],
+        "chat_sessions": []
+    }
+
+
+async def run_load(base_url: str, rps: float, duration: float, concurrency: int,
+                   server_pids: Callable[[], List[int]]) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        state = await setup(client)
+        scenario = Scenario(state)
+        results = Results()
+        rss_samples: List[int] = []
+        in_flight: set = set()
+        gate = asyncio.Semaphore(concurrency)
+
+        async def sample_rss():
+            while True:
+                rss_samples.append(sum(read_rss(pid) for pid in server_pids()))
+                await asyncio.sleep(RSS_INTERVAL)
+
+        async def guarded(name, request):
+            async with gate:
+                await send(client, name, request, results, state)
+
+        sampler = asyncio.create_task(sample_rss())
+        # Open loop: arrivals follow the schedule regardless of how slow responses are
+        started = time.perf_counter()
+        sent = 0
+        while (elapsed := time.perf_counter() - started) < duration:
+            due = int(elapsed * rps) + 1
+            while sent < due:
+                if len(in_flight) >= concurrency * 4:
+                    results.dropped += 1
+                else:
+                    task = asyncio.create_task(guarded(*scenario.pick()))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                sent += 1
+            await asyncio.sleep(max(0.0, (sent / rps) - (time.perf_counter() - started)))
+        if in_flight:
+            await asyncio.wait(in_flight)
+        wall = time.perf_counter() - started
+        sampler.cancel()
+
+    return summarize(results, wall, rss_samples)
+
+
+def summarize(results: Results, wall: float, rss_samples: List[int]) -> Dict[str, Any]:
+    endpoints = {}
+    all_latencies: List[float] = []
+    for name in sorted(results.latencies):
+        latencies = results.latencies[name]
+        all_latencies.extend(latencies)
+        endpoints[name] = {
+            "requests": len(latencies),
+            "errors": results.errors.get(name, 0),
+            "error_rate": results.errors.get(name, 0) / len(latencies),
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "mean_ms": statistics.fmean(latencies) * 1000
+        }
+    total_errors = sum(results.errors.values())
+    return {
+        "duration_s": wall,
+        "requests": len(all_latencies),
+        "throughput_rps": len(all_latencies) / wall if wall else 0.0,
+        "errors": total_errors,
+        "error_rate": total_errors / len(all_latencies) if all_latencies else 0.0,
+        "dropped": results.dropped,
+        "p50_ms": percentile(all_latencies, 0.50) * 1000,
+        "p99_ms": percentile(all_latencies, 0.99) * 1000,
+        "status_codes": {str(code): count for code, count in sorted(results.status_codes.items())},
+        "rss_mb": {
+            "start": rss_samples[0] / 2 ** 20 if rss_samples else None,
+            "peak": max(rss_samples) / 2 ** 20 if rss_samples else None,
+            "end": rss_samples[-1] / 2 ** 20 if rss_samples else None
+        },
+        "endpoints": endpoints
+    }
+
+
+# =============================================================================
+# SERVER PROCESS
+# =============================================================================
+
+def read_rss(pid: int) -> int:
+    """Resident set size in bytes from /proc; 0 when unavailable"""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def process_tree(root: int) -> List[int]:
+    """The root pid and all its descendants (uvicorn workers, code execution pool)"""
+    children: Dict[int, List[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            parent = int((entry / "stat").read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry.name))
+    pids, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, env_overrides: Dict[str, str]) -> subprocess.Popen:
+    # All load comes from one client address, so the per-tenant rate limit and live session cap
+    # are off unless overridden.
+    # The server only listens on loopback, so the code execution endpoints can run locally
+    env = {**os.environ, "TRON_FAKE_SERVICES": "gemini,supabase", "GEMINI_API_KEY": "offline",
+           "TRON_TENANT_RATE": "0", "TRON_TENANT_MAX_LIVE_SESSIONS": "0", "TRON_LOCAL_CODE_EXECUTION": "true", **env_overrides}
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"Server exited during startup with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Server not ready after {STARTUP_TIMEOUT}s")
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'endpoint':<36} {'reqs':>6} {'err%':>6} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, stats in report["endpoints"].items():
+        print(f"{name:<36} {stats['requests']:>6} {stats['error_rate']:>6.1%} "
+              f"{stats['p50_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+    print(f"{'TOTAL':<36} {report['requests']:>6} {report['error_rate']:>6.1%} "
+          f"{report['p50_ms']:>9.1f} {report['p99_ms']:>9.1f}")
+    print(f"Throughput: {report['throughput_rps']:.1f} req/s over {report['duration_s']:.1f}s"
+          f"  (dropped by client backpressure: {report['dropped']})")
+    print(f"Status codes: {report['status_codes']}")
+    rss = report["rss_mb"]
+    if rss["peak"] is not None:
+        print(f"Server RSS: start {rss['start']:.1f} MB, peak {rss['peak']:.1f} MB, end {rss['end']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rps", type=float, default=20, help="Target request arrival rate")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds of load")
+    parser.add_argument("--concurrency", type=int, default=64, help="Maximum requests in flight")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--url", help="Target an already running server instead of starting one")
+    parser.add_argument("--gemini-latency", help="Fake Gemini latency spec, e.g. lognormal:800:0.4")
+    parser.add_argument("--supabase-latency", help="Fake Supabase latency spec, e.g. fixed:15")
+    parser.add_argument("--error-rate", type=float, help="Injected failure rate for both fakes")
+    parser.add_argument("--seed", type=int, help="Seed for the request mix and the fakes")
+    parser.add_argument("--output", type=Path, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    env_overrides = {
+        name: str(value) for name, value in {
+            "TRON_FAKE_GEMINI_LATENCY": args.gemini_latency,
+            "TRON_FAKE_SUPABASE_LATENCY": args.supabase_latency,
+            "TRON_FAKE_GEMINI_ERROR_RATE": args.error_rate,
+            "TRON_FAKE_SUPABASE_ERROR_RATE": args.error_rate,
+            "TRON_FAKE_SEED": args.seed
+        }.items() if value is not None
+    }
+
+    server: Optional[subprocess.Popen] = None
+    base_url = args.url
+    if base_url is None:
+        base_url = f"http://127.0.0.1:{free_port()}"
+        server = start_server(int(base_url.rsplit(":", 1)[1]), args.workers, env_overrides)
+    try:
+        if server:
+            wait_until_ready(base_url, server)
+        pids = (lambda: process_tree(server.pid)) if server else (lambda: [])
+        print(f"Load: {args.rps:g} req/s for {args.duration:g}s against {base_url}"
+              f"{f' ({args.workers} workers, fake services)' if server else ''}")
+        report = asyncio.run(run_load(base_url, args.rps, args.duration, args.concurrency, pids))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
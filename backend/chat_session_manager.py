@@ -0,0 +1,283 @@
+"""
+TRON Ultimate AI Platform - Chat Session Manager
+Server-side multi-turn chat sessions with bounded, compacted context
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+import contextlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+
+from json_serialization import dumps, loads
+from prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 1000
+DEFAULT_TOKEN_BUDGET = 4000
+DEFAULT_SESSION_TTL = 24 * 3600
+
+# Compact role codes used in stored history
+ROLE_CODES = {"user": "u", "model": "m"}
+ROLE_NAMES = {code: role for role, code in ROLE_CODES.items()}
+
+
+class ChatSessionNotFoundError(LookupError):
+    """The session ID is unknown, expired, evicted or owned by another tenant"""
+
+
+@dataclass
+class ChatSession:
+    """
+    One conversation: a running summary of older turns plus recent turns verbatim
+    """
+    session_id: str
+    tenant: str = ""
+    summary: str = ""
+    turns: List[Tuple[str, str]] = field(default_factory=list)
+    token_count: int = 0
+    summarized_turns: int = 0
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    def append(self, role: str, text: str):
+        self.turns.append((ROLE_CODES[role], text))
+        self.token_count += estimate_tokens(text)
+        self.updated_at = time.time()
+
+    def to_contents(self, message: str) -> List[Dict[str, Any]]:
+        """Build the model contents for the next turn"""
+        contents = []
+        if self.summary:
+            contents.append({"role": "user", "parts": [{"text": f"Summary of the conversation so far:\n{self.summary}"}]})
+            contents.append({"role": "model", "parts": [{"text": "Understood."}]})
+        for code, text in self.turns:
+            contents.append({"role": ROLE_NAMES[code], "parts": [{"text": text}]})
+        contents.append({"role": "user", "parts": [{"text": message}]})
+        return contents
+
+    def to_json(self) -> bytes:
+        return dumps({
+            "i": self.session_id,
+            "o": self.tenant,
+            "s": self.summary,
+            "t": self.turns,
+            "n": self.token_count,
+            "k": self.summarized_turns,
+            "c": self.created_at,
+            "u": self.updated_at
+        })
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> "ChatSession":
+        data = loads(raw)
+        return cls(
+            session_id=data["i"],
+            tenant=data.get("o", ""),
+            summary=data["s"],
+            turns=[tuple(turn) for turn in data["t"]],
+            token_count=data["n"],
+            summarized_turns=data["k"],
+            created_at=data["c"],
+            updated_at=data["u"]
+        )
+
+
+class RedisChatSessionStore:
+    """
+    External session store used when sessions fall out of the in-memory cache
+    or are served by another worker
+    """
+
+    def __init__(self, url: str, ttl: int = DEFAULT_SESSION_TTL):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"tron:chat:{session_id}"
+
+    async def get(self, session_id: str) -> Optional[ChatSession]:
+        raw = await self.client.get(self._key(session_id))
+        return ChatSession.from_json(raw) if raw else None
+
+    async def put(self, session: ChatSession):
+        await self.client.set(self._key(session.session_id), session.to_json(), ex=self.ttl)
+
+    async def delete(self, session_id: str):
+        await self.client.delete(self._key(session_id))
+
+
+class ChatSessionManager:
+    """
+    LRU cache of active chat sessions with an optional external store fallback
+    """
+
+    def __init__(self,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 store: Optional[RedisChatSessionStore] = None):
+        self.max_sessions = max_sessions
+        self.token_budget = token_budget
+        self.store = store
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        # [lock, holders] per session with a turn in progress on this worker
+        self._turn_locks: Dict[str, list] = {}
+        self.metrics = {"cache_hits": 0, "store_hits": 0, "created": 0, "evicted": 0, "compactions": 0, "not_found": 0}
+
+    async def get_or_create(self, session_id: Optional[str] = None, tenant: str = "") -> ChatSession:
+        """
+        Return the tenant's session from cache or the external store, or a new
+        session with a server-issued ID when none is given. An ID that is unknown
+        or belongs to another tenant raises ChatSessionNotFoundError; client IDs
+        never create sessions.
+        """
+        if not session_id:
+            session = ChatSession(session_id=str(uuid.uuid4()), tenant=tenant)
+            self.metrics["created"] += 1
+            self._cache(session)
+            return session
+
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            self.metrics["cache_hits"] += 1
+        elif self.store is not None:
+            try:
+                session = await self.store.get(session_id)
+            except Exception as e:
+                logger.warning(f"Chat session store read failed: {e}")
+            if session is not None:
+                self.metrics["store_hits"] += 1
+                self._cache(session)
+
+        if session is None or session.tenant != tenant:
+            self.metrics["not_found"] += 1
+            raise ChatSessionNotFoundError(f"Chat session {session_id} not found or expired; start a new session")
+        return session
+
+    @contextlib.asynccontextmanager
+    async def turn(self, session_id: Optional[str] = None, tenant: str = ""):
+        """
+        Hold a session for one turn; concurrent turns on the same session run one
+        after another so neither overwrites the other's history
+        """
+        if not session_id:
+            yield await self.get_or_create(None, tenant)
+            return
+        entry = self._turn_locks.setdefault(session_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield await self.get_or_create(session_id, tenant)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._turn_locks[session_id]
+
+    def _cache(self, session: ChatSession):
+        self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+        while len(self._sessions) > self.max_sessions:
+            # With an external store every turn is written through and an evicted
+            # session is reloaded; without one it is gone and its next turn gets
+            # ChatSessionNotFoundError rather than an empty history
+            self._sessions.popitem(last=False)
+            self.metrics["evicted"] += 1
+
+    async def save(self, session: ChatSession):
+        """Write the session through to the external store"""
+        if self.store is None:
+            return
+        try:
+            await self.store.put(session)
+        except Exception as e:
+            logger.warning(f"Chat session store write failed: {e}")
+
+    async def delete(self, session_id: str, tenant: str = "") -> bool:
+        """Remove the tenant's session; another tenant's session is reported as absent"""
+        try:
+            await self.get_or_create(session_id, tenant)
+        except ChatSessionNotFoundError:
+            return False
+        self._sessions.pop(session_id, None)
+        if self.store is not None:
+            try:
+                await self.store.delete(session_id)
+            except Exception as e:
+                logger.warning(f"Chat session store delete failed: {e}")
+        return True
+
+    def over_budget(self, session: ChatSession) -> bool:
+        return session.token_count > self.token_budget
+
+    async def compact(self,
+                      session: ChatSession,
+                      summarizer: Optional[Callable[[str, List[Tuple[str, str]]], Awaitable[str]]] = None):
+        """
+        Fold the oldest turns into the running summary until the verbatim
+        history fits in half the budget. Only the folded turns are sent to the
+        summarizer, so each compaction costs the same regardless of history length.
+        Without a summarizer (or if it fails) the oldest turns are dropped.
+        """
+        target = self.token_budget // 2
+        folded: List[Tuple[str, str]] = []
+        # Always keep the latest exchange verbatim
+        while session.token_count > target and len(session.turns) > 2:
+            turn = session.turns.pop(0)
+            session.token_count -= estimate_tokens(turn[1])
+            folded.append(turn)
+
+        if not folded:
+            return
+
+        if summarizer is not None:
+            try:
+                session.summary = await summarizer(session.summary, folded)
+            except Exception as e:
+                logger.warning(f"Chat summarization failed, trimming instead: {e}")
+
+        # The summary is bounded too: keep its most recent part if it grows past the target
+        summary_limit = target * 4
+        if len(session.summary) > summary_limit:
+            session.summary = session.summary[-summary_limit:]
+
+        session.summarized_turns += len(folded)
+        self.metrics["compactions"] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "cached_sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "token_budget": self.token_budget,
+            "external_store": self.store is not None,
+            **self.metrics
+        }
+
+
+def create_chat_session_manager() -> ChatSessionManager:
+    """Build the session manager from environment configuration"""
+    store = None
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            store = RedisChatSessionStore(redis_url)
+        except Exception as e:
+            logger.warning(f"Redis chat session store unavailable: {e}")
+
+    return ChatSessionManager(
+        max_sessions=int(os.getenv("TRON_CHAT_MAX_SESSIONS", DEFAULT_MAX_SESSIONS)),
+        token_budget=int(os.getenv("TRON_CHAT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)),
+        store=store
+    )
+
+
+# Global chat session manager instance
+chat_sessions = create_chat_session_manager()
@@ -0,0 +1,452 @@
+"""
+TRON Ultimate AI Platform - Code Execution Pool
+Warm pool of pre-imported, single-use Python worker processes with resource limits
+
+Local execution is off unless TRON_LOCAL_CODE_EXECUTION is enabled. Each worker
+is a fresh isolated interpreter (python -I) started ahead of time with a
+scrubbed environment, so no API keys or service credentials are visible to user
+code. A worker runs exactly one job and is then killed, so nothing one run
+leaves behind (patched modules, threads, files in its working directory) is
+seen by the next. Before reporting ready the worker drops root privileges,
+detaches from the network where the kernel allows it, applies rlimits and
+installs an audit hook that refuses sockets, subprocesses and ctypes.
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import tempfile
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from typing import Optional, Dict, Any, List, Set, AsyncIterator
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource limits are POSIX only
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRELOAD_MODULES = ["json", "math", "re", "statistics", "collections", "itertools", "datetime", "decimal"]
+DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
+DEFAULT_MAX_FILE_BYTES = 16 * 1024 * 1024
+WORKER_STARTUP_TIMEOUT = 30
+# Longest protocol line read from a worker: one output chunk, JSON-escaped
+WORKER_LINE_LIMIT = 4 * DEFAULT_MAX_OUTPUT_BYTES
+# Environment passed to workers; nothing else from the server's environment is inherited
+WORKER_ENV_KEEP = ("PATH", "LANG", "LC_ALL", "TZ")
+SANDBOX_USER = "nobody"
+
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+
+# Audit events refused inside a worker once user code may run
+BLOCKED_AUDIT_EVENTS = (
+    "socket.", "subprocess.Popen", "os.system", "os.exec", "os.posix_spawn", "os.fork", "os.forkpty",
+    "os.kill", "os.killpg", "pty.spawn", "ctypes.", "webbrowser.open"
+)
+BLOCKED_IMPORTS = ("ctypes", "_ctypes", "_posixsubprocess", "multiprocessing")
+
+
+def local_execution_enabled() -> bool:
+    return os.getenv("TRON_LOCAL_CODE_EXECUTION", "false").lower() in ("1", "true", "yes", "on")
+
+
+class CodeExecutionDisabledError(RuntimeError):
+    """Raised when local execution is requested while TRON_LOCAL_CODE_EXECUTION is off"""
+
+
+# =============================================================================
+# WORKER PROCESS
+# =============================================================================
+# Runs as `python -I code_execution_pool.py --worker`: isolated mode ignores
+# PYTHON* variables, user site-packages and the script directory, so only the
+# standard library is importable by name. Protocol messages are JSON lines on a
+# private duplicate of the original stdout; fds 1 and 2 point at /dev/null.
+
+class _PipeWriter(io.TextIOBase):
+    """Forwards stdout/stderr text to the parent in small chunks as it is written"""
+
+    def __init__(self, channel, stream: str, limit: int):
+        self.channel = channel
+        self.stream = stream
+        self.limit = limit
+        self.written = 0
+        self.truncated = False
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if self.truncated:
+            return len(text)
+        remaining = self.limit - self.written
+        if len(text) > remaining:
+            text = text[:remaining]
+            self.truncated = True
+        self.written += len(text)
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if "\n" in text or self._buffered >= 4096 or self.truncated:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if self._buffer:
+            _send(self.channel, self.stream, "".join(self._buffer))
+            self._buffer.clear()
+            self._buffered = 0
+
+
+def _send(channel, kind: str, payload: Any, _encode=json.JSONEncoder().encode):
+    # The encoder is bound at import so user code patching json cannot garble the protocol
+    channel.write(_encode([kind, payload]) + "\n")
+    channel.flush()
+
+
+def _detach_network() -> bool:
+    """Move into an empty network namespace; unprivileged workers need a user namespace too"""
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        flags = CLONE_NEWNET if os.geteuid() == 0 else CLONE_NEWUSER | CLONE_NEWNET
+        return libc.unshare(flags) == 0
+    except Exception:
+        return False
+    finally:
+        # Cached modules skip the import audit event; force a fresh (refused) import later
+        for name in [name for name in sys.modules if name.split(".")[0] in BLOCKED_IMPORTS]:
+            del sys.modules[name]
+
+
+def _drop_privileges():
+    if os.geteuid() != 0:
+        return
+    import pwd
+
+    user = pwd.getpwnam(SANDBOX_USER)
+    os.setgroups([])
+    os.setgid(user.pw_gid)
+    os.setuid(user.pw_uid)
+
+
+def _audit(event: str, args):
+    if event.startswith(BLOCKED_AUDIT_EVENTS) or (event == "import" and args[0] in BLOCKED_IMPORTS):
+        raise PermissionError(f"{event} is not allowed in the code sandbox")
+
+
+def _worker_main():
+    """Worker entry point: import, lock down, run one job, exit"""
+    channel = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+
+    config = json.loads(sys.stdin.readline())
+    for name in config["preload_modules"]:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+    network_isolated = _detach_network()
+    _drop_privileges()
+    os.chdir(config["workdir"])
+    if resource is not None:
+        memory = config["memory_limit_mb"] * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        resource.setrlimit(resource.RLIMIT_CPU, (config["cpu_seconds"], config["cpu_seconds"] + 1))
+        resource.setrlimit(resource.RLIMIT_FSIZE, (config["max_file_bytes"], config["max_file_bytes"]))
+        resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    sys.addaudithook(_audit)
+
+    _send(channel, "ready", {"network_isolated": network_isolated})
+    job = json.loads(sys.stdin.readline())
+
+    stdout = _PipeWriter(channel, "stdout", job["max_output_bytes"])
+    stderr = _PipeWriter(channel, "stderr", job["max_output_bytes"])
+    ok, error = True, None
+    started = time.perf_counter()
+
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            exec(compile(job["code"], "<user_code>", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+        except SystemExit as e:
+            ok = e.code in (None, 0)
+        except BaseException:
+            ok = False
+            error = traceback.format_exc()
+
+    duration = time.perf_counter() - started
+    stdout.flush()
+    stderr.flush()
+    _send(channel, "done", {
+        "ok": ok,
+        "error": error,
+        "duration_ms": round(duration * 1000, 3),
+        "truncated": stdout.truncated or stderr.truncated
+    })
+    # Skip interpreter teardown; threads left by user code die with the process
+    os._exit(0)
+
+
+# =============================================================================
+# POOL
+# =============================================================================
+
+class _Worker:
+    def __init__(self, process: asyncio.subprocess.Process, workdir: str, network_isolated: bool):
+        self.process = process
+        self.workdir = workdir
+        self.network_isolated = network_isolated
+
+    async def kill(self):
+        if self.process.returncode is None:
+            self.process.kill()
+        await self.process.wait()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class CodeExecutionPool:
+    """
+    Keeps warm single-use Python workers ready so executions skip interpreter startup
+    Every execution gets its own process; it is discarded afterwards and replaced in the background
+    """
+
+    def __init__(self,
+                 size: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 memory_limit_mb: Optional[int] = None,
+                 cpu_seconds: Optional[int] = None,
+                 preload_modules: Optional[List[str]] = None,
+                 enabled: Optional[bool] = None):
+        self.enabled = local_execution_enabled() if enabled is None else enabled
+        self.size = size or int(os.getenv("TRON_CODE_WORKERS", 2))
+        self.timeout = timeout or float(os.getenv("TRON_CODE_TIMEOUT", 10))
+        self.memory_limit_mb = memory_limit_mb or int(os.getenv("TRON_CODE_MEMORY_MB", 512))
+        self.cpu_seconds = cpu_seconds or int(os.getenv("TRON_CODE_CPU_SECONDS", 5))
+        self.preload_modules = preload_modules or DEFAULT_PRELOAD_MODULES
+        self.max_output_bytes = DEFAULT_MAX_OUTPUT_BYTES
+
+        self._idle: Optional[asyncio.Queue] = None
+        self._worker_count = 0
+        # Every live worker, including ones still starting, and the recycling tasks, so shutdown reaches them all
+        self._workers: Set[_Worker] = set()
+        self._background: Set[asyncio.Task] = set()
+        self._closed = False
+        self.metrics = {
+            "executions": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "crashes": 0,
+            "workers_spawned": 0,
+            "workers_recycled": 0,
+            "network_isolated": None,
+            "total_execution_ms": 0.0,
+            "total_wait_ms": 0.0
+        }
+
+    async def _spawn(self) -> _Worker:
+        workdir = tempfile.mkdtemp(prefix="tron_code_")
+        if os.geteuid() == 0:
+            # The worker drops to the sandbox user before running code; give it its working directory
+            import pwd
+
+            user = pwd.getpwnam(SANDBOX_USER)
+            os.chown(workdir, user.pw_uid, user.pw_gid)
+        env = {name: os.environ[name] for name in WORKER_ENV_KEEP if name in os.environ}
+        env["HOME"] = workdir
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-I", os.path.abspath(__file__), "--worker",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+            env=env, cwd=workdir, start_new_session=True, limit=WORKER_LINE_LIMIT
+        )
+        worker = _Worker(process, workdir, False)
+        self._workers.add(worker)
+        process.stdin.write(json.dumps({
+            "preload_modules": self.preload_modules,
+            "workdir": workdir,
+            "memory_limit_mb": self.memory_limit_mb,
+            "cpu_seconds": self.cpu_seconds,
+            "max_file_bytes": DEFAULT_MAX_FILE_BYTES
+        }).encode() + b"\n")
+
+        # Wait for the worker to finish its imports and lockdown so it is warm when handed out
+        try:
+            line = await asyncio.wait_for(process.stdout.readline(), WORKER_STARTUP_TIMEOUT)
+            kind, payload = json.loads(line)
+        except (asyncio.TimeoutError, ValueError):
+            kind, payload = None, None
+        if kind != "ready" or self._closed:
+            await self._kill(worker)
+            raise RuntimeError("Code execution worker failed to start")
+
+        worker.network_isolated = payload["network_isolated"]
+        if self.metrics["network_isolated"] is None and not worker.network_isolated:
+            logger.warning("Code execution workers cannot be detached from the network on this host")
+        self.metrics["network_isolated"] = worker.network_isolated
+        self.metrics["workers_spawned"] += 1
+        return worker
+
+    async def _kill(self, worker: _Worker):
+        self._workers.discard(worker)
+        await worker.kill()
+
+    def _in_background(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def start(self):
+        """Pre-start the full pool so the first executions are warm"""
+        if not self.enabled:
+            logger.info("Local code execution disabled (TRON_LOCAL_CODE_EXECUTION)")
+            return
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        while self._worker_count < self.size:
+            self._worker_count += 1
+            self._idle.put_nowait(await self._spawn())
+        logger.info(f"Code execution pool ready with {self.size} workers")
+
+    async def _acquire(self) -> _Worker:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        if self._idle.empty() and self._worker_count < self.size:
+            self._worker_count += 1
+            try:
+                return await self._spawn()
+            except Exception:
+                self._worker_count -= 1
+                raise
+        return await self._idle.get()
+
+    def _release(self, worker: _Worker):
+        # Workers are never reused; replace it in the background so callers never wait on recycling
+        self.metrics["workers_recycled"] += 1
+        self._worker_count -= 1
+        self._in_background(self._kill(worker))
+        self._in_background(self._replenish())
+
+    async def _replenish(self):
+        if self._worker_count < self.size and not self._closed:
+            self._worker_count += 1
+            try:
+                self._idle.put_nowait(await self._spawn())
+            except Exception as e:
+                self._worker_count -= 1
+                logger.error(f"Failed to start code execution worker: {e}")
+
+    async def stream(self, code: str, timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute code and yield output events as they are produced
+        The final event has type "result"
+        """
+        if not self.enabled:
+            raise CodeExecutionDisabledError("Local code execution is disabled on this server")
+
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+        worker = await self._acquire()
+        wait_ms = (time.perf_counter() - queued_at) * 1000
+        self.metrics["total_wait_ms"] += wait_ms
+
+        deadline = loop.time() + (timeout or self.timeout)
+        self.metrics["executions"] += 1
+
+        try:
+            try:
+                worker.process.stdin.write(json.dumps({
+                    "code": code,
+                    "max_output_bytes": self.max_output_bytes
+                }).encode() + b"\n")
+                await worker.process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            while True:
+                remaining = deadline - loop.time()
+                try:
+                    line = await asyncio.wait_for(worker.process.stdout.readline(), max(remaining, 0))
+                except asyncio.TimeoutError:
+                    self.metrics["timeouts"] += 1
+                    self.metrics["failures"] += 1
+                    yield {"type": "result", "ok": False, "error": "Execution timed out", "wait_ms": round(wait_ms, 3)}
+                    return
+
+                try:
+                    kind, payload = json.loads(line) if line else ("exit", None)
+                except (ValueError, TypeError):
+                    kind, payload = "exit", None
+
+                if kind in ("stdout", "stderr"):
+                    yield {"type": "output", "stream": kind, "data": payload}
+                elif kind == "done":
+                    self.metrics["total_execution_ms"] += payload["duration_ms"]
+                    if not payload["ok"]:
+                        self.metrics["failures"] += 1
+                    yield {"type": "result", **payload, "wait_ms": round(wait_ms, 3)}
+                    return
+                else:
+                    self.metrics["crashes"] += 1
+                    self.metrics["failures"] += 1
+                    yield {
+                        "type": "result",
+                        "ok": False,
+                        "error": "Worker terminated (resource limit exceeded)",
+                        "wait_ms": round(wait_ms, 3)
+                    }
+                    return
+        finally:
+            self._release(worker)
+
+    async def execute(self, code: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Execute code and return collected stdout, stderr and status"""
+        output = {"stdout": [], "stderr": []}
+        result: Dict[str, Any] = {}
+        async for event in self.stream(code, timeout):
+            if event["type"] == "output":
+                output[event["stream"]].append(event["data"])
+            else:
+                result = event
+        result.pop("type", None)
+        return {"stdout": "".join(output["stdout"]), "stderr": "".join(output["stderr"]), **result}
+
+    def get_metrics(self) -> Dict[str, Any]:
+        executions = max(self.metrics["executions"], 1)
+        return {
+            "enabled": self.enabled,
+            "workers": self._worker_count,
+            "idle_workers": self._idle.qsize() if self._idle is not None else 0,
+            "average_execution_ms": round(self.metrics["total_execution_ms"] / executions, 3),
+            "average_wait_ms": round(self.metrics["total_wait_ms"] / executions, 3),
+            **{key: value for key, value in self.metrics.items() if not key.startswith("total_")}
+        }
+
+    async def shutdown(self):
+        """Stop all workers, including ones still starting, and wait for them to exit"""
+        self._closed = True
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        await asyncio.gather(*(worker.kill() for worker in self._workers), return_exceptions=True)
+        self._workers.clear()
+        self._worker_count = 0
+        if self._idle is not None:
+            while not self._idle.empty():
+                self._idle.get_nowait()
+
+
+# Global code execution pool instance
+code_executor = CodeExecutionPool()
+
+
+if __name__ == "__main__" and sys.argv[1:] == ["--worker"]:
+    _worker_main()
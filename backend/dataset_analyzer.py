@@ -0,0 +1,248 @@
+"""
+TRON Ultimate AI Platform - Dataset Analyzer
+Chunked, process-parallel summaries of large uploaded CSV/XLSX files
+"""
+
+import io
+import os
+import mmap
+import time
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_MB = 32
+XLSX_CHUNK_ROWS = 50000
+TOP_VALUES = 10
+
+CSV_SUFFIXES = {".csv": ",", ".tsv": "\t", ".txt": ","}
+XLSX_SUFFIXES = {".xlsx", ".xlsm"}
+
+
+# =============================================================================
+# PARTIAL AGGREGATES (worker side)
+# =============================================================================
+# A partial aggregate holds per-column counters that can be merged in any
+# order, so chunks are summarized independently and combined in the parent.
+
+def _aggregate_frame(frame) -> Dict[str, Any]:
+    import pandas as pd
+
+    columns = {}
+    for name in frame.columns:
+        series = frame[name]
+        non_null = series.dropna()
+        column = {"count": int(non_null.size), "nulls": int(series.size - non_null.size)}
+
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = non_null.astype("float64")
+            if values.size:
+                column.update({
+                    "sum": float(values.sum()),
+                    "sum_sq": float((values * values).sum()),
+                    "min": float(values.min()),
+                    "max": float(values.max())
+                })
+        else:
+            counts = non_null.astype(str).value_counts().head(TOP_VALUES * 2)
+            column["top"] = {str(key): int(value) for key, value in counts.items()}
+        columns[str(name)] = column
+    return {"rows": int(len(frame)), "columns": columns}
+
+
+def _merge_partials(target: Dict[str, Any], partial: Dict[str, Any]):
+    target["rows"] = target.get("rows", 0) + partial["rows"]
+    merged_columns = target.setdefault("columns", {})
+    for name, column in partial["columns"].items():
+        merged = merged_columns.setdefault(name, {"count": 0, "nulls": 0})
+        merged["count"] += column["count"]
+        merged["nulls"] += column["nulls"]
+        if "sum" in column:
+            merged["numeric_count"] = merged.get("numeric_count", 0) + column["count"]
+            merged["sum"] = merged.get("sum", 0.0) + column["sum"]
+            merged["sum_sq"] = merged.get("sum_sq", 0.0) + column["sum_sq"]
+            merged["min"] = min(merged.get("min", column["min"]), column["min"])
+            merged["max"] = max(merged.get("max", column["max"]), column["max"])
+        if "top" in column:
+            top = merged.setdefault("top", {})
+            for value, count in column["top"].items():
+                top[value] = top.get(value, 0) + count
+            if len(top) > TOP_VALUES * 4:
+                merged["top"] = dict(sorted(top.items(), key=lambda item: -item[1])[:TOP_VALUES * 2])
+
+
+def _aggregate_csv_range(path: str, start: int, end: int, columns: List[str], separator: str) -> Tuple[Dict[str, Any], float]:
+    """Summarize one newline-aligned byte range of a CSV file"""
+    import pandas as pd
+
+    started = time.perf_counter()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        frame = pd.read_csv(io.BytesIO(mapped[start:end]), sep=separator, header=None, names=columns)
+    partial = _aggregate_frame(frame)
+    return partial, time.perf_counter() - started
+
+
+def _aggregate_xlsx(path: str, chunk_rows: int) -> Tuple[Dict[str, Any], float]:
+    """Summarize the first sheet of a workbook in streaming read-only mode"""
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    started = time.perf_counter()
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(value) if value is not None else f"column_{index}" for index, value in enumerate(next(rows, []))]
+        merged: Dict[str, Any] = {"rows": 0, "columns": {}}
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                _merge_partials(merged, _aggregate_frame(pd.DataFrame(batch, columns=header)))
+                batch = []
+        if batch:
+            _merge_partials(merged, _aggregate_frame(pd.DataFrame(batch, columns=header)))
+    finally:
+        workbook.close()
+    return merged, time.perf_counter() - started
+
+
+# =============================================================================
+# PLANNING AND FINAL SUMMARY (parent side)
+# =============================================================================
+
+def _plan_csv_ranges(path: Path, chunk_bytes: int, separator: str) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Split a CSV into byte ranges that start and end on line boundaries
+    Only the header line and one line per boundary are read
+    Quoted fields containing newlines are not supported by this splitting
+    """
+    import pandas as pd
+
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        header_line = f.readline()
+        columns = [str(name) for name in pd.read_csv(io.BytesIO(header_line), sep=separator, nrows=0).columns]
+        ranges = []
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return columns, ranges
+
+
+def _finalize(merged: Dict[str, Any]) -> Dict[str, Any]:
+    columns = {}
+    for name, column in merged.get("columns", {}).items():
+        total = column["count"] + column["nulls"]
+        summary: Dict[str, Any] = {
+            "non_null": column["count"],
+            "null_ratio": round(column["nulls"] / total, 4) if total else 0.0
+        }
+        numeric_count = column.get("numeric_count", 0)
+        if numeric_count:
+            mean = column["sum"] / numeric_count
+            variance = max(column["sum_sq"] / numeric_count - mean * mean, 0.0)
+            summary.update({
+                "type": "numeric",
+                "mean": round(mean, 6),
+                "std": round(variance ** 0.5, 6),
+                "min": column["min"],
+                "max": column["max"]
+            })
+        if column.get("top"):
+            top = sorted(column["top"].items(), key=lambda item: -item[1])[:TOP_VALUES]
+            summary.setdefault("type", "categorical")
+            summary["top_values"] = dict(top)
+        columns[name] = summary
+    return {"rows": merged.get("rows", 0), "column_count": len(columns), "columns": columns}
+
+
+class DatasetAnalyzer:
+    """
+    Computes compact per-column summaries of arbitrarily large tabular files
+    CSV files are split into byte ranges that workers memory-map and parse
+    independently, so only compact aggregates cross process boundaries and
+    memory stays bounded by chunk size times worker count
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_mb: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("TRON_DATASET_WORKERS", min(4, os.cpu_count() or 1)))
+        self.chunk_bytes = (chunk_mb or int(os.getenv("TRON_DATASET_CHUNK_MB", DEFAULT_CHUNK_MB))) * 1024 * 1024
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def analyze(self, path: Path) -> Dict[str, Any]:
+        """Return the dataset summary and per-stage throughput figures"""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        suffix = path.suffix.lower()
+        size = path.stat().st_size
+        stages: Dict[str, Dict[str, Any]] = {}
+        merged: Dict[str, Any] = {"rows": 0, "columns": {}}
+        started = time.perf_counter()
+
+        if suffix in CSV_SUFFIXES:
+            separator = CSV_SUFFIXES[suffix]
+            columns, ranges = await asyncio.to_thread(_plan_csv_ranges, path, self.chunk_bytes, separator)
+            stages["plan"] = {"seconds": round(time.perf_counter() - started, 4), "chunks": len(ranges)}
+
+            # At most one range per worker is in flight, which bounds memory
+            slots = asyncio.Semaphore(self.max_workers)
+            worker_seconds = 0.0
+
+            async def run_range(start: int, end: int):
+                async with slots:
+                    return await loop.run_in_executor(
+                        executor, _aggregate_csv_range, str(path), start, end, columns, separator
+                    )
+
+            aggregate_started = time.perf_counter()
+            for future in asyncio.as_completed([run_range(start, end) for start, end in ranges]):
+                partial, seconds = await future
+                worker_seconds += seconds
+                _merge_partials(merged, partial)
+            aggregate_elapsed = time.perf_counter() - aggregate_started
+        elif suffix in XLSX_SUFFIXES:
+            aggregate_started = time.perf_counter()
+            merged, worker_seconds = await loop.run_in_executor(executor, _aggregate_xlsx, str(path), XLSX_CHUNK_ROWS)
+            aggregate_elapsed = time.perf_counter() - aggregate_started
+        else:
+            raise ValueError(f"Unsupported dataset format: {suffix or 'unknown'}")
+
+        stages["aggregate"] = {
+            "seconds": round(aggregate_elapsed, 4),
+            "worker_seconds": round(worker_seconds, 4),
+            "rows_per_second": round(merged["rows"] / aggregate_elapsed, 1) if aggregate_elapsed else None,
+            "mb_per_second": round(size / 1048576 / aggregate_elapsed, 2) if aggregate_elapsed else None
+        }
+
+        finalize_started = time.perf_counter()
+        summary = _finalize(merged)
+        stages["finalize"] = {"seconds": round(time.perf_counter() - finalize_started, 4)}
+
+        return {
+            "summary": summary,
+            "file_size_bytes": size,
+            "throughput": {"total_seconds": round(time.perf_counter() - started, 4), "stages": stages}
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global dataset analyzer instance
+dataset_analyzer = DatasetAnalyzer()
@@ -0,0 +1,137 @@
+"""
+TRON Ultimate AI Platform - Event Loop Monitor
+Continuous event-loop lag sampling and a watchdog that captures blocking stacks
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, Deque
+
+from live_session_bridge import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_MS = 100
+DEFAULT_BLOCK_MS = 250
+MAX_STACK_FRAMES = 30
+RECENT_EVENTS = 20
+
+
+class EventLoopMonitor:
+    """
+    A sampler task measures how late the loop wakes it (lag), and a watchdog thread
+    checks the sampler's heartbeat. When the heartbeat is older than the block
+    threshold, the loop thread is stuck in one callback and its stack is captured.
+    """
+
+    def __init__(self, sample_ms: Optional[float] = None, block_ms: Optional[float] = None):
+        self.sample_interval = (sample_ms or float(os.getenv("TRON_LOOP_SAMPLE_MS", DEFAULT_SAMPLE_MS))) / 1000
+        self.block_threshold = (block_ms or float(os.getenv("TRON_LOOP_BLOCK_MS", DEFAULT_BLOCK_MS))) / 1000
+        self.lag = LatencyRecorder()
+        self.blocking_events: Deque[Dict[str, Any]] = deque(maxlen=RECENT_EVENTS)
+        self.blocking_count = 0
+        self.max_lag = 0.0
+        self._heartbeat = time.perf_counter()
+        self._reported_heartbeat: Optional[float] = None
+        self._open_event: Optional[Dict[str, Any]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def start(self):
+        """Start sampling on the running loop; safe to call more than once"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started: sample {self.sample_interval * 1000:.0f} ms, "
+                    f"block threshold {self.block_threshold * 1000:.0f} ms")
+
+    async def _sample(self):
+        while True:
+            expected = time.perf_counter() + self.sample_interval
+            await asyncio.sleep(self.sample_interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - expected)
+            self._heartbeat = now
+            self.lag.record(lag)
+            self.max_lag = max(self.max_lag, lag)
+            # Complete the watchdog's event with the block's final duration
+            event = self._open_event
+            if event is not None:
+                event["blocked_ms"] = round(lag * 1000, 1)
+                self._open_event = None
+
+    def _watch(self):
+        poll = min(self.block_threshold / 2, self.sample_interval)
+        last_wake = time.perf_counter()
+        while not self._stopped.wait(poll):
+            now = time.perf_counter()
+            suspended = now - last_wake > poll + self.block_threshold
+            last_wake = now
+            if suspended:
+                # The watchdog was not scheduled either: the whole process was paused
+                # (frozen serverless container, SIGSTOP), so the stale heartbeat is not a block
+                self._reported_heartbeat = self._heartbeat
+                continue
+            heartbeat = self._heartbeat
+            stalled = time.perf_counter() - heartbeat - self.sample_interval
+            if stalled < self.block_threshold or heartbeat == self._reported_heartbeat:
+                continue
+            self._reported_heartbeat = heartbeat
+            self._record_block(stalled)
+
+    def _record_block(self, stalled: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame, limit=MAX_STACK_FRAMES) if frame is not None else []
+        event = {
+            "detected_at": datetime.now().isoformat(),
+            "blocked_ms": round(stalled * 1000, 1),
+            "stack": "".join(stack)
+        }
+        self.blocking_count += 1
+        self.blocking_events.append(event)
+        self._open_event = event
+        logger.warning("Event loop blocked", extra={
+            "blocked_ms": event["blocked_ms"],
+            "threshold_ms": round(self.block_threshold * 1000),
+            "stack": event["stack"]
+        })
+
+    def get_metrics(self) -> Dict[str, Any]:
+        summary = self.lag.summary()
+        return {
+            "running": self._task is not None,
+            "samples": summary["count"],
+            "lag_p50_ms": summary["p50_ms"],
+            "lag_p95_ms": summary["p95_ms"],
+            "lag_p99_ms": summary["p99_ms"],
+            "lag_max_ms": round(self.max_lag * 1000, 2),
+            "block_threshold_ms": round(self.block_threshold * 1000),
+            "blocking_events": self.blocking_count
+        }
+
+    def recent_blocking_events(self):
+        return list(self.blocking_events)
+
+    def shutdown(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+# Global event loop monitor instance
+loop_monitor = EventLoopMonitor()
@@ -0,0 +1,365 @@
+"""
+TRON Ultimate AI Platform - Fake Services
+In-process stand-ins for the Gemini SDK client and the Supabase client, for offline load testing
+
+Enabled with TRON_FAKE_SERVICES=gemini,supabase. Latency specs are
+"fixed:MS", "uniform:MIN_MS:MAX_MS", "normal:MEAN_MS:STD_MS" or "lognormal:MEDIAN_MS:SIGMA".
+"""
+
+import os
+import time
+import uuid
+import math
+import zlib
+import struct
+import random
+import asyncio
+import threading
+import contextlib
+from types import SimpleNamespace
+from typing import Optional, Dict, Any, List, Iterator, AsyncIterator
+
+DEFAULT_GEMINI_LATENCY = "lognormal:800:0.4"
+DEFAULT_SUPABASE_LATENCY = "lognormal:15:0.3"
+DEFAULT_RESPONSE_CHARS = 1200
+DEFAULT_STREAM_CHUNKS = 8
+MAX_ROWS_PER_TABLE = 10000
+
+# 100 ms of 16-bit mono PCM at 24 kHz
+FAKE_AUDIO_FRAME = b"\x00\x00" * 2400
+
+
+def fake_service_enabled(name: str) -> bool:
+    """True when TRON_FAKE_SERVICES lists the given service"""
+    return name in {item.strip().lower() for item in os.getenv("TRON_FAKE_SERVICES", "").split(",")}
+
+
+class FakeServiceError(Exception):
+    """Injected failure from a fake service"""
+
+
+class LatencyModel:
+    """Samples request latencies in seconds from a configured distribution"""
+
+    def __init__(self, spec: str, rng: random.Random):
+        self.spec = spec
+        self.rng = rng
+        kind, *values = spec.split(":")
+        self.kind = kind.lower()
+        self.values = [float(value) for value in values]
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if self.kind not in expected or len(self.values) != expected[self.kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            ms = self.values[0]
+        elif self.kind == "uniform":
+            ms = self.rng.uniform(*self.values)
+        elif self.kind == "normal":
+            ms = self.rng.gauss(*self.values)
+        else:
+            median, sigma = self.values
+            ms = self.rng.lognormvariate(math.log(median), sigma)
+        return max(0.0, ms) / 1000
+
+
+class FakeServiceBehavior:
+    """Latency, error rate and payload shape shared by one fake service"""
+
+    def __init__(self, prefix: str, default_latency: str):
+        seed = os.getenv("TRON_FAKE_SEED")
+        self.rng = random.Random(int(seed) if seed else None)
+        self.latency = LatencyModel(os.getenv(f"{prefix}_LATENCY", default_latency), self.rng)
+        self.error_rate = float(os.getenv(f"{prefix}_ERROR_RATE", 0))
+        self.calls = 0
+        self.failures = 0
+
+    def _maybe_fail(self, operation: str):
+        self.calls += 1
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.failures += 1
+            raise FakeServiceError(f"Injected failure in {operation}")
+
+    def wait(self, operation: str, scale: float = 1.0):
+        """Blocking delay, matching the synchronous SDK calls it stands in for"""
+        time.sleep(self.latency.sample() * scale)
+        self._maybe_fail(operation)
+
+    async def wait_async(self, operation: str, scale: float = 1.0):
+        await asyncio.sleep(self.latency.sample() * scale)
+        self._maybe_fail(operation)
+
+
+def _placeholder_png(width: int = 256, height: int = 256) -> bytes:
+    """Minimal grayscale PNG built without an imaging library"""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\x00" + bytes((x * 255 // width) for x in range(width)) for _ in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+# =============================================================================
+# FAKE GEMINI
+# =============================================================================
+
+class FakeGeminiModels:
+    def __init__(self, behavior: FakeServiceBehavior):
+        self.behavior = behavior
+        self.response_chars = int(os.getenv("TRON_FAKE_GEMINI_RESPONSE_CHARS", DEFAULT_RESPONSE_CHARS))
+        self.stream_chunks = max(1, int(os.getenv("TRON_FAKE_GEMINI_STREAM_CHUNKS", DEFAULT_STREAM_CHUNKS)))
+        self._image = _placeholder_png()
+
+    def _response(self, model: str, config: Optional[Dict[str, Any]], text: Optional[str] = None):
+        if text is None:
+            sentence = f"Synthetic response from {model}. "
+            text = (sentence * (self.response_chars // len(sentence) + 1))[:self.response_chars]
+        parts = [SimpleNamespace(text=text, inline_data=None)]
+        if "IMAGE" in (config or {}).get("response_modalities", []):
+            parts.append(SimpleNamespace(text=None, inline_data=SimpleNamespace(data=self._image, mime_type="image/png")))
+        return SimpleNamespace(
+            text=text,
+            candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts), finish_reason="STOP")],
+            usage_metadata=SimpleNamespace(prompt_token_count=100, candidates_token_count=len(text) // 4)
+        )
+
+    def _chunks(self, model: str) -> List[str]:
+        text = self._response(model, None).text
+        size = max(1, len(text) // self.stream_chunks)
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def generate_content(self, model: str, contents: Any = None, config: Optional[Dict[str, Any]] = None):
+        self.behavior.wait("generate_content")
+        return self._response(model, config)
+
+    def generate_content_stream(self, model: str, contents: Any = None,
+                                config: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        chunks = self._chunks(model)
+        for chunk in chunks:
+            self.behavior.wait("generate_content_stream", scale=1 / len(chunks))
+            yield self._response(model, config, text=chunk)
+
+
+class FakeGeminiAsyncModels:
+    def __init__(self, models: FakeGeminiModels):
+        self.models = models
+
+    async def get(self, model: str, config: Optional[Dict[str, Any]] = None):
+        await self.models.behavior.wait_async("models.get", scale=0.05)
+        return SimpleNamespace(name=f"models/{model}", display_name=model)
+
+    async def generate_content(self, model: str, contents: Any = None, config: Optional[Dict[str, Any]] = None):
+        await self.models.behavior.wait_async("generate_content")
+        return self.models._response(model, config)
+
+    async def generate_content_stream(self, model: str, contents: Any = None,
+                                      config: Optional[Dict[str, Any]] = None) -> AsyncIterator[Any]:
+        chunks = self.models._chunks(model)
+
+        async def stream():
+            for chunk in chunks:
+                await self.models.behavior.wait_async("generate_content_stream", scale=1 / len(chunks))
+                yield self.models._response(model, config, text=chunk)
+        return stream()
+
+
+class FakeLiveSession:
+    """Answers each completed input turn with audio frames, a text part and turn_complete"""
+
+    def __init__(self, behavior: FakeServiceBehavior, frames: int):
+        self.behavior = behavior
+        self.frames = frames
+        self._turns: asyncio.Queue = asyncio.Queue()
+
+    async def send_realtime_input(self, audio=None, audio_stream_end=None, **kwargs):
+        if audio_stream_end:
+            await self._turns.put("audio")
+
+    async def send_client_content(self, turns=None, turn_complete=True, **kwargs):
+        if turn_complete:
+            await self._turns.put("text")
+
+    async def receive(self):
+        await self._turns.get()
+        await self.behavior.wait_async("live.receive")
+        for _ in range(self.frames):
+            yield SimpleNamespace(data=FAKE_AUDIO_FRAME, text=None, server_content=None)
+            await asyncio.sleep(0.1 / self.frames)
+        yield SimpleNamespace(data=None, text="Synthetic live reply.", server_content=SimpleNamespace(turn_complete=True))
+
+
+class FakeGeminiLive:
+    def __init__(self, behavior: FakeServiceBehavior, frames: int):
+        self.behavior = behavior
+        self.frames = frames
+
+    @contextlib.asynccontextmanager
+    async def connect(self, model: str, config: Optional[Dict[str, Any]] = None):
+        await self.behavior.wait_async("live.connect", scale=0.5)
+        yield FakeLiveSession(self.behavior, self.frames)
+
+
+class FakeGeminiFiles:
+    def __init__(self, behavior: FakeServiceBehavior):
+        self.behavior = behavior
+        self._files: Dict[str, Any] = {}
+
+    def upload(self, file: str, config: Optional[Dict[str, Any]] = None):
+        self.behavior.wait("files.upload", scale=0.5)
+        name = f"files/{uuid.uuid4().hex[:12]}"
+        remote = SimpleNamespace(
+            name=name,
+            uri=f"https://generativelanguage.invalid/v1beta/{name}",
+            mime_type=(config or {}).get("mime_type", "application/octet-stream"),
+            state=SimpleNamespace(name="ACTIVE"),
+            expiration_time=None
+        )
+        self._files[name] = remote
+        return remote
+
+    def get(self, name: str):
+        return self._files[name]
+
+
+class FakeGeminiClient:
+    """Drop-in for the SDK client surface the engine uses: models, aio, files"""
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.behavior = FakeServiceBehavior("TRON_FAKE_GEMINI", DEFAULT_GEMINI_LATENCY)
+        self.models = FakeGeminiModels(self.behavior)
+        self.aio = SimpleNamespace(
+            models=FakeGeminiAsyncModels(self.models),
+            live=FakeGeminiLive(self.behavior, self.models.stream_chunks)
+        )
+        self.files = FakeGeminiFiles(self.behavior)
+
+
+# =============================================================================
+# FAKE SUPABASE
+# =============================================================================
+
+class FakeAPIResponse:
+    def __init__(self, data: List[Dict[str, Any]], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+class FakeQuery:
+    """Chainable PostgREST-style query over an in-memory table"""
+
+    def __init__(self, client: "FakeSupabaseClient", table: str):
+        self.client = client
+        self.table = table
+        self.operation = "select"
+        self.payload: Any = None
+        self.count_mode: Optional[str] = None
+        self.filters: List[tuple] = []
+        self.ordering: Optional[tuple] = None
+        self.row_limit: Optional[int] = None
+
+    def select(self, columns: str = "*", count: Optional[str] = None):
+        self.operation, self.count_mode = "select", count
+        return self
+
+    def insert(self, data):
+        self.operation, self.payload = "insert", data
+        return self
+
+    def upsert(self, data):
+        self.operation, self.payload = "insert", data
+        return self
+
+    def update(self, data):
+        self.operation, self.payload = "update", data
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    def eq(self, column: str, value):
+        self.filters.append((column, lambda field, value=value: field == value))
+        return self
+
+    def gte(self, column: str, value):
+        self.filters.append((column, lambda field, value=value: field is not None and field >= value))
+        return self
+
+    def lte(self, column: str, value):
+        self.filters.append((column, lambda field, value=value: field is not None and field <= value))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        self.ordering = (column, desc)
+        return self
+
+    def limit(self, count: int):
+        self.row_limit = count
+        return self
+
+    def _matches(self, row: Dict[str, Any]) -> bool:
+        return all(check(row.get(column)) for column, check in self.filters)
+
+    def execute(self) -> FakeAPIResponse:
+        self.client.behavior.wait(f"{self.operation} {self.table}")
+        with self.client.lock:
+            rows = self.client.tables.setdefault(self.table, [])
+            if self.operation == "insert":
+                new_rows = self.payload if isinstance(self.payload, list) else [self.payload]
+                rows.extend(dict(row) for row in new_rows)
+                del rows[:-MAX_ROWS_PER_TABLE]
+                return FakeAPIResponse(new_rows)
+            matched = [row for row in rows if self._matches(row)]
+            if self.operation == "update":
+                for row in matched:
+                    row.update(self.payload)
+                return FakeAPIResponse(matched)
+            if self.operation == "delete":
+                self.client.tables[self.table] = [row for row in rows if not self._matches(row)]
+                return FakeAPIResponse(matched)
+            if self.ordering:
+                column, desc = self.ordering
+                matched.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+            count = len(matched) if self.count_mode else None
+            if self.row_limit is not None:
+                matched = matched[:self.row_limit]
+            return FakeAPIResponse([dict(row) for row in matched], count)
+
+
+class FakeStorageBucket:
+    def __init__(self, client: "FakeSupabaseClient", bucket: str):
+        self.client = client
+        self.objects = client.buckets.setdefault(bucket, {})
+
+    def upload(self, path: str, data: bytes, file_options: Optional[Dict[str, Any]] = None):
+        self.client.behavior.wait("storage.upload")
+        self.objects[path] = bytes(data)
+        return {"Key": path}
+
+    def download(self, path: str) -> bytes:
+        self.client.behavior.wait("storage.download")
+        return self.objects[path]
+
+    def list(self, path: str = "", options: Optional[Dict[str, Any]] = None):
+        self.client.behavior.wait("storage.list")
+        prefix = f"{path}/" if path else ""
+        search = (options or {}).get("search", "")
+        return [
+            {"name": key[len(prefix):]} for key in self.objects
+            if key.startswith(prefix) and search in key[len(prefix):]
+        ]
+
+
+class FakeSupabaseClient:
+    """Drop-in for the Supabase client surface the database manager uses: table() and storage"""
+
+    def __init__(self):
+        self.behavior = FakeServiceBehavior("TRON_FAKE_SUPABASE", DEFAULT_SUPABASE_LATENCY)
+        self.tables: Dict[str, List[Dict[str, Any]]] = {}
+        self.buckets: Dict[str, Dict[str, bytes]] = {}
+        self.lock = threading.Lock()
+        self.storage = SimpleNamespace(from_=lambda bucket: FakeStorageBucket(self, bucket))
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
@@ -0,0 +1,180 @@
+"""
+TRON Ultimate AI Platform - File Renderers
+Real PDF, DOCX and XLSX output rendered in a worker pool off the event loop
+"""
+
+import io
+import os
+import re
+import csv
+import math
+import time
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Canonical decimal numbers only: "007", "+7", "1_000", "nan" and "inf" stay text
+NUMERIC_CELL = re.compile(r"-?(0|[1-9][0-9]*)(\.[0-9]+)?([eE][+-]?[0-9]+)?")
+# Excel stores numbers as doubles, so longer integers (IDs, card numbers) would lose digits
+MAX_INTEGER_DIGITS = 15
+
+
+# =============================================================================
+# RENDERERS (worker side)
+# =============================================================================
+# Content is plain text: blank lines separate paragraphs and lines starting
+# with "#" are headings. XLSX content is CSV or tab-separated rows.
+
+def _paragraphs(content: str) -> Iterator[str]:
+    block: List[str] = []
+    for line in content.splitlines():
+        if line.strip():
+            block.append(line)
+        elif block:
+            yield "\n".join(block)
+            block = []
+    if block:
+        yield "\n".join(block)
+
+
+def _heading_level(paragraph: str) -> int:
+    stripped = paragraph.lstrip()
+    level = len(stripped) - len(stripped.lstrip("#"))
+    return level if 0 < level <= 3 and stripped[level:level + 1] == " " else 0
+
+
+def render_pdf(content: str, path: str):
+    from xml.sax.saxutils import escape
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    styles = getSampleStyleSheet()
+    story = []
+    for paragraph in _paragraphs(content):
+        level = _heading_level(paragraph)
+        if level:
+            story.append(Paragraph(escape(paragraph.lstrip()[level:].strip()), styles[f"Heading{level}"]))
+        else:
+            story.append(Paragraph(escape(paragraph).replace("\n", "<br/>"), styles["BodyText"]))
+        story.append(Spacer(1, 6))
+    SimpleDocTemplate(path, pagesize=A4).build(story)
+
+
+def render_docx(content: str, path: str):
+    from docx import Document
+
+    document = Document()
+    for paragraph in _paragraphs(content):
+        level = _heading_level(paragraph)
+        if level:
+            document.add_heading(paragraph.lstrip()[level:].strip(), level=level)
+        else:
+            document.add_paragraph(paragraph)
+    document.save(path)
+
+
+def render_xlsx(content: str, path: str):
+    from openpyxl import Workbook
+
+    # write_only mode streams rows to disk instead of holding the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    first_line = content.split("\n", 1)[0]
+    delimiter = "\t" if "\t" in first_line else ","
+    for row in csv.reader(io.StringIO(content), delimiter=delimiter):
+        sheet.append([_coerce_cell(value) for value in row])
+    workbook.save(path)
+
+
+def _coerce_cell(value: str):
+    match = NUMERIC_CELL.fullmatch(value)
+    if match is None:
+        return value
+    if match.group(2) is None and match.group(3) is None:
+        return int(value) if len(match.group(1)) <= MAX_INTEGER_DIGITS else value
+    number = float(value)
+    return number if math.isfinite(number) else value
+
+
+def render_text(content: str, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+RENDERERS = {
+    "pdf": render_pdf,
+    "docx": render_docx,
+    "xlsx": render_xlsx
+}
+
+
+def _render(content: str, path: str, format_type: str) -> Dict[str, Any]:
+    """Worker entry point: render, then report timing and size"""
+    started = time.perf_counter()
+    RENDERERS.get(format_type, render_text)(content, path)
+    return {
+        "render_seconds": time.perf_counter() - started,
+        "size_bytes": os.path.getsize(path)
+    }
+
+
+# =============================================================================
+# RENDERING POOL
+# =============================================================================
+
+class FileRenderer:
+    """
+    Dispatches file rendering to a process pool and records per-format metrics
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("TRON_RENDER_WORKERS", 2))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.metrics: Dict[str, Dict[str, float]] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def render(self, content: str, path: Path, format_type: str) -> Dict[str, Any]:
+        """Render content to path in the requested format"""
+        format_type = format_type.lower()
+        if format_type in RENDERERS:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), _render, content, str(path), format_type)
+        else:
+            # Plain text needs no worker process, only a thread for the file write
+            result = await asyncio.to_thread(_render, content, str(path), format_type)
+
+        stats = self.metrics.setdefault(format_type, {"count": 0, "total_seconds": 0.0, "total_bytes": 0, "max_seconds": 0.0})
+        stats["count"] += 1
+        stats["total_seconds"] += result["render_seconds"]
+        stats["total_bytes"] += result["size_bytes"]
+        stats["max_seconds"] = max(stats["max_seconds"], result["render_seconds"])
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            format_type: {
+                "count": stats["count"],
+                "average_seconds": round(stats["total_seconds"] / stats["count"], 4),
+                "max_seconds": round(stats["max_seconds"], 4),
+                "average_bytes": int(stats["total_bytes"] / stats["count"])
+            }
+            for format_type, stats in self.metrics.items()
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global file renderer instance
+file_renderer = FileRenderer()
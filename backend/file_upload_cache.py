@@ -0,0 +1,193 @@
+"""
+TRON Ultimate AI Platform - File Upload Cache
+Local upload storage and digest-keyed reuse of files sent to the model file API
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = Path(tempfile.gettempdir()) / "tron_ai_uploads"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Files API uploads expire after 48 hours; stop reusing them a little earlier
+DEFAULT_REMOTE_TTL = 47 * 3600
+EXPIRY_SAFETY_MARGIN = 10 * 60
+
+DEFAULT_MAX_HANDLES = 1024
+DEFAULT_MAX_DIGESTS = 4096
+# Give up on a file the API is still processing after this many seconds
+DEFAULT_PROCESSING_TIMEOUT = 300
+PROCESSING_POLL_INTERVAL = 1
+
+
+def resolve_upload(file_id: str) -> Optional[Path]:
+    """Map an upload ID returned by /upload-file to its local path"""
+    if not file_id or Path(file_id).name != file_id:
+        return None
+    path = UPLOAD_DIR / file_id
+    return path if path.is_file() else None
+
+
+@dataclass
+class RemoteFileHandle:
+    """A file already transferred to the model file API"""
+    name: str
+    uri: str
+    mime_type: str
+    size_bytes: int
+    expires_at: float
+
+    def is_valid(self) -> bool:
+        return time.time() < self.expires_at - EXPIRY_SAFETY_MARGIN
+
+    def to_part(self) -> Dict[str, Any]:
+        return {"file_data": {"file_uri": self.uri, "mime_type": self.mime_type}}
+
+
+class FileUploadCache:
+    """
+    Uploads each distinct file content once and reuses the remote handle
+    Handles are keyed by SHA-256 digest and dropped when close to expiry
+    """
+
+    def __init__(self):
+        self.max_handles = int(os.getenv("TRON_UPLOAD_CACHE_MAX_HANDLES", DEFAULT_MAX_HANDLES))
+        self.max_digests = int(os.getenv("TRON_UPLOAD_CACHE_MAX_DIGESTS", DEFAULT_MAX_DIGESTS))
+        self.processing_timeout = float(os.getenv("TRON_UPLOAD_PROCESSING_TIMEOUT", DEFAULT_PROCESSING_TIMEOUT))
+        self._handles: "OrderedDict[str, RemoteFileHandle]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        # (path, size, mtime_ns) -> digest, so unchanged files are never re-hashed.
+        # Digests are computed in worker threads, so the LRU is only touched under its lock
+        self._digests: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._digests_lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "bytes_uploaded": 0, "bytes_reused": 0}
+
+    @staticmethod
+    def _remember(entries: OrderedDict, key, value, limit: int) -> int:
+        """Insert as most recent and drop the oldest entries past limit; returns how many were dropped"""
+        entries[key] = value
+        entries.move_to_end(key)
+        dropped = 0
+        while len(entries) > limit:
+            entries.popitem(last=False)
+            dropped += 1
+        return dropped
+
+    def record_digest(self, path: Path, digest: str):
+        """Remember a digest computed while the file was being written"""
+        stat = path.stat()
+        with self._digests_lock:
+            self._remember(self._digests, (str(path), stat.st_size, stat.st_mtime_ns), digest, self.max_digests)
+
+    def compute_digest(self, path: Path) -> str:
+        """SHA-256 of a local file, streamed; blocking"""
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        with self._digests_lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+                return digest
+
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with self._digests_lock:
+            self._remember(self._digests, key, digest, self.max_digests)
+        return digest
+
+    def get(self, digest: str) -> Optional[RemoteFileHandle]:
+        handle = self._handles.get(digest)
+        if handle is None:
+            return None
+        if not handle.is_valid():
+            del self._handles[digest]
+            self.metrics["expired"] += 1
+            return None
+        self._handles.move_to_end(digest)
+        return handle
+
+    async def get_or_upload(self, client, path: Path) -> RemoteFileHandle:
+        """
+        Return a live remote handle for the file, uploading only on a cache miss
+        Concurrent requests for the same content share a single upload. The upload
+        runs in its own task, so a requester cancelled at its deadline or on
+        disconnect stops waiting without failing the others or losing the handle.
+        """
+        digest = await asyncio.to_thread(self.compute_digest, path)
+
+        handle = self.get(digest)
+        if handle is not None:
+            self.metrics["hits"] += 1
+            self.metrics["bytes_reused"] += handle.size_bytes
+            return handle
+
+        upload = self._in_flight.get(digest)
+        if upload is None:
+            upload = asyncio.create_task(self._upload_and_cache(client, path, digest))
+            # Mark a failure as retrieved when every requester has gone away
+            upload.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._in_flight[digest] = upload
+        return await asyncio.shield(upload)
+
+    async def _upload_and_cache(self, client, path: Path, digest: str) -> RemoteFileHandle:
+        try:
+            handle = await asyncio.to_thread(self._upload, client, path, self.processing_timeout)
+            self.metrics["evicted"] += self._remember(self._handles, digest, handle, self.max_handles)
+            self.metrics["misses"] += 1
+            self.metrics["bytes_uploaded"] += handle.size_bytes
+            return handle
+        finally:
+            self._in_flight.pop(digest, None)
+
+    @staticmethod
+    def _upload(client, path: Path, processing_timeout: float = DEFAULT_PROCESSING_TIMEOUT) -> RemoteFileHandle:
+        mime_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        remote = client.files.upload(file=str(path), config={"mime_type": mime_type})
+
+        # Large documents and videos are processed asynchronously before use
+        give_up_at = time.monotonic() + processing_timeout
+        while getattr(getattr(remote, "state", None), "name", None) == "PROCESSING":
+            if time.monotonic() >= give_up_at:
+                raise TimeoutError(f"File API still processing {path.name} after {processing_timeout:g}s")
+            time.sleep(PROCESSING_POLL_INTERVAL)
+            remote = client.files.get(name=remote.name)
+
+        expiration = getattr(remote, "expiration_time", None)
+        expires_at = expiration.timestamp() if expiration else time.time() + DEFAULT_REMOTE_TTL
+        logger.info(f"Uploaded {path.name} to file API as {remote.name}")
+        return RemoteFileHandle(
+            name=remote.name,
+            uri=remote.uri,
+            mime_type=getattr(remote, "mime_type", None) or mime_type,
+            size_bytes=path.stat().st_size,
+            expires_at=expires_at
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "cached_handles": len(self._handles),
+            "max_handles": self.max_handles,
+            "cached_digests": len(self._digests),
+            "uploads_in_flight": len(self._in_flight),
+            **self.metrics
+        }
+
+
+# Global upload cache instance
+upload_cache = FileUploadCache()
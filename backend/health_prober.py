@@ -0,0 +1,208 @@
+"""
+TRON Ultimate AI Platform - Health Prober
+Background upstream checks behind cached liveness and readiness endpoints
+
+A single task probes Gemini reachability, database latency and engine slot
+saturation every TRON_HEALTH_INTERVAL seconds. /health/live and /health/ready
+return the cached outcome, pre-serialized, so orchestrator probes cost O(1) and
+never fan out into upstream traffic however often they arrive. Upstream
+failures show as "degraded"; by default only engine saturation gates readiness.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Callable, Tuple, Awaitable
+
+from json_serialization import dumps
+from fake_services import fake_service_enabled
+from supabase_database_manager import db_manager
+from tenant_scheduler import tenant_scheduler
+from code_execution_pool import code_executor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 15.0
+DEFAULT_PROBE_TIMEOUT = 5.0
+DEFAULT_DB_LATENCY_MS = 500.0
+DEFAULT_FAILURE_THRESHOLD = 2
+# Readiness gates on local state only by default: a Gemini or database outage would take
+# every replica out of rotation at once, so those checks report "degraded" instead
+DEFAULT_READINESS_CHECKS = "scheduler"
+# Not ready once this many scheduler rounds are queued behind the busy slots
+SATURATION_QUEUE_ROUNDS = 2
+DEGRADED_UTILIZATION = 0.9
+# Model fetched to check reachability; a metadata read costs no tokens
+PROBE_MODEL = "gemini-2.5-flash"
+
+
+def _check(status: str, latency_ms: Optional[float] = None, **detail) -> Dict[str, Any]:
+    return {"status": status, "latency_ms": latency_ms, **detail}
+
+
+class HealthProber:
+    """Runs the upstream checks on an interval and keeps their last outcome ready to serve"""
+
+    def __init__(self):
+        self.interval = float(os.getenv("TRON_HEALTH_INTERVAL", DEFAULT_INTERVAL))
+        self.probe_timeout = float(os.getenv("TRON_HEALTH_TIMEOUT", DEFAULT_PROBE_TIMEOUT))
+        self.db_latency_ms = float(os.getenv("TRON_HEALTH_DB_LATENCY_MS", DEFAULT_DB_LATENCY_MS))
+        self.failure_threshold = int(os.getenv("TRON_HEALTH_FAILURES", DEFAULT_FAILURE_THRESHOLD))
+        self.required = tuple(name.strip() for name in
+                              os.getenv("TRON_READINESS_CHECKS", DEFAULT_READINESS_CHECKS).split(",") if name.strip())
+        # Results older than this are not trusted for readiness (e.g. after a suspended process resumes)
+        self.stale_after = self.interval * 3
+
+        self.checks: Dict[str, Dict[str, Any]] = {}
+        self.ready = False
+        self.probes = 0
+        self.last_probe: Optional[float] = None
+        self.started_at = time.monotonic()
+        self._failures: Dict[str, int] = {}
+        self._ready_response: Tuple[int, bytes] = (503, dumps({"status": "starting", "ready": False}))
+        self._client_factory: Optional[Callable[[], Any]] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    async def start(self, client_factory: Callable[[], Any]):
+        """Begin probing; the first round runs in the background so startup is not delayed"""
+        if self._task is not None:
+            return
+        self._client_factory = client_factory
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def shutdown(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_once()
+            except Exception as e:
+                logger.error(f"Health probe round failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    # =============================================================================
+    # CHECKS
+    # =============================================================================
+
+    async def _timed(self, name: str, probe: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            return await asyncio.wait_for(probe(), self.probe_timeout)
+        except asyncio.TimeoutError:
+            return _check("failed", self.probe_timeout * 1000, error=f"{name} probe timed out")
+        except Exception as e:
+            return _check("failed", error=str(e))
+
+    async def _probe_gemini(self) -> Dict[str, Any]:
+        if not os.getenv("GEMINI_API_KEY") and not fake_service_enabled("gemini"):
+            return _check("failed", error="GEMINI_API_KEY not configured")
+        started = time.perf_counter()
+        await self._client_factory().aio.models.get(model=PROBE_MODEL)
+        return _check("ok", round((time.perf_counter() - started) * 1000, 1))
+
+    async def _probe_database(self) -> Dict[str, Any]:
+        result = await db_manager.health_check()
+        if result["status"] == "disconnected":
+            return _check("failed", error=result["message"])
+        if result["status"] != "healthy":
+            return _check("failed", error=result.get("error", result["message"]))
+        latency = result["latency_ms"]
+        return _check("degraded" if latency > self.db_latency_ms else "ok", latency)
+
+    async def _probe_scheduler(self) -> Dict[str, Any]:
+        metrics = tenant_scheduler.get_metrics()
+        concurrency = metrics["concurrency"]
+        utilization = metrics["in_flight"] / concurrency
+        status = "ok"
+        if metrics["queued"] >= concurrency * SATURATION_QUEUE_ROUNDS:
+            status = "failed"
+        elif utilization >= DEGRADED_UTILIZATION:
+            status = "degraded"
+        code_metrics = code_executor.get_metrics()
+        return _check(status, utilization=round(utilization, 3), in_flight=metrics["in_flight"],
+                      queued=metrics["queued"], code_workers_idle=code_metrics["idle_workers"])
+
+    async def probe_once(self):
+        """One round of all checks, run concurrently, then rebuild the cached responses"""
+        names = ("gemini", "database", "scheduler")
+        results = await asyncio.gather(
+            self._timed("gemini", self._probe_gemini),
+            self._timed("database", self._probe_database),
+            self._timed("scheduler", self._probe_scheduler)
+        )
+        checked_at = time.time()
+        for name, result in zip(names, results):
+            self._failures[name] = self._failures.get(name, 0) + 1 if result["status"] == "failed" else 0
+            result["consecutive_failures"] = self._failures[name]
+            result["checked_at"] = checked_at
+            self.checks[name] = result
+
+        # Leaving the ready state takes failure_threshold failed rounds; becoming ready needs one clean round
+        threshold = self.failure_threshold if self.ready else 1
+        failing = [name for name in self.required if self._failures.get(name, 0) >= threshold]
+        was_ready = self.ready
+        self.ready = not failing
+        self.probes += 1
+        self.last_probe = time.monotonic()
+        if was_ready != self.ready:
+            log = logger.info if self.ready else logger.warning
+            log(f"Readiness changed to {'ready' if self.ready else 'not ready'}", extra={"failing": failing})
+
+        degraded = any(check["status"] != "ok" for check in self.checks.values())
+        self._ready_response = (200 if self.ready else 503, dumps({
+            "status": ("degraded" if degraded else "ready") if self.ready else "not_ready",
+            "ready": self.ready,
+            "failing": failing,
+            "required": list(self.required),
+            "checks": self.checks,
+            "checked_at": checked_at,
+            "interval_seconds": self.interval
+        }))
+
+    # =============================================================================
+    # SERVING
+    # =============================================================================
+
+    def liveness(self) -> Tuple[int, Dict[str, Any]]:
+        """Alive while the process serves requests and the prober task has not died"""
+        stopped = self._task is not None and self._task.done()
+        return (503 if stopped else 200), {
+            "status": "prober_stopped" if stopped else "alive",
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1),
+            "last_probe_age_seconds": self._probe_age()
+        }
+
+    def readiness(self) -> Tuple[int, bytes]:
+        """Cached readiness response; a stale one is refused and a fresh round is requested"""
+        age = self._probe_age()
+        if age is not None and age > self.stale_after:
+            if self._wake is not None:
+                self._wake.set()
+            return 503, dumps({"status": "stale", "ready": False, "last_probe_age_seconds": age})
+        return self._ready_response
+
+    def _probe_age(self) -> Optional[float]:
+        return None if self.last_probe is None else round(time.monotonic() - self.last_probe, 1)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "probes": self.probes,
+            "last_probe_age_seconds": self._probe_age(),
+            "required": list(self.required),
+            "checks": {name: {key: check.get(key) for key in ("status", "latency_ms", "consecutive_failures")}
+                       for name, check in self.checks.items()}
+        }
+
+
+# Global health prober instance
+health_prober = HealthProber()
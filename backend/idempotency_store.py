@@ -0,0 +1,367 @@
+"""
+TRON Ultimate AI Platform - Idempotency Store
+Idempotency-Key handling for POST endpoints: stored result replay and in-flight attachment
+
+A POST carrying an Idempotency-Key runs once per tenant and key. A retry of a
+completed request gets the stored response back without reaching the engine; a
+retry that arrives while the first attempt is still running waits for it and
+receives the same response. Reusing a key with a different request body is
+rejected with 422. Results live in memory (bounded LRU with TTL) or in Redis
+when REDIS_URL is set, so retries landing on another worker are covered too.
+"""
+
+import os
+import time
+import base64
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple
+
+from starlette.requests import Request
+
+from json_serialization import dumps, loads
+from tenant_scheduler import resolve_tenant
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BODY_KB = 2048
+DEFAULT_PENDING_TIMEOUT = 300
+POLL_INTERVAL = 0.1
+MAX_KEY_LENGTH = 255
+PATH_PREFIX = "/api/ultimate-ai/"
+STREAMING_TYPES = (b"application/x-ndjson", b"text/event-stream")
+# Client errors a retry is expected to get past: credentials fixed, timeouts, rate limits,
+# and 499 when the first caller disconnected or its deadline cancelled the work
+RETRYABLE_STATUSES = (401, 403, 408, 425, 429, 499)
+
+
+@dataclass
+class StoredResponse:
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    fingerprint: str
+    created_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> bytes:
+        return dumps({
+            "s": self.status,
+            "h": [[name.decode("latin-1"), value.decode("latin-1")] for name, value in self.headers],
+            "b": base64.b64encode(self.body).decode("ascii"),
+            "f": self.fingerprint,
+            "c": self.created_at
+        })
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> "StoredResponse":
+        data = loads(raw)
+        return cls(
+            status=data["s"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in data["h"]],
+            body=base64.b64decode(data["b"]),
+            fingerprint=data["f"],
+            created_at=data["c"]
+        )
+
+
+class MemoryIdempotencyStore:
+    """Process-local LRU of stored responses with expiry; claims are process-local too"""
+
+    def __init__(self, ttl: int = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._claims: Dict[str, float] = {}
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        stored = self._entries.get(key)
+        if stored is None:
+            return None
+        if time.time() - stored.created_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return stored
+
+    async def put(self, key: str, response: StoredResponse):
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def claim(self, key: str, timeout: float) -> bool:
+        expires_at = self._claims.get(key)
+        if expires_at is not None and expires_at > time.monotonic():
+            return False
+        self._claims[key] = time.monotonic() + timeout
+        return True
+
+    async def release(self, key: str):
+        self._claims.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisIdempotencyStore:
+    """Shared store so a retry served by another worker still replays or waits"""
+
+    def __init__(self, url: str, ttl: int = DEFAULT_TTL):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"tron:idempotency:{key}"
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        raw = await self.client.get(self._key(key))
+        return StoredResponse.from_json(raw) if raw else None
+
+    async def put(self, key: str, response: StoredResponse):
+        await self.client.set(self._key(key), response.to_json(), ex=self.ttl)
+
+    async def claim(self, key: str, timeout: float) -> bool:
+        # The claim expires on its own if the worker holding it dies
+        return bool(await self.client.set(f"{self._key(key)}:claim", b"1", nx=True, px=int(timeout * 1000)))
+
+    async def release(self, key: str):
+        await self.client.delete(f"{self._key(key)}:claim")
+
+    def __len__(self) -> int:
+        return 0
+
+
+class IdempotencyMetrics:
+    def __init__(self):
+        self.keyed_requests = 0
+        self.executed = 0
+        self.replayed = 0
+        self.attached = 0
+        self.stored = 0
+        self.not_stored = 0
+        self.conflicts = 0
+
+    def snapshot(self, store) -> Dict[str, Any]:
+        return {
+            "backend": "redis" if isinstance(store, RedisIdempotencyStore) else "memory",
+            "stored_entries": len(store),
+            "keyed_requests": self.keyed_requests,
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "attached_in_flight": self.attached,
+            "stored": self.stored,
+            "not_stored": self.not_stored,
+            "conflicts": self.conflicts
+        }
+
+
+def create_idempotency_store():
+    """Redis when REDIS_URL is set, otherwise the in-memory store"""
+    ttl = int(os.getenv("TRON_IDEMPOTENCY_TTL", DEFAULT_TTL))
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        try:
+            return RedisIdempotencyStore(redis_url, ttl)
+        except Exception as e:
+            logger.warning(f"Redis idempotency store unavailable: {e}")
+    return MemoryIdempotencyStore(ttl, int(os.getenv("TRON_IDEMPOTENCY_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
+
+
+# Global idempotency store and metrics
+idempotency_store = create_idempotency_store()
+idempotency_metrics = IdempotencyMetrics()
+
+
+def _is_storable(response: StoredResponse, max_body: int) -> bool:
+    """
+    Keep results a retry should see again: successes and deterministic client errors
+    Server errors, transient rejections and failed capabilities are retried for real
+    """
+    if not (200 <= response.status < 300 or (400 <= response.status < 500
+                                             and response.status not in RETRYABLE_STATUSES)):
+        return False
+    if len(response.body) > max_body:
+        return False
+    content_type = dict(response.headers).get(b"content-type", b"")
+    if content_type.startswith(b"application/json") and response.body.startswith(b"{"):
+        try:
+            return loads(response.body).get("success") is not False
+        except ValueError:
+            return False
+    return True
+
+
+class IdempotencyMiddleware:
+    """
+    Pure ASGI middleware; sits inside CORS and compression so stored bodies are
+    uncompressed and replays get headers for the retrying client
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store or idempotency_store
+        self.max_body = int(os.getenv("TRON_IDEMPOTENCY_MAX_BODY_KB", DEFAULT_MAX_BODY_KB)) * 1024
+        self.pending_timeout = float(os.getenv("TRON_IDEMPOTENCY_PENDING_TIMEOUT", DEFAULT_PENDING_TIMEOUT))
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(PATH_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        raw_key = next((value for name, value in scope["headers"] if name == b"idempotency-key"), None)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_metrics.keyed_requests += 1
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await self._send_error(send, 400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+            return
+
+        body = await self._read_body(receive)
+        tenant, _ = resolve_tenant(Request(scope))
+        key = hashlib.blake2b(tenant.encode() + b"\0" + raw_key, digest_size=16).hexdigest()
+        fingerprint = hashlib.blake2b(
+            scope["path"].encode() + b"?" + scope.get("query_string", b"") + b"\0" + body, digest_size=16
+        ).hexdigest()
+
+        while True:
+            # Same worker, still running: wait for that execution's response
+            pending = self._in_flight.get(key)
+            if pending is not None:
+                try:
+                    response = await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    if not pending.cancelled():
+                        raise
+                    # The first attempt failed or its client went away: run this one instead
+                    continue
+                idempotency_metrics.attached += 1
+                await self._replay(send, response, fingerprint)
+                return
+
+            stored = await self.store.get(key)
+            if stored is not None:
+                idempotency_metrics.replayed += 1
+                await self._replay(send, stored, fingerprint)
+                return
+
+            if await self.store.claim(key, self.pending_timeout):
+                break
+
+            # Another worker holds the claim: poll for its result or for the claim to lapse
+            stored = await self._wait_for_other_worker(key)
+            if stored is not None:
+                idempotency_metrics.attached += 1
+                await self._replay(send, stored, fingerprint)
+                return
+
+        await self._execute(scope, receive, send, body, key, fingerprint)
+
+    async def _execute(self, scope, receive, send, body: bytes, key: str, fingerprint: str):
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        idempotency_metrics.executed += 1
+
+        status = 500
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        streaming = False
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture(message):
+            nonlocal status, streaming
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers.extend(message.get("headers", []))
+                content_type = dict(headers).get(b"content-type", b"")
+                # Streams are passed through as they are produced and never stored
+                streaming = content_type.startswith(STREAMING_TYPES)
+                if streaming:
+                    await send({**message, "headers": list(headers)})
+            elif streaming:
+                await send(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, replay_receive, capture)
+            response = StoredResponse(status, headers, b"".join(chunks), fingerprint)
+            if not streaming:
+                # Outer middleware edits the header list in place; keep the stored copy untouched
+                await send({"type": "http.response.start", "status": status, "headers": list(headers)})
+                await send({"type": "http.response.body", "body": response.body})
+            if not streaming and _is_storable(response, self.max_body):
+                await self.store.put(key, response)
+                idempotency_metrics.stored += 1
+            else:
+                idempotency_metrics.not_stored += 1
+            future.set_result(response)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+            try:
+                await self.store.release(key)
+            except Exception as e:
+                logger.warning(f"Idempotency claim release failed: {str(e)}")
+
+    async def _wait_for_other_worker(self, key: str) -> Optional[StoredResponse]:
+        deadline = time.monotonic() + self.pending_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(POLL_INTERVAL)
+            stored = await self.store.get(key)
+            if stored is not None:
+                return stored
+            if await self.store.claim(key, 0.001):
+                # Claim lapsed or released without a stored result; let the caller retry the claim
+                await self.store.release(key)
+                return None
+        return None
+
+    async def _replay(self, send, response: StoredResponse, fingerprint: str):
+        if response.fingerprint != fingerprint:
+            idempotency_metrics.conflicts += 1
+            await self._send_error(send, 422, "Idempotency-Key was already used with a different request")
+            return
+        await send({
+            "type": "http.response.start",
+            "status": response.status,
+            "headers": response.headers + [(b"idempotent-replayed", b"true")]
+        })
+        await send({"type": "http.response.body", "body": response.body})
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def _send_error(send, status: int, detail: str):
+        body = dumps({"error": True, "status_code": status, "detail": detail})
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
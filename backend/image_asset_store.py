@@ -0,0 +1,196 @@
+"""
+TRON Ultimate AI Platform - Image Asset Store
+Content-addressed storage for generated images with cached format variants
+"""
+
+import io
+import base64
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+IMAGE_URL_PREFIX = "/api/ultimate-ai/images"
+
+MIME_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/webp": "webp",
+    "image/avif": "avif",
+    "image/gif": "gif"
+}
+
+# Output formats accepted by the transcoding endpoint: name -> (Pillow format, mime type)
+VARIANT_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "jpg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+    "avif": ("AVIF", "image/avif")
+}
+
+THUMBNAIL_WIDTH = 256
+
+
+class ImageAssetStore:
+    """
+    Persists generated images once, keyed by content digest
+    Transcoded and resized variants are rendered on first request and cached on disk
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root) if root else Path(tempfile.gettempdir()) / "tron_ai_images"
+        self.root.mkdir(parents=True, exist_ok=True)
+        # [lock, waiters] per variant being rendered, so unrelated renders run in parallel
+        self._variant_locks: Dict[Path, list] = {}
+        self._locks_guard = threading.Lock()
+
+    def save(self, data: bytes, mime_type: str = "image/png") -> Dict[str, Any]:
+        """
+        Store image bytes and return the metadata carried in API responses
+        """
+        image_id = hashlib.sha256(data).hexdigest()[:32]
+        extension = MIME_EXTENSIONS.get(mime_type, "bin")
+        path = self.root / f"{image_id}.{extension}"
+
+        if not path.exists():
+            temp_path = path.with_suffix(".tmp")
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            temp_path.replace(path)
+
+        width, height = self._read_dimensions(data)
+        return {
+            "id": image_id,
+            "url": f"{IMAGE_URL_PREFIX}/{image_id}",
+            "thumbnail_url": f"{IMAGE_URL_PREFIX}/{image_id}?thumbnail=true&format=webp",
+            "content_type": mime_type,
+            "size_bytes": len(data),
+            "width": width,
+            "height": height
+        }
+
+    @staticmethod
+    def _read_dimensions(data: bytes) -> Tuple[Optional[int], Optional[int]]:
+        try:
+            from PIL import Image
+
+            # Only the header is parsed here, pixel data is not decoded
+            with Image.open(io.BytesIO(data)) as image:
+                return image.width, image.height
+        except Exception:
+            return None, None
+
+    def find_original(self, image_id: str) -> Optional[Tuple[Path, str]]:
+        """Locate the original image file and its mime type"""
+        if not image_id.isalnum():
+            return None
+        for mime_type, extension in MIME_EXTENSIONS.items():
+            path = self.root / f"{image_id}.{extension}"
+            if path.exists():
+                return path, mime_type
+        return None
+
+    def get_variant(self,
+                    image_id: str,
+                    format_name: Optional[str] = None,
+                    width: Optional[int] = None) -> Optional[Tuple[Path, str]]:
+        """
+        Return the path and mime type of the requested rendition, rendering it if needed
+        Blocking; call from a worker thread
+        """
+        original = self.find_original(image_id)
+        if original is None:
+            return None
+        if not format_name and not width:
+            return original
+
+        source_path, source_mime = original
+        if format_name:
+            pillow_format, mime_type = VARIANT_FORMATS[format_name]
+        else:
+            # Keep the source format when it can be encoded; otherwise (e.g. GIF) the variant is PNG
+            pillow_format, mime_type = next(
+                ((fmt, mime) for fmt, mime in VARIANT_FORMATS.values() if mime == source_mime), VARIANT_FORMATS["png"]
+            )
+
+        extension = MIME_EXTENSIONS[mime_type]
+        variant_path = self.root / "variants" / f"{image_id}_w{width or 0}.{extension}"
+        if variant_path.exists():
+            return variant_path, mime_type
+
+        with self._locks_guard:
+            entry = self._variant_locks.setdefault(variant_path, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                if not variant_path.exists():
+                    self._render_variant(source_path, variant_path, pillow_format, width)
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._variant_locks[variant_path]
+        return variant_path, mime_type
+
+    @staticmethod
+    def _render_variant(source_path: Path, variant_path: Path, pillow_format: str, width: Optional[int]):
+        from PIL import Image
+
+        variant_path.parent.mkdir(parents=True, exist_ok=True)
+        with Image.open(source_path) as image:
+            if width and width < image.width:
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.LANCZOS)
+            if pillow_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            temp_path = variant_path.with_suffix(".tmp")
+            image.save(temp_path, format=pillow_format, quality=85)
+        temp_path.replace(variant_path)
+        logger.debug(f"Rendered image variant {variant_path.name}")
+
+
+def supports_format(format_name: str) -> bool:
+    """Check whether the installed Pillow build can encode the given format"""
+    if format_name not in VARIANT_FORMATS:
+        return False
+    if format_name != "avif":
+        return True
+    try:
+        from PIL import features
+        return bool(features.check("avif"))
+    except Exception:
+        return False
+
+
+def extract_image_blobs(response: Any) -> list:
+    """
+    Pull raw image bytes out of a generate_content response
+    Returns a list of (bytes, mime_type) tuples
+    """
+    blobs = []
+    for candidate in getattr(response, "candidates", None) or []:
+        content = getattr(candidate, "content", None)
+        for part in getattr(content, "parts", None) or []:
+            inline_data = getattr(part, "inline_data", None)
+            if inline_data is not None and getattr(inline_data, "data", None):
+                data = inline_data.data
+                if isinstance(data, str):
+                    data = base64.b64decode(data)
+                blobs.append((data, getattr(inline_data, "mime_type", None) or "image/png"))
+
+    if not blobs:
+        for image in getattr(response, "images", None) or []:
+            if isinstance(image, (bytes, bytearray)):
+                blobs.append((bytes(image), "image/png"))
+            elif isinstance(image, str):
+                blobs.append((base64.b64decode(image), "image/png"))
+    return blobs
+
+
+# Global image store instance
+image_store = ImageAssetStore()
@@ -0,0 +1,287 @@
+"""
+TRON Ultimate AI Platform - Image Post-Processing Pipeline
+CPU-bound image operations executed in a process pool, off the event loop
+"""
+
+import io
+import os
+import time
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Largest width/height a job may request or produce; bounds worker memory per job
+MAX_DIMENSION = int(os.getenv("TRON_IMAGE_MAX_DIMENSION", 4096))
+
+# Output formats: name -> (Pillow format, mime type)
+OUTPUT_FORMATS = {
+    "png": ("PNG", "image/png"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "jpg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+    "avif": ("AVIF", "image/avif")
+}
+
+
+# Accepted parameters per stage: name -> (minimum, maximum); every parameter is an integer except format
+STAGE_PARAMS = {
+    "resize": {"width": (1, MAX_DIMENSION), "height": (1, MAX_DIMENSION)},
+    "thumbnail": {"size": (1, MAX_DIMENSION)},
+    "convert": {"format": None, "quality": (1, 100)},
+    "strip_exif": {},
+    "perceptual_hash": {"hash_size": (2, 32)}
+}
+
+
+class PipelineOverloadedError(RuntimeError):
+    """Raised when the pipeline queue is full and new work is rejected"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# =============================================================================
+# WORKER-SIDE STAGES
+# =============================================================================
+# Every stage receives the decoded image and a shared state dict. The image is
+# decoded once and encoded once per job; stages operate on the same object.
+
+def _stage_resize(image, state: Dict[str, Any], width: Optional[int] = None, height: Optional[int] = None):
+    from PIL import Image
+
+    if not width and not height:
+        return image
+    if not height:
+        height = max(1, round(image.height * width / image.width))
+    elif not width:
+        width = max(1, round(image.width * height / image.height))
+    if width > MAX_DIMENSION or height > MAX_DIMENSION:
+        raise ValueError(f"Resized image would exceed {MAX_DIMENSION}px")
+    return image.resize((int(width), int(height)), Image.LANCZOS)
+
+
+def _stage_thumbnail(image, state: Dict[str, Any], size: int = 256):
+    image.thumbnail((int(size), int(size)))
+    return image
+
+
+def _stage_convert(image, state: Dict[str, Any], format: str = "png", quality: int = 85):
+    state["output_format"] = format.lower()
+    state["quality"] = int(quality)
+    return image
+
+
+def _stage_strip_exif(image, state: Dict[str, Any]):
+    state["strip_metadata"] = True
+    image.info.pop("exif", None)
+    image.info.pop("icc_profile", None)
+    return image
+
+
+def _stage_perceptual_hash(image, state: Dict[str, Any], hash_size: int = 8):
+    from PIL import Image
+
+    # Difference hash: compare adjacent pixels of a tiny grayscale rendition
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    state["metadata"]["perceptual_hash"] = f"{bits:0{hash_size * hash_size // 4}x}"
+    return image
+
+
+STAGES = {
+    "resize": _stage_resize,
+    "thumbnail": _stage_thumbnail,
+    "convert": _stage_convert,
+    "strip_exif": _stage_strip_exif,
+    "perceptual_hash": _stage_perceptual_hash
+}
+
+
+def _run_pipeline(data: bytes, operations: List[Dict[str, Any]]) -> Tuple[bytes, str, Dict[str, Any], Dict[str, float]]:
+    """
+    Worker entry point: decode, apply all stages to one image object, encode once
+    """
+    from PIL import Image
+
+    timings: Dict[str, float] = {}
+    state: Dict[str, Any] = {"output_format": None, "quality": 85, "strip_metadata": False, "metadata": {}}
+
+    started = time.perf_counter()
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    source_format = (image.format or "PNG").lower()
+    timings["decode"] = time.perf_counter() - started
+
+    for index, operation in enumerate(operations):
+        params = {key: value for key, value in operation.items() if key != "op"}
+        started = time.perf_counter()
+        image = STAGES[operation["op"]](image, state, **params)
+        timings[f"{index}:{operation['op']}"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    output_name = state["output_format"] or source_format
+    pillow_format, mime_type = OUTPUT_FORMATS.get(output_name, OUTPUT_FORMATS["png"])
+    if pillow_format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+
+    save_kwargs: Dict[str, Any] = {"format": pillow_format}
+    if pillow_format in ("JPEG", "WEBP", "AVIF"):
+        save_kwargs["quality"] = state["quality"]
+    if not state["strip_metadata"] and "exif" in image.info:
+        save_kwargs["exif"] = image.info["exif"]
+
+    output = io.BytesIO()
+    image.save(output, **save_kwargs)
+    timings["encode"] = time.perf_counter() - started
+
+    state["metadata"].update({"width": image.width, "height": image.height})
+    # A memoryview cannot be pickled back to the parent, so the result is one bytes copy
+    return output.getvalue(), mime_type, state["metadata"], timings
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+class ImagePostProcessor:
+    """
+    Runs declared post-processing operations in a process pool
+    Queue depth is bounded; excess work is rejected instead of piling up
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue_depth: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("TRON_IMAGE_WORKERS", min(4, os.cpu_count() or 1)))
+        self.max_queue_depth = max_queue_depth or int(os.getenv("TRON_IMAGE_QUEUE_DEPTH", 32))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self.metrics = {
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "jobs_rejected": 0,
+            "queue_wait_seconds": 0.0,
+            "job_seconds": 0.0,
+            "stages": {}
+        }
+
+    @staticmethod
+    def validate(operations: Any) -> List[Dict[str, Any]]:
+        """
+        Check a post_processing declaration before the model is called
+        Operation names, parameter names, types and limits are all checked here so
+        a bad declaration fails fast instead of inside a worker after generation
+        """
+        from image_asset_store import supports_format
+
+        if not isinstance(operations, list):
+            raise ValueError("post_processing must be a list of operations")
+        for operation in operations:
+            if not isinstance(operation, dict) or not isinstance(operation.get("op"), str) \
+                    or operation["op"] not in STAGES:
+                raise ValueError(f"Unknown post-processing operation: {operation}")
+            allowed = STAGE_PARAMS[operation["op"]]
+            for name, value in operation.items():
+                if name == "op":
+                    continue
+                if name not in allowed:
+                    raise ValueError(f"Unknown parameter '{name}' for {operation['op']}")
+                if name == "format":
+                    if str(value).lower() not in OUTPUT_FORMATS or not supports_format(str(value).lower()):
+                        raise ValueError(f"Unsupported output format: {value}")
+                    continue
+                minimum, maximum = allowed[name]
+                if value is None and operation["op"] == "resize":
+                    continue
+                if not isinstance(value, int) or isinstance(value, bool) or not minimum <= value <= maximum:
+                    raise ValueError(f"{operation['op']}.{name} must be an integer between {minimum} and {maximum}")
+        return operations
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._executor
+
+    async def process(self, data: bytes, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Apply operations to one image and return the encoded result with timings
+        """
+        if self._pending >= self.max_queue_depth:
+            self.metrics["jobs_rejected"] += 1
+            # Time for the queued jobs to drain at the average job duration
+            average_job = self.metrics["job_seconds"] / max(self.metrics["jobs_completed"], 1)
+            retry_after = max(1, round(average_job * self._pending / self.max_workers))
+            raise PipelineOverloadedError("Image post-processing queue is full", retry_after)
+
+        executor = self._get_executor()
+        self._pending += 1
+        queued_at = time.perf_counter()
+        try:
+            async with self._slots:
+                self.metrics["queue_wait_seconds"] += time.perf_counter() - queued_at
+                loop = asyncio.get_running_loop()
+                output, mime_type, metadata, timings = await loop.run_in_executor(
+                    executor, _run_pipeline, data, operations
+                )
+        except Exception:
+            self.metrics["jobs_failed"] += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self.metrics["jobs_completed"] += 1
+        self.metrics["job_seconds"] += sum(timings.values())
+        for stage, seconds in timings.items():
+            name = stage.split(":", 1)[-1]
+            stage_metrics = self.metrics["stages"].setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stage_metrics["count"] += 1
+            stage_metrics["total_seconds"] += seconds
+            stage_metrics["max_seconds"] = max(stage_metrics["max_seconds"], seconds)
+
+        return {
+            "data": output,
+            "mime_type": mime_type,
+            "metadata": metadata,
+            "stage_timings": {stage: round(seconds, 6) for stage, seconds in timings.items()}
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pipeline metrics for the analytics endpoints"""
+        completed = max(self.metrics["jobs_completed"], 1)
+        return {
+            "workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_depth": self._pending,
+            "jobs_completed": self.metrics["jobs_completed"],
+            "jobs_failed": self.metrics["jobs_failed"],
+            "jobs_rejected": self.metrics["jobs_rejected"],
+            "average_queue_wait": round(self.metrics["queue_wait_seconds"] / completed, 6),
+            "stages": {
+                name: {
+                    "count": stats["count"],
+                    "average_seconds": round(stats["total_seconds"] / stats["count"], 6),
+                    "max_seconds": round(stats["max_seconds"], 6)
+                }
+                for name, stats in self.metrics["stages"].items()
+            }
+        }
+
+    def shutdown(self):
+        """Stop worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+
+# Global pipeline instance
+image_postprocessor = ImagePostProcessor()
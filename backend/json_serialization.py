@@ -0,0 +1,56 @@
+"""
+TRON Ultimate AI Platform - JSON Serialization
+orjson-backed encoding shared by API responses, logging payloads and blobs
+"""
+
+from typing import Any, Optional, Dict
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """
+    Fallback for the few non-native types results carry (sets, bytes, pydantic models)
+    Anything else is a bug in the producer and fails loudly rather than leaking its repr
+    """
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes"""
+    return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str"""
+    return orjson.loads(data)
+
+
+class TRONJSONResponse(JSONResponse):
+    """
+    Default response class: renders with orjson instead of the stdlib encoder
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> TRONJSONResponse:
+    """
+    Wrap an engine result in a ready response
+    Returning a Response from a route skips FastAPI's generic jsonable_encoder pass,
+    which is the dominant serialization cost for large research and workflow results
+    """
+    return TRONJSONResponse(content=content, status_code=status_code, headers=headers)
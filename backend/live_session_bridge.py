@@ -0,0 +1,327 @@
+"""
+TRON Ultimate AI Platform - Live Session Bridge
+Bidirectional streaming between a client WebSocket and a Gemini live session
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Optional, Dict, Any, Deque
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from json_serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Client audio is 16-bit mono PCM; model audio is returned at 24 kHz
+INPUT_SAMPLE_RATE = 16000
+OUTPUT_SAMPLE_RATE = 24000
+BYTES_PER_SAMPLE = 2
+
+DEFAULT_FRAME_MS = 20
+DEFAULT_MAX_BUFFER_DELAY_MS = 60
+DEFAULT_QUEUE_FRAMES = 64
+
+CONTROL_TYPES = ("text", "audio_end", "ping")
+
+
+class AudioJitterBuffer:
+    """
+    Re-chunks irregular audio bursts into fixed-duration frames
+    A partial frame is released once it has waited longer than max_delay,
+    so buffering never adds more than max_delay of latency
+    """
+
+    def __init__(self, sample_rate: int, frame_ms: int = DEFAULT_FRAME_MS,
+                 max_delay_ms: int = DEFAULT_MAX_BUFFER_DELAY_MS):
+        self.frame_bytes = sample_rate * BYTES_PER_SAMPLE * frame_ms // 1000
+        self.max_delay = max_delay_ms / 1000
+        self._buffer = bytearray()
+        self._oldest: Optional[float] = None
+
+    def push(self, data: bytes) -> list:
+        """Add audio and return any complete frames"""
+        if not self._buffer:
+            self._oldest = time.perf_counter()
+        self._buffer.extend(data)
+
+        frames = []
+        while len(self._buffer) >= self.frame_bytes:
+            frames.append(bytes(self._buffer[:self.frame_bytes]))
+            del self._buffer[:self.frame_bytes]
+        if frames:
+            self._oldest = time.perf_counter() if self._buffer else None
+        return frames
+
+    @property
+    def waiting_since(self) -> Optional[float]:
+        """When the oldest buffered byte arrived, or None when empty"""
+        return self._oldest
+
+    def due(self) -> bool:
+        """True when buffered audio has waited past the delay bound"""
+        return bool(self._buffer) and time.perf_counter() - self._oldest >= self.max_delay
+
+    def flush(self) -> Optional[bytes]:
+        """Release whatever is buffered, even if shorter than a frame"""
+        if not self._buffer:
+            return None
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        self._oldest = None
+        return data
+
+
+class LatencyRecorder:
+    """Bounded latency sample window with percentile summaries"""
+
+    def __init__(self, window: int = 2048):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.samples:
+            return {"count": self.count, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {
+            "count": self.count,
+            "p50_ms": round(ordered[int(last * 0.50)] * 1000, 2),
+            "p95_ms": round(ordered[int(last * 0.95)] * 1000, 2),
+            "p99_ms": round(ordered[int(last * 0.99)] * 1000, 2),
+            "max_ms": round(ordered[last] * 1000, 2)
+        }
+
+
+class LiveStreamMetrics:
+    """Process-wide live streaming metrics shared by all sessions"""
+
+    def __init__(self):
+        self.active_sessions = 0
+        self.total_sessions = 0
+        self.frames_in = 0
+        self.frames_out = 0
+        self.dropped_frames = 0
+        # Client frame received -> forwarded to the model
+        self.uplink_latency = LatencyRecorder()
+        # Model frame received -> written to the client socket
+        self.downlink_latency = LatencyRecorder()
+        # End of client input -> first model output frame
+        self.response_latency = LatencyRecorder()
+        # Whole WebSocket sessions, kept apart from per-request response times
+        self.session_duration = LatencyRecorder()
+        self.invalid_frames = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active_sessions": self.active_sessions,
+            "total_sessions": self.total_sessions,
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "dropped_frames": self.dropped_frames,
+            "invalid_frames": self.invalid_frames,
+            "uplink_latency": self.uplink_latency.summary(),
+            "downlink_latency": self.downlink_latency.summary(),
+            "response_latency": self.response_latency.summary(),
+            "session_duration": self.session_duration.summary()
+        }
+
+
+live_metrics = LiveStreamMetrics()
+
+
+class LiveSessionBridge:
+    """
+    Pumps frames between a client WebSocket and an open model live session
+
+    Client -> server: binary frames carry PCM16 audio, text frames carry JSON
+    control messages ({"type": "text" | "audio_end" | "ping"}).
+    Server -> client: binary frames carry model PCM16 audio, text frames carry
+    JSON events ({"type": "text" | "turn_complete" | "pong" | "error"}).
+
+    Both directions use bounded queues. Inbound audio drops the oldest frame when
+    the model falls behind (fresh audio matters more than complete audio); control
+    messages and outbound frames wait, which pushes back on the sender.
+    """
+
+    def __init__(self, websocket: WebSocket, interaction_type: str = "audio",
+                 queue_frames: Optional[int] = None):
+        self.websocket = websocket
+        self.interaction_type = interaction_type
+        queue_size = queue_frames or int(os.getenv("TRON_LIVE_QUEUE_FRAMES", DEFAULT_QUEUE_FRAMES))
+        self.inbound: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.outbound: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.uplink_buffer = AudioJitterBuffer(INPUT_SAMPLE_RATE)
+        self.downlink_buffer = AudioJitterBuffer(OUTPUT_SAMPLE_RATE)
+        self._input_ended_at: Optional[float] = None
+        self._awaiting_first_output = False
+        self._closing = False
+
+    async def run(self, session):
+        """Run all four pumps until either side closes"""
+        live_metrics.active_sessions += 1
+        live_metrics.total_sessions += 1
+        tasks = [
+            asyncio.create_task(self._read_client()),
+            asyncio.create_task(self._send_upstream(session)),
+            asyncio.create_task(self._receive_upstream(session)),
+            asyncio.create_task(self._write_client())
+        ]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            # wait_for can turn a cancel that lands with its timeout into TimeoutError,
+            # so the timed pumps also check this flag before waiting again
+            self._closing = True
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in done:
+                error = task.exception()
+                if error and not isinstance(error, WebSocketDisconnect):
+                    raise error
+        finally:
+            live_metrics.active_sessions -= 1
+
+    # -------------------------------------------------------------------------
+    # Client -> model
+    # -------------------------------------------------------------------------
+
+    async def _read_client(self):
+        while True:
+            message = await self.websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            received_at = time.perf_counter()
+            live_metrics.frames_in += 1
+            if message.get("bytes") is not None:
+                await self._enqueue_audio(("audio", message["bytes"], received_at))
+            elif message.get("text") is not None:
+                payload = self._parse_control(message["text"])
+                if payload is None:
+                    # A bad frame is reported back; the session stays open
+                    live_metrics.invalid_frames += 1
+                    await self.outbound.put(("event", {
+                        "type": "error",
+                        "detail": f"Control frames must be JSON objects with type one of {', '.join(CONTROL_TYPES)}"
+                    }, received_at))
+                elif payload.get("type") == "ping":
+                    await self.outbound.put(("event", {"type": "pong", "t": payload.get("t")}, received_at))
+                else:
+                    await self.inbound.put((payload.get("type", "text"), payload, received_at))
+
+    @staticmethod
+    def _parse_control(text: str) -> Optional[Dict[str, Any]]:
+        try:
+            payload = loads(text)
+        except ValueError:
+            return None
+        if not isinstance(payload, dict) or payload.get("type", "text") not in CONTROL_TYPES:
+            return None
+        if not isinstance(payload.get("text", ""), str):
+            return None
+        return payload
+
+    async def _enqueue_audio(self, item):
+        if self.inbound.full():
+            try:
+                self.inbound.get_nowait()
+                live_metrics.dropped_frames += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.inbound.put_nowait(item)
+
+    async def _send_upstream(self, session):
+        mime_type = f"audio/pcm;rate={INPUT_SAMPLE_RATE}"
+        while not self._closing:
+            try:
+                kind, payload, received_at = await asyncio.wait_for(
+                    self.inbound.get(), timeout=self.uplink_buffer.max_delay
+                )
+            except asyncio.TimeoutError:
+                # No new audio: release a partial frame rather than holding it
+                if self.uplink_buffer.due():
+                    await session.send_realtime_input(
+                        audio={"data": self.uplink_buffer.flush(), "mime_type": mime_type}
+                    )
+                continue
+
+            if kind == "audio":
+                for frame in self.uplink_buffer.push(payload):
+                    await session.send_realtime_input(audio={"data": frame, "mime_type": mime_type})
+                live_metrics.uplink_latency.record(time.perf_counter() - received_at)
+            elif kind == "audio_end":
+                remainder = self.uplink_buffer.flush()
+                if remainder:
+                    await session.send_realtime_input(audio={"data": remainder, "mime_type": mime_type})
+                await session.send_realtime_input(audio_stream_end=True)
+                self._mark_input_end()
+            elif kind == "text":
+                await session.send_client_content(
+                    turns={"role": "user", "parts": [{"text": payload.get("text", "")}]},
+                    turn_complete=True
+                )
+                live_metrics.uplink_latency.record(time.perf_counter() - received_at)
+                self._mark_input_end()
+
+    def _mark_input_end(self):
+        self._input_ended_at = time.perf_counter()
+        self._awaiting_first_output = True
+
+    # -------------------------------------------------------------------------
+    # Model -> client
+    # -------------------------------------------------------------------------
+
+    async def _receive_upstream(self, session):
+        while True:
+            # receive() yields the messages of a single turn, then returns
+            async for message in session.receive():
+                received_at = time.perf_counter()
+                if self._awaiting_first_output:
+                    live_metrics.response_latency.record(received_at - self._input_ended_at)
+                    self._awaiting_first_output = False
+
+                data = getattr(message, "data", None)
+                if data:
+                    for frame in self.downlink_buffer.push(data):
+                        await self.outbound.put(("audio", frame, received_at))
+
+                text = getattr(message, "text", None)
+                if text:
+                    await self.outbound.put(("event", {"type": "text", "text": text}, received_at))
+
+                server_content = getattr(message, "server_content", None)
+                if server_content is not None and getattr(server_content, "turn_complete", False):
+                    remainder = self.downlink_buffer.flush()
+                    if remainder:
+                        await self.outbound.put(("audio", remainder, received_at))
+                    await self.outbound.put(("event", {"type": "turn_complete"}, received_at))
+                elif self.downlink_buffer.due():
+                    waited_since = self.downlink_buffer.waiting_since
+                    await self.outbound.put(("audio", self.downlink_buffer.flush(), waited_since))
+
+    async def _write_client(self):
+        while not self._closing:
+            try:
+                kind, payload, received_at = await asyncio.wait_for(
+                    self.outbound.get(), timeout=self.downlink_buffer.max_delay
+                )
+            except asyncio.TimeoutError:
+                # The model paused mid-frame: release the partial frame within the delay bound
+                if not self.downlink_buffer.due():
+                    continue
+                received_at = self.downlink_buffer.waiting_since
+                kind, payload = "audio", self.downlink_buffer.flush()
+            if kind == "audio":
+                await self.websocket.send_bytes(payload)
+            else:
+                await self.websocket.send_text(dumps(payload).decode("utf-8"))
+            live_metrics.frames_out += 1
+            live_metrics.downlink_latency.record(time.perf_counter() - received_at)
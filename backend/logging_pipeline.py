@@ -0,0 +1,231 @@
+"""
+TRON Ultimate AI Platform - Logging Pipeline
+Queue-based structured JSON logging; handlers run on a listener thread, off the event loop
+"""
+
+import os
+import sys
+import copy
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, Dict, Any
+
+import structlog
+
+from json_serialization import dumps
+from request_tracing import current_request_id
+
+DEFAULT_LOG_FILE = "tron_ai_backend.log"
+DEFAULT_MAX_MB = 10
+DEFAULT_BACKUPS = 5
+DEFAULT_QUEUE_SIZE = 10000
+
+_traceback_formatter = logging.Formatter()
+
+
+class LogSampler(logging.Filter):
+    """
+    Keeps one in N records at INFO and below for configured loggers
+    Warnings and errors are never sampled out
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.intervals = {name: max(1, round(1 / rate)) for name, rate in rates.items() if rate > 0}
+        self.dropped_loggers = {name for name, rate in rates.items() if rate <= 0}
+        self.counters: Dict[str, int] = {}
+        self.sampled_out = 0
+
+    def _rule_for(self, name: str) -> Optional[str]:
+        # The most specific configured logger prefix wins
+        while name:
+            if name in self.intervals or name in self.dropped_loggers:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rule = self._rule_for(record.name)
+        if rule is None:
+            return True
+        if rule in self.dropped_loggers:
+            self.sampled_out += 1
+            return False
+        count = self.counters.get(rule, 0)
+        self.counters[rule] = count + 1
+        if count % self.intervals[rule] == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Enqueues records for the listener thread
+    When the queue is full (disk stalled), records of any level are shed at once and
+    counted per level, so logging from the event loop never blocks it
+    """
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped: Dict[str, int] = {}
+        self.max_depth = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args, attach the request ID and render tracebacks before the record
+        # crosses to the listener thread; the traceback becomes its own "exception" field
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        request_id = current_request_id()
+        if request_id is not None and not hasattr(record, "request_id"):
+            record.request_id = request_id
+        if record.exc_info:
+            record.exception = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+            record.exc_text = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+            return
+        self.enqueued += 1
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """Parse TRON_LOG_SAMPLING, e.g. "api_router=0.1,ultimate_gemini_engine=0.5" """
+    rates = {}
+    for item in spec.split(","):
+        name, _, rate = item.strip().partition("=")
+        if name and rate:
+            try:
+                rates[name.strip()] = min(1.0, float(rate))
+            except ValueError:
+                continue
+    return rates
+
+
+def _render_json(_, __, event_dict: Dict[str, Any]) -> str:
+    return dumps(event_dict).decode("utf-8")
+
+
+def build_formatter() -> structlog.stdlib.ProcessorFormatter:
+    """JSON formatter for stdlib records; extra= fields become top-level keys"""
+    return structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.stdlib.add_log_level,
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.ExtraAdder(),
+            structlog.processors.TimeStamper(fmt="iso", utc=True)
+        ],
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            _render_json
+        ]
+    )
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+class LoggingPipeline:
+    """
+    Owns the root logger configuration: one bounded queue handler on the calling
+    side and a listener thread writing to stdout and a size-rotated file
+    """
+
+    def __init__(self):
+        self.handler: Optional[BoundedQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+        self.sampler: Optional[LogSampler] = None
+        self._lock = threading.Lock()
+
+    def configure(self, level: Optional[str] = None, log_file: Optional[str] = None):
+        """Install the pipeline on the root logger; calling again is a no-op"""
+        with self._lock:
+            if self.listener is not None:
+                return
+
+            formatter = build_formatter()
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(formatter)
+            file_handler = RotatingFileHandler(
+                log_file or os.getenv("TRON_LOG_FILE", DEFAULT_LOG_FILE),
+                maxBytes=int(os.getenv("TRON_LOG_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024,
+                backupCount=int(os.getenv("TRON_LOG_BACKUPS", DEFAULT_BACKUPS)),
+                encoding="utf-8",
+                delay=True
+            )
+            file_handler.setFormatter(formatter)
+
+            log_queue = queue.Queue(maxsize=int(os.getenv("TRON_LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)))
+            self.handler = BoundedQueueHandler(log_queue)
+            self.sampler = LogSampler(parse_sampling(os.getenv("TRON_LOG_SAMPLING", "")))
+            self.handler.addFilter(self.sampler)
+
+            root = logging.getLogger()
+            for existing in list(root.handlers):
+                root.removeHandler(existing)
+            root.addHandler(self.handler)
+            root.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+
+            self.listener = QueueListener(log_queue, stream_handler, file_handler, respect_handler_level=True)
+            self.listener.start()
+            atexit.register(self.shutdown)
+
+    def _reset_after_fork(self):
+        # The listener thread does not exist in a forked worker, so log straight to stderr there
+        if self.handler is None:
+            return
+        root = logging.getLogger()
+        root.removeHandler(self.handler)
+        stderr_handler = logging.StreamHandler(sys.stderr)
+        stderr_handler.setFormatter(build_formatter())
+        root.addHandler(stderr_handler)
+        self.handler = None
+        self.listener = None
+        self._lock = threading.Lock()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        if self.handler is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "enqueued": self.handler.enqueued,
+            "dropped": dict(self.handler.dropped),
+            "sampled_out": self.sampler.sampled_out if self.sampler else 0,
+            "queue_depth": self.handler.queue.qsize(),
+            "max_queue_depth": self.handler.max_depth,
+            "queue_capacity": self.handler.queue.maxsize
+        }
+
+    def shutdown(self):
+        """Flush queued records and stop the listener thread"""
+        with self._lock:
+            if self.listener is not None:
+                self.listener.stop()
+                self.listener = None
+
+
+# Global logging pipeline instance
+logging_pipeline = LoggingPipeline()
+os.register_at_fork(after_in_child=logging_pipeline._reset_after_fork)
+
+
+def configure_logging(level: Optional[str] = None, log_file: Optional[str] = None):
+    """Configure application logging once per process"""
+    logging_pipeline.configure(level=level, log_file=log_file)
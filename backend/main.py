@@ -4,30 +4,30 @@ Pure class FastAPI application
 No emojis, professional architecture, high-class design
 """
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-import uvicorn
 import os
 import logging
 from datetime import datetime
-import sys
 
 # Import API routers
-from api_router import router as ultimate_ai_router
+from api_router import router as ultimate_ai_router, get_tron_engine
 from supabase_database_manager import initialize_database
+from image_pipeline import image_postprocessor
+from code_execution_pool import code_executor
+from dataset_analyzer import dataset_analyzer
+from file_renderers import file_renderer
+from json_serialization import TRONJSONResponse
+from response_compression import CompressionMiddleware
+from logging_pipeline import configure_logging
+from request_tracing import TracingMiddleware
+from event_loop_monitor import loop_monitor
+from idempotency_store import IdempotencyMiddleware
+from health_prober import health_prober
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('tron_ai_backend.log')
-    ]
-)
+# Configure logging: JSON records go through a bounded queue to a listener
+# thread that writes stdout and a size-rotated file
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -44,30 +44,35 @@ def create_app() -> FastAPI:
         version="2.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
-        openapi_url="/openapi.json"
+        openapi_url="/openapi.json",
+        default_response_class=TRONJSONResponse
     )
     
     # Add middleware
+    # Innermost: replays stored results for a repeated Idempotency-Key before the engine is reached
+    app.add_middleware(IdempotencyMiddleware)
+    
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         allow_headers=["*"],
+        expose_headers=["X-Request-ID", "X-Correlation-ID", "Server-Timing", "Idempotent-Replayed"],
     )
     
-    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    # Negotiates zstd/brotli/gzip and skips images and binary downloads
+    app.add_middleware(CompressionMiddleware)
+    
+    # Outermost: assigns the request ID and reports the span breakdown in Server-Timing
+    app.add_middleware(TracingMiddleware)
     
     # =============================================================================
     # ROUTER REGISTRATION
     # =============================================================================
     
-    # Register Ultimate AI router
-    app.include_router(
-        ultimate_ai_router,
-        prefix="/api/ultimate-ai",
-        tags=["ultimate-ai"]
-    )
+    # Register Ultimate AI router (the router carries its own /api/ultimate-ai prefix)
+    app.include_router(ultimate_ai_router)
     
     # =============================================================================
     # ROOT AND STATUS ENDPOINTS
@@ -111,7 +116,9 @@ def create_app() -> FastAPI:
                 "api_endpoints": {
                     "ultimate_ai": "/api/ultimate-ai",
                     "docs": "/docs",
-                    "health": "/health"
+                    "health": "/health",
+                    "liveness": "/health/live",
+                    "readiness": "/health/ready"
                 }
             }
             
@@ -125,6 +132,18 @@ def create_app() -> FastAPI:
             logger.error(f"Health check failed: {str(e)}")
             raise HTTPException(status_code=503, detail=f"Health check failed: {str(e)}")
     
+    @app.get("/health/live")
+    async def liveness_probe():
+        """Liveness probe; answers from process state only, never calls upstream services"""
+        status_code, body = health_prober.liveness()
+        return TRONJSONResponse(body, status_code=status_code)
+    
+    @app.get("/health/ready")
+    async def readiness_probe():
+        """Readiness probe; serves the last background probe result as cached JSON"""
+        status_code, body = health_prober.readiness()
+        return Response(content=body, status_code=status_code, media_type="application/json")
+    
     @app.get("/api/status")
     async def api_status():
         """API status and capabilities overview"""
@@ -134,24 +153,35 @@ def create_app() -> FastAPI:
                 "ultimate_ai": {
                     "base_url": "/api/ultimate-ai",
                     "endpoints": [
+                        "POST /chat",
                         "POST /generate-image",
                         "POST /research-web", 
                         "POST /execute-code",
+                        "POST /execute-code/stream",
                         "POST /control-browser",
                         "POST /create-file",
+                        "POST /analyze-files",
+                        "POST /analyze-dataset",
                         "POST /live-interaction",
+                        "WS /live",
                         "POST /execute-workflow",
+                        "GET /images/{image_id}",
                         "GET /analytics",
+                        "GET /analytics/event-loop",
+                        "GET /analytics/tenants",
                         "GET /capabilities"
                     ]
                 }
             },
             "capabilities": {
+                "chat": "gemini-2.5-flash with server-side sessions",
                 "image_generation": "gemini-2.5-flash-image",
                 "web_research": "gemini-2.5-pro with Google Search",
-                "code_execution": "Python sandbox",
+                "code_execution": "Warm local Python worker pool",
                 "browser_control": "gemini-2.5-computer-use-preview",
-                "file_creation": "Multi-format support",
+                "file_creation": "PDF, DOCX, XLSX and text formats",
+                "vision_analysis": "gemini-2.5-flash over uploaded files",
+                "data_analysis": "Chunked CSV/XLSX summaries with gemini-2.5-pro-thinking",
                 "live_interactions": "Real-time voice/video",
                 "analytics": "System monitoring and performance",
                 "workflows": "Multi-task automation"
@@ -167,7 +197,7 @@ def create_app() -> FastAPI:
     async def http_exception_handler(request: Request, exc: HTTPException):
         """Custom HTTP exception handler"""
         logger.warning(f"HTTP {exc.status_code} error: {exc.detail}")
-        return JSONResponse(
+        return TRONJSONResponse(
             status_code=exc.status_code,
             content={
                 "error": True,
@@ -175,14 +205,15 @@ def create_app() -> FastAPI:
                 "detail": exc.detail,
                 "timestamp": datetime.now().isoformat(),
                 "path": str(request.url.path)
-            }
+            },
+            headers=getattr(exc, "headers", None)
         )
     
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         """General exception handler for unhandled errors"""
         logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-        return JSONResponse(
+        return TRONJSONResponse(
             status_code=500,
             content={
                 "error": True,
@@ -217,10 +248,23 @@ def create_app() -> FastAPI:
             logger.warning(f"Database initialization failed: {e}")
             logger.info("Continuing without database integration")
         
+        # Measure event-loop lag and capture stacks of blocking callbacks
+        await loop_monitor.start()
+        
+        # Warm the code execution workers before the first request arrives
+        try:
+            await code_executor.start()
+        except Exception as e:
+            logger.warning(f"Code execution pool failed to start: {e}")
+        
+        # Probe upstream dependencies in the background; readiness serves the cached outcome
+        await health_prober.start(lambda: get_tron_engine().client)
+        
         logger.info("TRON Ultimate AI Platform startup complete")
         logger.info("Available endpoints:")
         logger.info("  - / (Platform information)")
         logger.info("  - /health (Health check)")
+        logger.info("  - /health/live, /health/ready (Liveness and readiness probes)")
         logger.info("  - /api/status (API status)")
         logger.info("  - /api/ultimate-ai/* (Ultimate AI capabilities)")
         logger.info("  - /docs (API documentation)")
@@ -229,6 +273,12 @@ def create_app() -> FastAPI:
     async def shutdown_event():
         """Application shutdown event"""
         logger.info("TRON Ultimate AI Platform shutting down...")
+        health_prober.shutdown()
+        loop_monitor.shutdown()
+        image_postprocessor.shutdown()
+        await code_executor.shutdown()
+        dataset_analyzer.shutdown()
+        file_renderer.shutdown()
         logger.info("Cleanup complete")
     
     return app
@@ -244,6 +294,8 @@ app = create_app()
 # =============================================================================
 
 if __name__ == "__main__":
+    import uvicorn
+    
     # Configuration
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 8000))
@@ -0,0 +1,221 @@
+"""
+TRON Ultimate AI Platform - Payload Blob Store
+Content-addressed storage for large response payloads kept out of ai_requests rows
+"""
+
+import os
+import zlib
+import hashlib
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from importlib.util import find_spec
+from typing import Optional, Dict, Any
+
+from json_serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# Marker key used in ai_requests.response_data when the payload lives in the blob store
+BLOB_REFERENCE_KEY = "$blob"
+
+DEFAULT_OFFLOAD_THRESHOLD = 32 * 1024
+DEFAULT_COMPRESSION_LEVEL = 3
+
+
+class PayloadBlobStore(ABC):
+    """
+    Minimal key/value blob store interface
+    Keys are content digests, so writes are idempotent
+    """
+
+    name = "abstract"
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+
+class LocalPayloadBlobStore(PayloadBlobStore):
+    """
+    Filesystem blob store used for development and as the default stand-in
+    """
+
+    name = "local"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root) if root else Path(tempfile.gettempdir()) / "tron_ai_blobs"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Each writer gets its own temp file, so concurrent writes of the same key never
+        # interleave and readers only ever see a complete blob
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp",
+                                         delete=False) as f:
+            f.write(data)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+    def get(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+
+class SupabasePayloadBlobStore(PayloadBlobStore):
+    """
+    Supabase Storage blob store used in production
+    """
+
+    name = "supabase"
+
+    def __init__(self, client, bucket: str):
+        self.client = client
+        self.bucket = bucket
+
+    def put(self, key: str, data: bytes) -> None:
+        if self.exists(key):
+            return
+        self.client.storage.from_(self.bucket).upload(
+            key, data, {"content-type": "application/octet-stream"}
+        )
+
+    def get(self, key: str) -> bytes:
+        return self.client.storage.from_(self.bucket).download(key)
+
+    def exists(self, key: str) -> bool:
+        directory, _, filename = key.rpartition("/")
+        try:
+            entries = self.client.storage.from_(self.bucket).list(directory, {"search": filename})
+        except Exception:
+            return False
+        return any(entry.get("name") == filename for entry in entries or [])
+
+
+class PayloadOffloader:
+    """
+    Moves response payloads above a size threshold into a blob store
+    Rows keep only a reference with the content digest; payloads are fetched lazily
+    """
+
+    def __init__(self,
+                 store: PayloadBlobStore,
+                 threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+                 compression_level: int = DEFAULT_COMPRESSION_LEVEL):
+        self.store = store
+        self.threshold = threshold
+        self.compression_level = compression_level
+        self.encoding = "zstd" if find_spec("zstandard") is not None else "zlib"
+        self.stats = {
+            "inline_payloads": 0,
+            "offloaded_payloads": 0,
+            "offloaded_bytes": 0,
+            "stored_bytes": 0
+        }
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.encoding == "zstd":
+            import zstandard
+            return zstandard.ZstdCompressor(level=self.compression_level).compress(data)
+        return zlib.compress(data, self.compression_level)
+
+    @staticmethod
+    def _decompress(data: bytes, encoding: str) -> bytes:
+        if encoding == "zstd":
+            import zstandard
+            return zstandard.ZstdDecompressor().decompress(data)
+        if encoding == "zlib":
+            return zlib.decompress(data)
+        raise ValueError(f"Unsupported payload encoding: {encoding}")
+
+    def offload(self, payload: Any) -> Any:
+        """
+        Return the payload unchanged when small, otherwise store it and return a reference
+        """
+        if payload is None:
+            return None
+
+        serialized = dumps(payload)
+        if len(serialized) <= self.threshold:
+            self.stats["inline_payloads"] += 1
+            return payload
+
+        digest = hashlib.sha256(serialized).hexdigest()
+        key = f"{digest[:2]}/{digest}.{self.encoding}"
+        compressed = self._compress(serialized)
+        self.store.put(key, compressed)
+
+        self.stats["offloaded_payloads"] += 1
+        self.stats["offloaded_bytes"] += len(serialized)
+        self.stats["stored_bytes"] += len(compressed)
+
+        return {
+            BLOB_REFERENCE_KEY: {
+                "store": self.store.name,
+                "key": key,
+                "digest": f"sha256:{digest}",
+                "encoding": self.encoding,
+                "size": len(serialized),
+                "stored_size": len(compressed)
+            }
+        }
+
+    def resolve(self, value: Any) -> Any:
+        """
+        Return the original payload for a stored reference, or the value itself if inline
+        """
+        reference = get_blob_reference(value)
+        if reference is None:
+            return value
+
+        data = self._decompress(self.store.get(reference["key"]), reference["encoding"])
+        digest = hashlib.sha256(data).hexdigest()
+        if f"sha256:{digest}" != reference["digest"]:
+            raise ValueError(f"Payload digest mismatch for {reference['key']}")
+        return loads(data)
+
+
+def get_blob_reference(value: Any) -> Optional[Dict[str, Any]]:
+    """Return the blob reference stored in a response_data value, if any"""
+    if isinstance(value, dict) and len(value) == 1 and BLOB_REFERENCE_KEY in value:
+        return value[BLOB_REFERENCE_KEY]
+    return None
+
+
+def create_payload_offloader(client=None) -> PayloadOffloader:
+    """
+    Build the offloader from environment configuration
+    TRON_PAYLOAD_STORE selects "local" (default) or "supabase"
+    """
+    threshold = int(os.getenv("TRON_PAYLOAD_OFFLOAD_THRESHOLD", DEFAULT_OFFLOAD_THRESHOLD))
+    store_type = os.getenv("TRON_PAYLOAD_STORE", "local").lower()
+
+    if store_type == "supabase" and client is not None:
+        store = SupabasePayloadBlobStore(client, os.getenv("TRON_PAYLOAD_BUCKET", "ai-payloads"))
+    else:
+        if store_type == "supabase":
+            logger.warning("Supabase payload store requested without a client - using local store")
+        store = LocalPayloadBlobStore(os.getenv("TRON_PAYLOAD_DIR"))
+
+    return PayloadOffloader(store, threshold=threshold)
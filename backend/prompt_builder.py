@@ -0,0 +1,260 @@
+"""
+TRON Ultimate AI Platform - Prompt Builder
+Prompt construction for each engine capability, kept free of I/O so it can be benchmarked
+
+Structured inputs are serialized as compact JSON. Builders given a token budget
+fit user-supplied parts into it deterministically: long strings and lists inside
+structured inputs are shortened first, then text keeps its head and tail around
+an omission marker. Token counts are local estimates, cached by content digest.
+"""
+
+import re
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+# Input token budgets per capability; the engine applies TRON_PROMPT_BUDGETS overrides
+PROMPT_BUDGETS = {
+    "image_generation": 1000,
+    "web_research": 8000,
+    "code_execution": 16000,
+    "browser_control": 2000,
+    "data_analysis": 8000,
+    "live_interactions": 4000,
+    "workflows": 8000
+}
+
+TOKEN_CACHE_SIZE = 4096
+OMISSION_MARKER = "\n[... {omitted} tokens omitted ...]\n"
+
+# Shrink levels tried in order for structured inputs: (longest string, longest list)
+_SHRINK_LEVELS = ((2000, 100), (500, 50), (200, 20), (80, 10), (40, 5))
+
+# ASCII words run about four characters per token and digit runs about three;
+# other symbols and non-ASCII characters count one each, newlines one per run
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|[0-9]+|\n+|[ \t]+|\S")
+_token_cache: "OrderedDict[bytes, int]" = OrderedDict()
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token estimate; repeated texts (chat history, templates) are served from a digest-keyed LRU"""
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=12).digest()
+    cached = _token_cache.get(key)
+    if cached is not None:
+        _token_cache.move_to_end(key)
+        return cached
+    tokens = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        first = piece[0]
+        if first in " \t":
+            continue
+        if "a" <= first.lower() <= "z":
+            tokens += (len(piece) + 3) // 4
+        elif "0" <= first <= "9":
+            tokens += (len(piece) + 2) // 3
+        else:
+            tokens += 1
+    _token_cache[key] = tokens
+    if len(_token_cache) > TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return tokens
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def fit_text(text: str, max_tokens: int) -> str:
+    """Keep the head and tail of text within max_tokens, marking how much was cut from the middle"""
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    # Scale by this text's characters per token; a cut mid-word can overshoot, so rescale and cut again
+    chars = len(text)
+    fitted, used = text, total
+    while used > max_tokens and chars > 1:
+        chars = max(1, chars * max(1, max_tokens - 12) // used)
+        head = text[:chars * 2 // 3]
+        tail = text[len(text) - (chars - len(head)):] if chars > len(head) else ""
+        omitted = max(0, total - estimate_tokens(head) - estimate_tokens(tail))
+        fitted = head + OMISSION_MARKER.format(omitted=omitted) + tail
+        used = estimate_tokens(fitted)
+    return fitted
+
+
+def _shrink(value: Any, max_string: int, max_items: int) -> Any:
+    if isinstance(value, str):
+        if len(value) <= max_string:
+            return value
+        return f"{value[:max_string]}... ({len(value) - max_string} more chars)"
+    if isinstance(value, dict):
+        items = list(value.items())
+        shrunk = {str(key): _shrink(item, max_string, max_items) for key, item in items[:max_items]}
+        if len(items) > max_items:
+            shrunk["..."] = f"{len(items) - max_items} more keys"
+        return shrunk
+    if isinstance(value, (list, tuple)):
+        shrunk = [_shrink(item, max_string, max_items) for item in value[:max_items]]
+        if len(value) > max_items:
+            shrunk.append(f"... {len(value) - max_items} more items")
+        return shrunk
+    return value
+
+
+def fit_json(value: Any, max_tokens: Optional[int] = None) -> str:
+    """
+    Compact JSON for value; over budget, long strings and collections are shortened
+    level by level with notes on what was dropped, and text truncation is the last resort
+    """
+    serialized = compact_json(value)
+    if max_tokens is None or estimate_tokens(serialized) <= max_tokens:
+        return serialized
+    for max_string, max_items in _SHRINK_LEVELS:
+        serialized = compact_json(_shrink(value, max_string, max_items))
+        if estimate_tokens(serialized) <= max_tokens:
+            return serialized
+    return fit_text(serialized, max_tokens)
+
+
+def _remaining(budget: Optional[int], *used: str) -> Optional[int]:
+    return None if budget is None else max(0, budget - sum(estimate_tokens(text) for text in used))
+
+
+def _share(budget: Optional[int], numerator: int, denominator: int) -> Optional[int]:
+    return None if budget is None else budget * numerator // denominator
+
+
+def _fit(text: Optional[str], budget: Optional[int]) -> Optional[str]:
+    return text if text is None or budget is None else fit_text(text, budget)
+
+
+def build_chat_summary_prompt(summary: str, turns: List[Tuple[str, str]]) -> str:
+    transcript = "\n".join(f"{'User' if role == 'u' else 'Assistant'}: {text}" for role, text in turns)
+    return f"""Update the conversation summary with the new exchanges.
+Keep facts, decisions and open questions. Be concise.
+
+Current summary:
+{summary or "(none)"}
+
+New exchanges:
+{transcript}
+"""
+
+
+def build_image_prompt(prompt: str, budget: Optional[int] = None) -> str:
+    if budget is not None:
+        prompt = fit_text(prompt, budget)
+    return f"Create a professional, high-quality image: {prompt}"
+
+
+def build_research_prompt(query: str, context: Optional[str] = None, budget: Optional[int] = None) -> str:
+    """The query is kept whole when it fits; context gets what is left of the budget"""
+    if budget is not None:
+        query = fit_text(query, budget)
+        context = _fit(context, _remaining(budget, query))
+    search_context = f"Context: {context}\n\n" if context else ""
+    return f"{search_context}Research query: {query}\n\nProvide comprehensive, accurate information with sources."
+
+
+def build_code_prompt(code: str, language: str, context: Optional[str] = None,
+                      execution: Optional[Dict[str, Any]] = None, budget: Optional[int] = None) -> str:
+    """
+    Analysis prompt for code that ran locally, or an execute-and-analyze prompt otherwise.
+    Within a budget the code takes up to half, then output, errors and context share the rest
+    """
+    output = error_notes = ""
+    if execution is not None:
+        output = execution["stdout"] or "(no output)"
+        error_notes = execution["error"] or execution["stderr"] or "(none)"
+    # Unbudgeted prompts are the common case, so they skip the token estimates entirely
+    if budget is not None:
+        code = fit_text(code, budget // 2)
+        if execution is not None:
+            output = fit_text(output, _remaining(budget, code) * 2 // 3)
+            error_notes = fit_text(error_notes, _remaining(budget, code, output))
+        context = _fit(context, _remaining(budget, code, output, error_notes))
+    execution_context = f"Context: {context}\n\n" if context else ""
+    if execution is not None:
+        return f"""{execution_context}The following {language} code was executed:
+
+```{language}
+{code}
+```
+
+Standard output:
+{output}
+
+Errors:
+{error_notes}
+
+Please provide:
+1. Performance analysis
+2. Optimization suggestions
+3. Error handling notes (if any)
+"""
+    return f"""{execution_context}Execute the following {language} code and provide detailed analysis:
+
+```{language}
+{code}
+```
+
+Please provide:
+1. Code execution results
+2. Performance analysis
+3. Optimization suggestions
+4. Error handling notes (if any)
+"""
+
+
+def build_browser_prompt(task_description: str, url: Optional[str] = None, budget: Optional[int] = None) -> str:
+    if budget is not None:
+        task_description = fit_text(task_description, budget)
+    return f"""
+Task: {task_description}
+{'Target URL: ' + url if url else ''}
+
+Execute this web automation task using browser control capabilities.
+Provide step-by-step actions taken and results achieved.
+"""
+
+
+def build_dataset_prompt(summary: Dict[str, Any], question: Optional[str] = None,
+                         budget: Optional[int] = None) -> str:
+    question = _fit(question, _share(budget, 1, 4))
+    summary_json = fit_json(summary, _remaining(budget, question or ""))
+    return f"""Dataset summary (per-column statistics computed over all rows):
+{summary_json}
+
+{f"Question: {question}" if question else "Describe the dataset, notable distributions, data quality issues and suggested next analyses."}
+"""
+
+
+def build_live_prompt(interaction_type: str, data: Dict[str, Any], budget: Optional[int] = None) -> str:
+    return f"""
+Handle real-time {interaction_type} interaction:
+
+Data: {fit_json(data, budget)}
+
+Provide immediate response and processing for this live interaction.
+"""
+
+
+def build_workflow_prompt(workflow_description: str, tasks: List[Dict[str, Any]],
+                          budget: Optional[int] = None) -> str:
+    """The description takes up to a quarter of the budget and the task list the rest"""
+    workflow_description = _fit(workflow_description, _share(budget, 1, 4))
+    tasks_json = fit_json(tasks, _remaining(budget, workflow_description))
+    return f"""
+Execute the following multi-task workflow:
+
+Workflow: {workflow_description}
+
+Tasks to execute:
+{tasks_json}
+
+Coordinate all necessary AI capabilities to complete this workflow efficiently.
+Provide progress updates and final results.
+"""
@@ -0,0 +1,173 @@
+"""
+TRON Ultimate AI Platform - Request Deadlines
+Per-request deadlines and client-disconnect cancellation for engine calls
+
+Every engine request gets a deadline from the X-Request-Timeout-Ms header or the
+capability's default. The guard around the scheduler slot and the engine call
+cancels the work when the deadline passes (504) or when the client goes away
+(499), whether the request is still queued or already calling the model. The
+remaining time is also handed to the Gemini SDK as its HTTP timeout, so
+abandoned requests stop holding slots during overloads.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import contextvars
+from typing import Optional, Dict, Any
+
+from fastapi import HTTPException
+
+from tenant_scheduler import TenantTicket, parse_tenant_map
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = "x-request-timeout-ms"
+DEFAULT_MAX_DEADLINE = 300
+CLIENT_CLOSED_REQUEST = 499
+
+# Default deadlines in seconds per capability, override with TRON_DEADLINES="image_generation=120"
+DEFAULT_DEADLINES = {
+    "text_generation": 30.0,
+    "web_research": 60.0,
+    "image_generation": 90.0,
+    "code_execution": 60.0,
+    "browser_control": 90.0,
+    "file_creation": 30.0,
+    "file_analysis": 60.0,
+    "data_analysis": 120.0,
+    "live_interactions": 30.0,
+    "workflows": 180.0
+}
+
+_current_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("tron_deadline", default=None)
+
+
+def deadline_remaining() -> Optional[float]:
+    """Seconds left for the request being served, or None outside a guarded request"""
+    deadline = _current_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class DeadlineMetrics:
+    """Expired and cancelled requests, split by whether they were still queued or already running"""
+
+    def __init__(self):
+        self.guarded = 0
+        self.completed = 0
+        self.expired = {"queued": 0, "in_flight": 0}
+        self.cancelled = {"queued": 0, "in_flight": 0}
+        self.by_capability: Dict[str, Dict[str, int]] = {}
+        self.reclaimed_seconds = 0.0
+
+    def record(self, outcome: str, ticket: TenantTicket, remaining: float):
+        phase = "in_flight" if ticket.admitted else "queued"
+        getattr(self, outcome)[phase] += 1
+        counts = self.by_capability.setdefault(ticket.capability, {"expired": 0, "cancelled": 0})
+        counts[outcome] += 1
+        if outcome == "cancelled":
+            # Deadline time the abandoned request would otherwise have been allowed to hold
+            self.reclaimed_seconds += max(0.0, remaining)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "guarded": self.guarded,
+            "completed": self.completed,
+            "expired_queued": self.expired["queued"],
+            "expired_in_flight": self.expired["in_flight"],
+            "cancelled_queued": self.cancelled["queued"],
+            "cancelled_in_flight": self.cancelled["in_flight"],
+            "cancelled_reclaimed_seconds": round(self.reclaimed_seconds, 1),
+            "by_capability": self.by_capability
+        }
+
+
+class DeadlinePolicy:
+    def __init__(self):
+        self.defaults = {**DEFAULT_DEADLINES, **parse_tenant_map(os.getenv("TRON_DEADLINES", ""))}
+        self.max_deadline = float(os.getenv("TRON_DEADLINE_MAX", DEFAULT_MAX_DEADLINE))
+
+    def resolve(self, capability: str, header: Optional[str]) -> float:
+        """Absolute monotonic deadline; a header may shorten or extend the default up to the cap"""
+        seconds = self.defaults.get(capability, self.max_deadline)
+        if header:
+            try:
+                seconds = int(header) / 1000
+            except ValueError:
+                pass
+        return time.monotonic() + min(max(seconds, 0.001), self.max_deadline)
+
+
+# Global deadline policy and metrics
+deadline_policy = DeadlinePolicy()
+deadline_metrics = DeadlineMetrics()
+
+
+class request_guard:
+    """
+    Async context manager around the scheduler slot and engine call. Cancels the
+    enclosing task at the deadline or on client disconnect and turns that
+    cancellation into a 504 or 499; any other cancellation passes through.
+    """
+
+    def __init__(self, ticket: TenantTicket):
+        self.ticket = ticket
+        self.outcome: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._token = None
+
+    async def __aenter__(self):
+        ticket = self.ticket
+        request = ticket.request
+        if ticket.deadline is None:
+            ticket.deadline = deadline_policy.resolve(
+                ticket.capability, request.headers.get(DEADLINE_HEADER) if request is not None else None
+            )
+        deadline_metrics.guarded += 1
+        self._task = asyncio.current_task()
+        self._token = _current_deadline.set(ticket.deadline)
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(max(0.0, ticket.deadline - time.monotonic()), self._cancel, "expired")
+        if request is not None:
+            self._watcher = asyncio.create_task(self._watch_disconnect(request.receive))
+        return self
+
+    async def _watch_disconnect(self, receive):
+        # The body has been read by now, so the next message is the disconnect
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                self._cancel("cancelled")
+                return
+
+    def _cancel(self, outcome: str):
+        if self.outcome is None:
+            self.outcome = outcome
+            self._task.cancel()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._timer.cancel()
+        if self._watcher is not None:
+            self._watcher.cancel()
+        _current_deadline.reset(self._token)
+
+        if self.outcome is None or exc_type is not asyncio.CancelledError:
+            if exc_type is None:
+                deadline_metrics.completed += 1
+            return False
+
+        if sys.version_info >= (3, 11):
+            self._task.uncancel()
+        remaining = self.ticket.deadline - time.monotonic()
+        deadline_metrics.record(self.outcome, self.ticket, remaining)
+        logger.info(f"Engine request {self.outcome}", extra={
+            "capability": self.ticket.capability,
+            "phase": "in_flight" if self.ticket.admitted else "queued"
+        })
+        if self.outcome == "expired":
+            raise HTTPException(status_code=504, detail="Request deadline exceeded")
+        raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
@@ -0,0 +1,443 @@
+"""
+TRON Ultimate AI Platform - Request Tracing
+In-process spans per request, Server-Timing breakdown and OTLP-compatible export
+"""
+
+import os
+import uuid
+import time
+import queue
+import random
+import asyncio
+import logging
+import functools
+import threading
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Callable
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers, MutableHeaders
+
+from json_serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOW_MS = 1000
+MAX_SPANS_PER_TRACE = 500
+EXPORT_QUEUE_SIZE = 1000
+MAX_CORRELATION_ID_LENGTH = 128
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("tron_trace", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("tron_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_unix_ns: int
+    start_perf_ns: int
+    end_perf_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def finish(self):
+        if self.end_perf_ns is None:
+            self.end_perf_ns = time.perf_counter_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_perf_ns if self.end_perf_ns is not None else time.perf_counter_ns()
+        return (end - self.start_perf_ns) / 1_000_000
+
+    @property
+    def end_unix_ns(self) -> int:
+        end = self.end_perf_ns if self.end_perf_ns is not None else time.perf_counter_ns()
+        return self.start_unix_ns + (end - self.start_perf_ns)
+
+
+class Trace:
+    """
+    All spans recorded for one request; the request ID doubles as the trace ID
+    The ID is always generated here; a caller's own ID is carried only as correlation_id
+    """
+
+    def __init__(self, request_id: str, correlation_id: Optional[str] = None):
+        self.request_id = request_id
+        self.trace_id = uuid.UUID(request_id).hex
+        self.correlation_id = correlation_id
+        self.spans: List[Span] = []
+
+    def add_span(self, name: str, parent_id: Optional[str], attributes: Optional[Dict[str, Any]] = None,
+                 start_perf_ns: Optional[int] = None) -> Optional[Span]:
+        if len(self.spans) >= MAX_SPANS_PER_TRACE:
+            return None
+        now_perf = time.perf_counter_ns()
+        start_perf = start_perf_ns if start_perf_ns is not None else now_perf
+        span = Span(
+            name=name,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent_id,
+            start_unix_ns=time.time_ns() - (now_perf - start_perf),
+            start_perf_ns=start_perf,
+            attributes=attributes or {}
+        )
+        self.spans.append(span)
+        return span
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: finished spans summed by name, then the total"""
+        totals: Dict[str, float] = {}
+        for span in self.spans[1:]:
+            if span.end_perf_ns is not None:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        entries = [f"{name};dur={duration:.1f}" for name, duration in totals.items()]
+        entries.append(f"total;dur={self.root.duration_ms:.1f}")
+        return ", ".join(entries)
+
+
+class span:
+    """
+    Record a child span of the current span for the duration of a with block
+    Does nothing outside a traced request
+    """
+
+    __slots__ = ("name", "attributes", "_span", "_token")
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Optional[Span]:
+        trace = _current_trace.get()
+        if trace is None:
+            return None
+        parent = _current_span.get()
+        self._span = trace.add_span(self.name, parent.span_id if parent else None, self.attributes)
+        if self._span is not None:
+            self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._span is None:
+            return False
+        self._span.finish()
+        if exc is not None:
+            self._span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        return False
+
+
+def traced(name: str):
+    """Decorator form of span() for coroutine functions"""
+    def decorator(func: Callable):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_request_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else None
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(trace: Trace, service_name: str) -> Dict[str, Any]:
+    """Convert a trace to an OTLP/JSON ExportTraceServiceRequest"""
+    spans = []
+    for item in trace.spans:
+        otlp_span = {
+            "traceId": trace.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": SPAN_KIND_SERVER if item.parent_id is None else SPAN_KIND_INTERNAL,
+            "startTimeUnixNano": str(item.start_unix_ns),
+            "endTimeUnixNano": str(item.end_unix_ns),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in item.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": item.error} if item.error else {"code": STATUS_UNSET}
+        }
+        if item.parent_id:
+            otlp_span["parentSpanId"] = item.parent_id
+        spans.append(otlp_span)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "tron.request_tracing"}, "spans": spans}]
+        }]
+    }
+
+
+class OTLPFileExporter:
+    """Appends one OTLP/JSON document per line; used for local inspection and tests"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, document: Dict[str, Any]):
+        with open(self.path, "ab") as f:
+            f.write(dumps(document) + b"\n")
+
+    def close(self):
+        pass
+
+
+class OTLPHttpExporter:
+    """Posts OTLP/JSON to a collector endpoint such as http://collector:4318/v1/traces"""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        import httpx
+        self.endpoint = endpoint
+        self.client = httpx.Client(timeout=timeout)
+
+    def export(self, document: Dict[str, Any]):
+        response = self.client.post(self.endpoint, content=dumps(document),
+                                    headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+
+    def close(self):
+        self.client.close()
+
+
+def create_exporter():
+    """TRON_TRACE_EXPORT selects "file", "otlp" or nothing (default)"""
+    mode = os.getenv("TRON_TRACE_EXPORT", "").lower()
+    if mode == "file":
+        return OTLPFileExporter(os.getenv("TRON_TRACE_FILE", "tron_ai_traces.jsonl"))
+    if mode == "otlp":
+        endpoint = os.getenv("TRON_TRACE_OTLP_ENDPOINT")
+        if endpoint:
+            return OTLPHttpExporter(endpoint)
+        logger.warning("TRON_TRACE_EXPORT=otlp without TRON_TRACE_OTLP_ENDPOINT - trace export disabled")
+    return None
+
+
+# =============================================================================
+# TRACER
+# =============================================================================
+
+class Tracer:
+    """
+    Finishes request traces: aggregates span statistics and tail-samples traces
+    for export. Slow requests are always exported with their full span tree
+    """
+
+    def __init__(self):
+        self.server_timing = os.getenv("TRON_SERVER_TIMING", "true").lower() == "true"
+        self.slow_ms = float(os.getenv("TRON_TRACE_SLOW_MS", DEFAULT_SLOW_MS))
+        self.sample_rate = float(os.getenv("TRON_TRACE_SAMPLE_RATE", 0))
+        self.service_name = os.getenv("TRON_SERVICE_NAME", "tron-ai-backend")
+        self.exporter = create_exporter()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._worker: Optional[threading.Thread] = None
+        self.span_stats: Dict[str, Dict[str, float]] = {}
+        self.stats = {
+            "traces": 0,
+            "slow_traces": 0,
+            "exported": 0,
+            "export_dropped": 0,
+            "export_errors": 0
+        }
+
+    def finish(self, trace: Trace):
+        trace.root.finish()
+        self.stats["traces"] += 1
+        for item in trace.spans:
+            name = "request" if item.parent_id is None else item.name
+            stats = self.span_stats.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            duration = item.duration_ms
+            stats["count"] += 1
+            stats["total_ms"] += duration
+            stats["max_ms"] = max(stats["max_ms"], duration)
+
+        total_ms = trace.root.duration_ms
+        slow = total_ms >= self.slow_ms
+        if slow:
+            self.stats["slow_traces"] += 1
+            logger.warning("Slow request", extra={
+                "request_id": trace.request_id,
+                "correlation_id": trace.correlation_id,
+                "route": trace.root.name,
+                "duration_ms": round(total_ms, 1),
+                "server_timing": trace.server_timing()
+            })
+
+        if self.exporter is not None and (slow or (self.sample_rate and random.random() < self.sample_rate)):
+            self._enqueue(trace)
+
+    def _enqueue(self, trace: Trace):
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._export_loop, name="trace-exporter", daemon=True)
+            self._worker.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.stats["export_dropped"] += 1
+
+    def _export_loop(self):
+        while True:
+            trace = self._queue.get()
+            try:
+                self.exporter.export(to_otlp(trace, self.service_name))
+                self.stats["exported"] += 1
+            except Exception as e:
+                self.stats["export_errors"] += 1
+                logger.debug(f"Trace export failed: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "slow_threshold_ms": self.slow_ms,
+            "exporter": type(self.exporter).__name__ if self.exporter else None,
+            "spans": {
+                name: {
+                    "count": int(stats["count"]),
+                    "average_ms": round(stats["total_ms"] / stats["count"], 2),
+                    "max_ms": round(stats["max_ms"], 2)
+                }
+                for name, stats in self.span_stats.items()
+            }
+        }
+
+
+# Global tracer instance
+tracer = Tracer()
+
+
+# =============================================================================
+# ASGI AND ROUTE INTEGRATION
+# =============================================================================
+
+def _incoming_correlation_id(scope) -> Optional[str]:
+    # A caller-supplied X-Request-ID never becomes the trace or ai_requests row ID;
+    # it is echoed back as X-Correlation-ID so clients can still match their own logs
+    value = Headers(scope=scope).get("x-request-id")
+    if not value or len(value) > MAX_CORRELATION_ID_LENGTH or not value.isprintable():
+        return None
+    return value
+
+
+class TracingMiddleware:
+    """
+    Opens the root span for every HTTP request, sets the request ID, and adds
+    X-Request-ID and Server-Timing headers to the response
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(str(uuid.uuid4()), _incoming_correlation_id(scope))
+        attributes = {"http.method": scope["method"]}
+        if trace.correlation_id is not None:
+            attributes["http.correlation_id"] = trace.correlation_id
+        root = trace.add_span(f"{scope['method']} {scope['path']}", None, attributes)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(root)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                root.attributes["http.status_code"] = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Request-ID", trace.request_id)
+                if trace.correlation_id is not None:
+                    headers.append("X-Correlation-ID", trace.correlation_id)
+                if tracer.server_timing:
+                    headers.append("Server-Timing", trace.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception as e:
+            root.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            tracer.finish(trace)
+
+
+def _trace_endpoint(endpoint: Callable) -> Callable:
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        trace = _current_trace.get()
+        parent = _current_span.get()
+        if trace is not None and parent is not None:
+            # Everything between the route handler starting and the endpoint running
+            # is body parsing and pydantic validation
+            validate = trace.add_span("validate", parent.span_id, start_perf_ns=parent.start_perf_ns)
+            if validate is not None:
+                validate.finish()
+        with span("endpoint"):
+            return await endpoint(*args, **kwargs)
+    wrapper._tron_traced = True
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute that splits each request into validate, endpoint and serialize spans
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint) and not getattr(endpoint, "_tron_traced", False):
+            endpoint = _trace_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route_path = self.path
+
+        async def traced_handler(request):
+            trace = _current_trace.get()
+            if trace is None:
+                return await handler(request)
+            trace.root.name = f"{request.method} {route_path}"
+            trace.root.attributes["http.route"] = route_path
+            with span("route") as route_span:
+                response = await handler(request)
+            if route_span is not None:
+                endpoint_span = next(
+                    (item for item in reversed(trace.spans)
+                     if item.name == "endpoint" and item.parent_id == route_span.span_id), None
+                )
+                if endpoint_span is not None:
+                    serialize = trace.add_span("serialize", route_span.span_id, start_perf_ns=endpoint_span.end_perf_ns)
+                    if serialize is not None:
+                        serialize.end_perf_ns = route_span.end_perf_ns
+            return response
+
+        return traced_handler
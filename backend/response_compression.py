@@ -0,0 +1,392 @@
+"""
+TRON Ultimate AI Platform - Response Compression
+Content-aware zstd/brotli/gzip negotiation as pure ASGI middleware
+"""
+
+import os
+import time
+import zlib
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from importlib.util import find_spec
+from typing import Optional, Dict, Any, List, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MINIMUM_SIZE = 1000
+DEFAULT_CACHE_MB = 16
+
+# Static GET routes whose compressed bodies are cached; override with TRON_COMPRESSION_CACHE_PATHS.
+# Everything else is compressed inline, so per-request bodies never fill or churn the cache
+DEFAULT_CACHEABLE_PATHS = ("/api/ultimate-ai/capabilities", "/openapi.json", "/docs", "/redoc")
+
+# Bodies larger than this are compressed in a thread instead of on the event loop
+THREAD_OFFLOAD_BYTES = 256 * 1024
+# Bodies larger than this are never put in the precompressed cache
+MAX_CACHEABLE_BYTES = 4 * 1024 * 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Server preference when the client weights several encodings equally
+ENCODING_PREFERENCE = ["zstd", "br", "gzip"]
+
+# Only these types are compressed; images, archives, office documents and
+# octet-stream downloads are already compressed or not worth the CPU
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml"
+)
+COMPRESSIBLE_SUFFIXES = ("+json", "+xml")
+
+# Streaming types where every chunk must reach the client as soon as it is produced
+FLUSH_EACH_CHUNK_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def available_encodings() -> List[str]:
+    """Encodings whose codec is installed, in server preference order"""
+    modules = {"zstd": "zstandard", "br": "brotli", "gzip": None}
+    return [
+        encoding for encoding in ENCODING_PREFERENCE
+        if modules[encoding] is None or find_spec(modules[encoding]) is not None
+    ]
+
+
+def negotiate_encoding(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """
+    Pick the best available encoding for an Accept-Encoding header
+    Highest q-value wins; ties go to the server preference order
+    """
+    weights: Dict[str, float] = {}
+    wildcard: Optional[float] = None
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name == "*":
+            wildcard = q
+        else:
+            weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, wildcard if wildcard is not None else 0.0)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+# =============================================================================
+# CODECS
+# =============================================================================
+
+def compress_body(encoding: str, data: bytes) -> Tuple[bytes, float]:
+    """One-shot compression; returns (compressed, cpu seconds)"""
+    started = time.perf_counter()
+    if encoding == "zstd":
+        import zstandard
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    elif encoding == "br":
+        import brotli
+        compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        compressed = compressor.compress(data) + compressor.flush()
+    return compressed, time.perf_counter() - started
+
+
+class StreamCompressor:
+    """
+    Incremental compressor for responses sent in several body messages
+    With flush=True each chunk is emitted as a complete block, so SSE and
+    NDJSON events are decodable by the client as soon as they arrive
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "zstd":
+            import zstandard
+            self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        elif encoding == "br":
+            import brotli
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        if self.encoding == "br":
+            output = self._compressor.process(data)
+            return output + self._compressor.flush() if flush else output
+        output = self._compressor.compress(data)
+        if flush:
+            if self.encoding == "zstd":
+                output += self._compressor.flush(self._flush_block)
+            else:
+                output += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return output
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+# =============================================================================
+# PRECOMPRESSED CACHE AND METRICS
+# =============================================================================
+
+class PrecompressedCache:
+    """
+    Byte-bounded LRU of compressed bodies keyed by encoding and body digest
+    Only bodies of the opted-in static routes are stored, so the capability
+    catalog and API docs are compressed once
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(encoding: str, body: bytes) -> Tuple[str, bytes]:
+        return encoding, hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        compressed = self._entries.get(key)
+        if compressed is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return compressed
+
+    def put(self, key: Tuple[str, bytes], compressed: bytes):
+        if len(compressed) > self.max_bytes or key in self._entries:
+            return
+        self._entries[key] = compressed
+        self.current_bytes += len(compressed)
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
+
+
+class CompressionMetrics:
+    """Per-encoding ratio and CPU time, plus counts of skipped responses by reason"""
+
+    def __init__(self):
+        self.encodings: Dict[str, Dict[str, float]] = {}
+        self.skipped: Dict[str, int] = {}
+        self.cache: Optional[PrecompressedCache] = None
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, cpu_seconds: float, responses: int = 0):
+        stats = self.encodings.setdefault(
+            encoding, {"responses": 0, "bytes_in": 0, "bytes_out": 0, "cpu_seconds": 0.0}
+        )
+        stats["responses"] += responses
+        stats["bytes_in"] += bytes_in
+        stats["bytes_out"] += bytes_out
+        stats["cpu_seconds"] += cpu_seconds
+
+    def skip(self, reason: str):
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        encodings = {
+            encoding: {
+                "responses": int(stats["responses"]),
+                "bytes_in": int(stats["bytes_in"]),
+                "bytes_out": int(stats["bytes_out"]),
+                "ratio": round(stats["bytes_in"] / stats["bytes_out"], 2) if stats["bytes_out"] else None,
+                "cpu_ms": round(stats["cpu_seconds"] * 1000, 2),
+                "cpu_ms_per_mb": round(stats["cpu_seconds"] * 1000 / (stats["bytes_in"] / 1048576), 2)
+                if stats["bytes_in"] else None
+            }
+            for encoding, stats in self.encodings.items()
+        }
+        cache = {}
+        if self.cache is not None:
+            cache = {
+                "entries": len(self.cache._entries),
+                "bytes": self.cache.current_bytes,
+                "hits": self.cache.hits,
+                "misses": self.cache.misses
+            }
+        return {"encodings": encodings, "skipped": dict(self.skipped), "precompressed_cache": cache}
+
+
+# Global compression metrics instance
+compression_metrics = CompressionMetrics()
+
+
+# =============================================================================
+# MIDDLEWARE
+# =============================================================================
+
+class CompressionMiddleware:
+    """
+    Replaces GZipMiddleware: negotiates zstd, brotli or gzip per request,
+    leaves incompressible types untouched and streams without buffering
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None, cache_mb: Optional[int] = None,
+                 cacheable_paths: Optional[Tuple[str, ...]] = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else int(
+            os.getenv("TRON_COMPRESSION_MIN_SIZE", DEFAULT_MINIMUM_SIZE)
+        )
+        cache_mb = cache_mb if cache_mb is not None else int(os.getenv("TRON_COMPRESSION_CACHE_MB", DEFAULT_CACHE_MB))
+        self.cache = PrecompressedCache(cache_mb * 1024 * 1024)
+        if cacheable_paths is None:
+            configured = os.getenv("TRON_COMPRESSION_CACHE_PATHS")
+            cacheable_paths = DEFAULT_CACHEABLE_PATHS if configured is None else tuple(
+                path.strip() for path in configured.split(",") if path.strip()
+            )
+        self.cacheable_paths = frozenset(cacheable_paths)
+        self.encodings = available_encodings()
+        compression_metrics.cache = self.cache
+        logger.info(f"Response compression enabled: {', '.join(self.encodings)}")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            compression_metrics.skip("not_accepted")
+            await self.app(scope, receive, send)
+            return
+
+        cacheable = scope["method"] == "GET" and scope["path"] in self.cacheable_paths
+        responder = _CompressionResponder(self, encoding, send, cacheable)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-response state: decides on the first body message, then compresses or passes through"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send, cacheable: bool):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.cacheable = cacheable
+        self.downstream = send
+        self.start_message: Optional[Dict[str, Any]] = None
+        self.mode: Optional[str] = None
+        self.stream: Optional[StreamCompressor] = None
+        self.flush_each = False
+
+    async def send(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.mode is None:
+            self.mode = self._choose_mode(body, more_body)
+            if self.mode == "passthrough":
+                await self.downstream(self.start_message)
+            elif self.mode == "single":
+                await self._send_single(body)
+                return
+            else:
+                self._start_stream()
+                await self.downstream(self.start_message)
+
+        if self.mode == "passthrough":
+            await self.downstream(message)
+            return
+
+        started = time.perf_counter()
+        output = self.stream.compress(body, flush=self.flush_each)
+        if not more_body:
+            output += self.stream.finish()
+        compression_metrics.record(
+            self.encoding, len(body), len(output), time.perf_counter() - started,
+            responses=0 if more_body else 1
+        )
+        if output or not more_body:
+            await self.downstream({"type": "http.response.body", "body": output, "more_body": more_body})
+
+    def _choose_mode(self, body: bytes, more_body: bool) -> str:
+        headers = Headers(raw=self.start_message["headers"])
+        status = self.start_message["status"]
+        if status in (204, 206, 304) or "content-range" in headers:
+            reason = "status"
+        elif "content-encoding" in headers:
+            reason = "already_encoded"
+        elif not is_compressible(headers.get("content-type", "")):
+            reason = "content_type"
+        elif not more_body and len(body) < self.middleware.minimum_size:
+            reason = "too_small"
+        else:
+            return "stream" if more_body else "single"
+        compression_metrics.skip(reason)
+        return "passthrough"
+
+    def _set_encoding_headers(self, content_length: Optional[int]):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+
+    def _start_stream(self):
+        headers = Headers(raw=self.start_message["headers"])
+        self.flush_each = headers.get("content-type", "").split(";", 1)[0].strip().lower() in FLUSH_EACH_CHUNK_TYPES
+        self.stream = StreamCompressor(self.encoding)
+        self._set_encoding_headers(None)
+
+    async def _send_single(self, body: bytes):
+        cache = self.middleware.cache
+        key = None
+        if self.cacheable and self.start_message["status"] == 200 and len(body) <= MAX_CACHEABLE_BYTES:
+            key = PrecompressedCache.key(self.encoding, body)
+        compressed = cache.get(key) if key is not None else None
+        if compressed is not None:
+            compression_metrics.record(self.encoding, len(body), len(compressed), 0.0, responses=1)
+        else:
+            if len(body) > THREAD_OFFLOAD_BYTES:
+                compressed, seconds = await asyncio.to_thread(compress_body, self.encoding, body)
+            else:
+                compressed, seconds = compress_body(self.encoding, body)
+            compression_metrics.record(self.encoding, len(body), len(compressed), seconds, responses=1)
+            if key is not None:
+                cache.put(key, compressed)
+
+        self._set_encoding_headers(len(compressed))
+        await self.downstream(self.start_message)
+        await self.downstream({"type": "http.response.body", "body": compressed, "more_body": False})
@@ -0,0 +1,198 @@
+"""
+TRON Ultimate AI Platform - Response Models
+Typed response schemas for the Ultimate AI capability endpoints
+
+Each capability model lists the request inputs its result echoes back. The
+response_shape dependency uses the models to project results to the fields a
+caller asks for (?fields=) or to drop those echoed inputs (?compact=true).
+
+The models are schema-only: routes declare them as response_model for the
+OpenAPI docs but return TRONJSONResponse with the engine result, so FastAPI
+neither validates nor filters responses through them.
+"""
+
+from typing import Dict, List, Optional, Any, ClassVar, FrozenSet, Tuple, Type
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, ConfigDict
+
+# Kept in every projection so callers can always tell success from failure
+ALWAYS_INCLUDED = frozenset(("success", "error"))
+
+
+class CapabilityResponse(BaseModel):
+    """Fields shared by every capability result, successful or not"""
+    model_config = ConfigDict(extra="allow", protected_namespaces=())
+
+    success: bool
+    error: Optional[str] = None
+    model: Optional[str] = None
+    processing_time: Optional[float] = None
+    prompt_tokens: Optional[int] = None
+    timestamp: str
+
+    # Request inputs repeated in the result; compact responses leave them out
+    echoed_fields: ClassVar[Tuple[str, ...]] = ()
+
+
+class ChatResponse(CapabilityResponse):
+    session_id: Optional[str] = None
+    response: Optional[str] = None
+    turn_count: Optional[int] = None
+    context_tokens: Optional[int] = None
+    summarized_turns: Optional[int] = None
+
+
+class GeneratedImage(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    id: str
+    url: str
+    thumbnail_url: str
+    content_type: str
+    size_bytes: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+class ImageGenerationResponse(CapabilityResponse):
+    echoed_fields: ClassVar[Tuple[str, ...]] = ("prompt",)
+
+    images: List[GeneratedImage] = []
+    prompt: Optional[str] = None
+
+
+class WebResearchResponse(CapabilityResponse):
+    echoed_fields: ClassVar[Tuple[str, ...]] = ("query", "context")
+
+    query: Optional[str] = None
+    results: Optional[str] = None
+    context: Optional[str] = None
+
+
+class CodeExecutionResponse(CapabilityResponse):
+    echoed_fields: ClassVar[Tuple[str, ...]] = ("code", "context")
+
+    code: Optional[str] = None
+    language: Optional[str] = None
+    executed: Optional[bool] = None
+    execution: Optional[Dict[str, Any]] = None
+    analysis: Optional[str] = None
+    results: Optional[str] = None
+    execution_time: Optional[float] = None
+    context: Optional[str] = None
+
+
+class BrowserControlResponse(CapabilityResponse):
+    echoed_fields: ClassVar[Tuple[str, ...]] = ("task", "url")
+
+    task: Optional[str] = None
+    url: Optional[str] = None
+    actions: List[Any] = []
+    results: Optional[str] = None
+
+
+class FileCreationResponse(CapabilityResponse):
+    filename: Optional[str] = None
+    format: Optional[str] = None
+    file_path: Optional[str] = None
+    download_url: Optional[str] = None
+    size_bytes: Optional[int] = None
+    render_time: Optional[float] = None
+
+
+class FileAnalysisResponse(CapabilityResponse):
+    echoed_fields: ClassVar[Tuple[str, ...]] = ("prompt", "file_ids")
+
+    prompt: Optional[str] = None
+    file_ids: List[str] = []
+    results: Optional[str] = None
+
+
+class DatasetAnalysisResponse(CapabilityResponse):
+    file_id: Optional[str] = None
+    summary: Optional[Dict[str, Any]] = None
+    insights: Optional[str] = None
+    file_size_bytes: Optional[int] = None
+    throughput: Optional[Dict[str, Any]] = None
+
+
+class LiveInteractionResponse(CapabilityResponse):
+    echoed_fields: ClassVar[Tuple[str, ...]] = ("data",)
+
+    interaction_type: Optional[str] = None
+    response: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class WorkflowResponse(CapabilityResponse):
+    echoed_fields: ClassVar[Tuple[str, ...]] = ("workflow", "tasks")
+
+    workflow: Optional[str] = None
+    tasks: Optional[List[Dict[str, Any]]] = None
+    results: Optional[str] = None
+    task_count: Optional[int] = None
+
+
+class SystemAnalyticsResponse(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    system_status: Optional[str] = None
+    total_requests: Optional[int] = None
+    error_count: Optional[int] = None
+    error_rate: Optional[float] = None
+    uptime_seconds: Optional[float] = None
+    capability_usage: Optional[Dict[str, int]] = None
+    performance_metrics: Optional[Dict[str, Any]] = None
+    timestamp: str
+
+
+class CapabilityInfoResponse(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    engine_info: Dict[str, Any]
+    models: Dict[str, str]
+    capabilities: Dict[str, Dict[str, Any]]
+    timestamp: str
+
+
+class ResponseShape:
+    """Which result fields one request gets back"""
+    __slots__ = ("include", "exclude")
+
+    def __init__(self, include: Optional[FrozenSet[str]] = None, exclude: Tuple[str, ...] = ()):
+        self.include = include
+        self.exclude = exclude
+
+    def apply(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if self.include is not None:
+            return {key: value for key, value in result.items() if key in self.include}
+        if self.exclude:
+            return {key: value for key, value in result.items() if key not in self.exclude}
+        return result
+
+
+def response_shape(model: Type[CapabilityResponse]):
+    """
+    Router dependency: ?fields=a,b returns only those fields (plus success and error),
+    ?compact=true drops the inputs the result would echo. Unknown fields are a 400,
+    raised before the request is admitted to the engine
+    """
+    known = frozenset(model.model_fields)
+    echoed = model.echoed_fields
+
+    def shape(
+        fields: Optional[str] = Query(default=None, description="Comma-separated result fields to return"),
+        compact: bool = Query(default=False, description="Omit request inputs echoed back in the result")
+    ) -> ResponseShape:
+        if fields:
+            requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+            unknown = requested - known
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(sorted(known))}"
+                )
+            return ResponseShape(include=requested | ALWAYS_INCLUDED)
+        return ResponseShape(exclude=echoed if compact else ())
+    return shape
@@ -0,0 +1,249 @@
+"""
+TRON Ultimate AI Platform - Serverless Adapter
+Runs the ASGI application inside Lambda-style function handlers (Netlify Functions)
+
+The app, its event loop and everything bound to it (engine, worker pools, caches,
+database client) are created on the first invocation and reused while the
+container stays warm. The loop runs on a daemon thread so background tasks keep
+progressing between invocations.
+"""
+
+import time
+import base64
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from urllib.parse import urlencode
+from typing import Optional, Dict, Any, List, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+STARTUP_TIMEOUT = 60
+TEXT_CONTENT_TYPES = ("text/", "application/json", "application/xml", "application/javascript",
+                      "application/x-ndjson", "image/svg+xml")
+
+
+def _is_text(headers: Dict[str, str]) -> bool:
+    """Text bodies are returned as-is; compressed or binary bodies are base64-encoded"""
+    if headers.get("content-encoding"):
+        return False
+    return headers.get("content-type", "").startswith(TEXT_CONTENT_TYPES)
+
+
+def _client_ip(event: Dict[str, Any], header_map: Dict[bytes, bytes]) -> str:
+    """
+    Client address as set by the platform, never the caller-controlled start of X-Forwarded-For
+    Netlify sets x-nf-client-connection-ip, API Gateway reports the source IP in the request
+    context; otherwise the last X-Forwarded-For hop is the one the platform proxy appended
+    """
+    platform_ip = header_map.get(b"x-nf-client-connection-ip", b"").decode("latin-1").strip()
+    if platform_ip:
+        return platform_ip
+    source_ip = ((event.get("requestContext") or {}).get("identity") or {}).get("sourceIp")
+    if source_ip:
+        return source_ip
+    return header_map.get(b"x-forwarded-for", b"").decode("latin-1").split(",")[-1].strip()
+
+
+class ServerlessASGIAdapter:
+    """Translates API Gateway v1 style events into ASGI HTTP requests"""
+
+    def __init__(self, app_factory: Callable[[], Any], strip_prefix: str = "",
+                 path_aliases: Optional[Dict[str, str]] = None):
+        self.app_factory = app_factory
+        self.strip_prefix = strip_prefix.rstrip("/")
+        self.path_aliases = path_aliases or {}
+        self.app = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lifespan_queue: Optional[asyncio.Queue] = None
+        self._lifespan_task: Optional[asyncio.Task] = None
+        self._init_lock = threading.Lock()
+        self.stats = {
+            "cold_start_ms": None,
+            "invocations": 0,
+            "last_invocation_ms": None
+        }
+
+    # -------------------------------------------------------------------------
+    # Warm state
+    # -------------------------------------------------------------------------
+
+    def _ensure_started(self):
+        if self.app is not None:
+            return
+        with self._init_lock:
+            if self.app is not None:
+                return
+            started = time.perf_counter()
+            self.loop = asyncio.new_event_loop()
+            threading.Thread(target=self.loop.run_forever, name="serverless-event-loop", daemon=True).start()
+            app = self.app_factory()
+            asyncio.run_coroutine_threadsafe(self._startup(app), self.loop).result(STARTUP_TIMEOUT)
+            self.app = app
+            self.stats["cold_start_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            logger.info("Serverless app initialized", extra={"cold_start_ms": self.stats["cold_start_ms"]})
+
+    async def _startup(self, app):
+        """Run the ASGI lifespan startup; the lifespan task stays pending until shutdown"""
+        self._lifespan_queue = asyncio.Queue()
+        await self._lifespan_queue.put({"type": "lifespan.startup"})
+        started = asyncio.get_running_loop().create_future()
+
+        async def send(message):
+            if message["type"] in ("lifespan.startup.complete", "lifespan.startup.failed") and not started.done():
+                started.set_result(message)
+
+        async def run():
+            try:
+                await app({"type": "lifespan", "asgi": {"version": "3.0"}}, self._lifespan_queue.get, send)
+            except Exception as e:
+                # Apps without lifespan support are still served
+                logger.warning(f"Lifespan not supported: {str(e)}")
+            if not started.done():
+                started.set_result({"type": "lifespan.startup.complete"})
+
+        self._lifespan_task = asyncio.create_task(run())
+        message = await started
+        if message["type"] == "lifespan.startup.failed":
+            raise RuntimeError(f"Application startup failed: {message.get('message', '')}")
+
+    def shutdown(self):
+        """Run lifespan shutdown and stop the loop; for tests and local runs"""
+        if self.app is None:
+            return
+        self.loop.call_soon_threadsafe(self._lifespan_queue.put_nowait, {"type": "lifespan.shutdown"})
+        asyncio.run_coroutine_threadsafe(asyncio.wait([self._lifespan_task], timeout=10), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.app = None
+
+    # -------------------------------------------------------------------------
+    # Request translation
+    # -------------------------------------------------------------------------
+
+    def _build_scope(self, event: Dict[str, Any]) -> Tuple[Dict[str, Any], bytes]:
+        path = event.get("path") or "/"
+        if self.strip_prefix and path.startswith(self.strip_prefix):
+            path = path[len(self.strip_prefix):] or "/"
+        path = self.path_aliases.get(path, path)
+
+        multi_query = event.get("multiValueQueryStringParameters")
+        if multi_query:
+            query = urlencode([(key, value) for key, values in multi_query.items() for value in values])
+        else:
+            query = urlencode(event.get("queryStringParameters") or {})
+
+        headers: List[Tuple[bytes, bytes]] = []
+        multi_headers = event.get("multiValueHeaders") or {}
+        for name, value in (event.get("headers") or {}).items():
+            if name not in multi_headers:
+                headers.append((name.lower().encode("latin-1"), str(value).encode("latin-1")))
+        for name, values in multi_headers.items():
+            headers.extend((name.lower().encode("latin-1"), str(value).encode("latin-1")) for value in values)
+
+        body = event.get("body") or b""
+        if isinstance(body, str):
+            body = base64.b64decode(body) if event.get("isBase64Encoded") else body.encode("utf-8")
+
+        header_map = dict(headers)
+        client_ip = _client_ip(event, header_map)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": (event.get("httpMethod") or "GET").upper(),
+            "scheme": header_map.get(b"x-forwarded-proto", b"https").decode("latin-1"),
+            "path": path,
+            "raw_path": path.encode("utf-8"),
+            "root_path": "",
+            "query_string": query.encode("latin-1"),
+            "headers": headers,
+            "client": (client_ip or "0.0.0.0", 0),
+            "server": (header_map.get(b"host", b"localhost").decode("latin-1"), 443)
+        }
+        return scope, body
+
+    async def _invoke(self, scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+        status = 500
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        request_sent = False
+        response_done = asyncio.Event()
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Streaming responses listen for disconnect; the client stays until the body is complete
+            await response_done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers.extend(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_done.set()
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception as e:
+            # As an ASGI server would: log, and return what was sent (or a bare 500)
+            logger.error(f"Unhandled error in serverless invocation: {str(e)}", exc_info=True)
+            if not response_headers:
+                response_headers.append((b"content-type", b"text/plain"))
+                chunks = [b"Internal Server Error"]
+        finally:
+            response_done.set()
+        return self._build_response(status, response_headers, b"".join(chunks))
+
+    @staticmethod
+    def _build_response(status: int, raw_headers: List[Tuple[bytes, bytes]], body: bytes) -> Dict[str, Any]:
+        headers: Dict[str, str] = {}
+        multi_headers: Dict[str, List[str]] = {}
+        for raw_name, raw_value in raw_headers:
+            name, value = raw_name.decode("latin-1").lower(), raw_value.decode("latin-1")
+            multi_headers.setdefault(name, []).append(value)
+            headers[name] = value
+        response = {"statusCode": status, "headers": headers}
+        # Repeated headers such as set-cookie only survive in multiValueHeaders
+        repeated = {name: values for name, values in multi_headers.items() if len(values) > 1}
+        if repeated:
+            response["multiValueHeaders"] = repeated
+        if _is_text(headers):
+            response["body"] = body.decode("utf-8", errors="replace")
+            response["isBase64Encoded"] = False
+        else:
+            response["body"] = base64.b64encode(body).decode("ascii")
+            response["isBase64Encoded"] = True
+        return response
+
+    # -------------------------------------------------------------------------
+    # Entry point
+    # -------------------------------------------------------------------------
+
+    def handle(self, event: Dict[str, Any], context: Any = None) -> Dict[str, Any]:
+        """Function handler body: one event in, one API Gateway style response out"""
+        started = time.perf_counter()
+        self._ensure_started()
+        scope, body = self._build_scope(event)
+        future = asyncio.run_coroutine_threadsafe(self._invoke(scope, body), self.loop)
+        # Leave a margin before the platform kills the function so the timeout is reported
+        remaining = getattr(context, "get_remaining_time_in_millis", None)
+        timeout = max(0.1, remaining() / 1000 - 0.5) if callable(remaining) else None
+        try:
+            response = future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.error("Serverless invocation timed out", extra={"path": scope["path"]})
+            response = self._build_response(
+                504, [(b"content-type", b"application/json")],
+                b'{"error": true, "status_code": 504, "detail": "Function timed out"}'
+            )
+        self.stats["invocations"] += 1
+        self.stats["last_invocation_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return response
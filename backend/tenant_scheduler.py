@@ -0,0 +1,496 @@
+"""
+TRON Ultimate AI Platform - Tenant Scheduler
+Weighted fair queueing of engine calls across tenants and priority lanes, with per-tenant rate limits
+
+Tenants are identified by a verified API key (TRON_API_KEYS), optionally narrowed
+by X-User-ID, and otherwise by client address (read from X-Forwarded-For only
+when the connecting peer is in TRON_TRUSTED_PROXIES). Engine
+calls share TRON_SCHEDULER_CONCURRENCY slots (the Gemini quota); when they are
+all busy, waiting requests are served in start-time fair queueing order, so a
+tenant with a deep backlog gets its weighted share and no more.
+
+Requests are interactive (default) or batch. Interactive waiters are always
+admitted first and part of the capacity is reserved for them. Batch traffic
+runs on the remaining slots under an adaptive limit that halves whenever
+interactive requests have to wait and grows back while they do not.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import ipaddress
+import logging
+import contextvars
+from collections import deque, OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Deque, Tuple, List, Union
+
+from fastapi import HTTPException, Request
+from starlette.requests import HTTPConnection
+
+from live_session_bridge import LatencyRecorder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TENANT_RATE = 10.0
+DEFAULT_TENANT_BURST = 30
+DEFAULT_MAX_QUEUE = 100
+# Live sessions hold an upstream connection for minutes, so they are capped per tenant
+# rather than queued for an engine slot
+DEFAULT_MAX_LIVE_SESSIONS = 4
+MAX_TRACKED_TENANTS = 1000
+METRICS_TOP_TENANTS = 20
+DEFAULT_INTERACTIVE_TARGET_MS = 50
+BATCH_BACKOFF_INTERVAL = 0.1
+
+# Admission order: earlier lanes always go first
+PRIORITY_LANES = ("interactive", "batch")
+DEFAULT_PRIORITY = "interactive"
+
+# Relative cost of one call per capability, in units of a chat turn
+CAPABILITY_COSTS = {
+    "text_generation": 1.0,
+    "web_research": 2.0,
+    "image_generation": 4.0,
+    "code_execution": 1.0,
+    "browser_control": 2.0,
+    "file_creation": 1.0,
+    "file_analysis": 2.0,
+    "data_analysis": 3.0,
+    "live_interactions": 1.0,
+    "workflows": 6.0
+}
+
+_current_user_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("tron_user_id", default=None)
+
+
+def current_user_id() -> Optional[str]:
+    """User ID of the tenant being served, when it was given as X-User-ID under a verified key"""
+    return _current_user_id.get()
+
+
+def _key_digest(api_key: str) -> bytes:
+    return hashlib.sha256(api_key.encode()).digest()
+
+
+def parse_api_keys(spec: str) -> Dict[bytes, str]:
+    """Parse TRON_API_KEYS="mobile=sk-123,partner=sk-456" into key digest -> tenant label"""
+    keys = {}
+    for item in spec.split(","):
+        label, _, api_key = item.strip().partition("=")
+        if label and api_key:
+            keys[_key_digest(api_key.strip())] = label.strip()
+    return keys
+
+
+# Only digests are kept in memory, never the keys themselves
+API_KEYS = parse_api_keys(os.getenv("TRON_API_KEYS", ""))
+
+
+def parse_trusted_proxies(spec: str) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    """Parse TRON_TRUSTED_PROXIES="10.0.0.0/8,127.0.0.1" into networks; bad entries are skipped"""
+    networks = []
+    for item in spec.split(","):
+        item = item.strip()
+        if item:
+            try:
+                networks.append(ipaddress.ip_network(item, strict=False))
+            except ValueError:
+                logger.warning(f"Ignoring invalid TRON_TRUSTED_PROXIES entry: {item}")
+    return networks
+
+
+TRUSTED_PROXIES = parse_trusted_proxies(os.getenv("TRON_TRUSTED_PROXIES", ""))
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def client_address(request: HTTPConnection) -> str:
+    """
+    Address of the caller; behind a trusted proxy, the rightmost X-Forwarded-For hop
+    that is not itself a trusted proxy. Hops left of that are caller-controlled
+    """
+    host = request.client.host if request.client else "unknown"
+    if not TRUSTED_PROXIES or not _is_trusted_proxy(host):
+        return host
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else host
+
+
+def parse_tenant_map(spec: str) -> Dict[str, float]:
+    """Parse "tenant=value" lists such as TRON_TENANT_WEIGHTS="key:mobile=4,user:mobile/alice=0.5" """
+    values = {}
+    for item in spec.split(","):
+        name, _, value = item.strip().rpartition("=")
+        if name and value:
+            try:
+                values[name.strip()] = float(value)
+            except ValueError:
+                continue
+    return values
+
+
+def normalize_priority(value: Optional[str]) -> str:
+    """Map a header or field value to a lane; unknown values get the default lane"""
+    value = (value or "").strip().lower()
+    return value if value in PRIORITY_LANES else DEFAULT_PRIORITY
+
+
+def resolve_tenant(request: HTTPConnection) -> Tuple[str, Optional[str]]:
+    """
+    Tenant key and, when supplied under a verified key, the raw user ID
+    Unknown keys and bare X-User-ID headers fall back to the client address, so made-up
+    credentials cannot mint a fresh rate-limit bucket per request
+    """
+    api_key = request.headers.get("x-api-key")
+    authorization = request.headers.get("authorization", "")
+    if not api_key and authorization.lower().startswith("bearer "):
+        api_key = authorization[7:].strip()
+    label = API_KEYS.get(_key_digest(api_key)) if api_key else None
+    if label is None:
+        return f"ip:{client_address(request)}", None
+    # A key holder may split its traffic per user; users are scoped to the key that vouches for them
+    user_id = request.headers.get("x-user-id")
+    if user_id:
+        return f"user:{label}/{user_id[:64]}", user_id[:64]
+    return f"key:{label}", None
+
+
+@dataclass
+class TenantTicket:
+    """An admitted request waiting for, or holding, an engine slot"""
+    tenant: str
+    capability: str
+    user_id: Optional[str] = None
+    priority: str = DEFAULT_PRIORITY
+    # The request guard watches request for disconnects and sets the monotonic deadline
+    request: Optional[Request] = field(default=None, repr=False, compare=False)
+    deadline: Optional[float] = None
+    admitted: bool = False
+
+
+class TokenBucket:
+    """Refills at rate tokens per second up to burst; a rate of 0 disables the limit"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, cost: float = 1.0) -> float:
+        """Take tokens; returns 0 on success, else the seconds until enough have refilled"""
+        if self.rate <= 0:
+            return 0.0
+        # A call costing more than the burst could never be admitted otherwise
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+
+class TenantState:
+    def __init__(self, name: str, weight: float, rate: float, burst: float):
+        self.name = name
+        self.weight = max(weight, 0.01)
+        self.bucket = TokenBucket(rate, burst)
+        self.waiting: Dict[str, Deque["_Waiter"]] = {lane: deque() for lane in PRIORITY_LANES}
+        self.last_finish: Dict[str, float] = {lane: 0.0 for lane in PRIORITY_LANES}
+        self.in_flight = 0
+        self.admitted = 0
+        self.completed = 0
+        self.rate_limited = 0
+        self.queue_full = 0
+        self.live_sessions = 0
+        self.live_rejected = 0
+        self.wait = LatencyRecorder(window=512)
+        self.service = LatencyRecorder(window=512)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(waiting) for waiting in self.waiting.values())
+
+    @property
+    def idle(self) -> bool:
+        return not self.queued and not self.in_flight and not self.live_sessions
+
+    def get_metrics(self) -> Dict[str, Any]:
+        wait = self.wait.summary()
+        return {
+            "weight": self.weight,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "completed": self.completed,
+            "rate_limited": self.rate_limited,
+            "queue_full": self.queue_full,
+            "live_sessions": self.live_sessions,
+            "live_rejected": self.live_rejected,
+            "wait_p50_ms": wait["p50_ms"],
+            "wait_p99_ms": wait["p99_ms"],
+            "service_p50_ms": self.service.summary()["p50_ms"]
+        }
+
+
+class Lane:
+    """One priority class; its own virtual clock keeps tenants fair within the lane"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.virtual_time = 0.0
+        self.active: Dict[str, TenantState] = {}
+        self.queued = 0
+        self.in_flight = 0
+        self.admitted = 0
+        self.wait = LatencyRecorder(window=1024)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        wait = self.wait.summary()
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "wait_p50_ms": wait["p50_ms"],
+            "wait_p95_ms": wait["p95_ms"],
+            "wait_p99_ms": wait["p99_ms"]
+        }
+
+
+class _Waiter:
+    __slots__ = ("tenant", "lane", "start_tag", "enqueued_at", "future", "granted")
+
+    def __init__(self, tenant: TenantState, lane: Lane, start_tag: float, future: asyncio.Future):
+        self.tenant = tenant
+        self.lane = lane
+        self.start_tag = start_tag
+        self.enqueued_at = time.perf_counter()
+        self.future = future
+        self.granted = False
+
+
+class TenantScheduler:
+    """Start-time fair queueing over a fixed number of engine slots, split into priority lanes"""
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self.concurrency = concurrency or int(os.getenv("TRON_SCHEDULER_CONCURRENCY", DEFAULT_CONCURRENCY))
+        self.default_rate = float(os.getenv("TRON_TENANT_RATE", DEFAULT_TENANT_RATE))
+        self.default_burst = float(os.getenv("TRON_TENANT_BURST", DEFAULT_TENANT_BURST))
+        self.max_queue = int(os.getenv("TRON_TENANT_MAX_QUEUE", DEFAULT_MAX_QUEUE))
+        self.max_live_sessions = int(os.getenv("TRON_TENANT_MAX_LIVE_SESSIONS", DEFAULT_MAX_LIVE_SESSIONS))
+        self.weights = parse_tenant_map(os.getenv("TRON_TENANT_WEIGHTS", ""))
+        self.rates = parse_tenant_map(os.getenv("TRON_TENANT_RATES", ""))
+        self.tenants: "OrderedDict[str, TenantState]" = OrderedDict()
+        self.lanes = {name: Lane(name) for name in PRIORITY_LANES}
+        self.in_flight = 0
+
+        # Interactive-only slots; batch shares the rest under an adaptive limit
+        reserved = os.getenv("TRON_INTERACTIVE_RESERVED")
+        self.reserved = min(self.concurrency - 1, int(reserved) if reserved else max(1, self.concurrency // 4))
+        self.batch_ceiling = self.concurrency - self.reserved
+        self.batch_limit = float(self.batch_ceiling)
+        self.interactive_target = float(os.getenv("TRON_INTERACTIVE_TARGET_MS", DEFAULT_INTERACTIVE_TARGET_MS)) / 1000
+        self.batch_backoffs = 0
+        self._last_backoff = 0.0
+
+    @property
+    def queued(self) -> int:
+        return sum(lane.queued for lane in self.lanes.values())
+
+    def _state(self, name: str) -> TenantState:
+        state = self.tenants.get(name)
+        if state is None:
+            rate = self.rates.get(name, self.default_rate)
+            state = TenantState(name, self.weights.get(name, 1.0), rate, max(self.default_burst, rate))
+            self.tenants[name] = state
+            self._prune()
+        self.tenants.move_to_end(name)
+        return state
+
+    def _prune(self):
+        # Forget the least recently active idle tenants; their fairness state is irrelevant once idle
+        excess = len(self.tenants) - MAX_TRACKED_TENANTS
+        for name in [name for name, state in self.tenants.items() if state.idle][:max(0, excess)]:
+            del self.tenants[name]
+
+    def check_rate(self, tenant: str, capability: str):
+        """Reject with 429 when the tenant's bucket is empty or its queue is full"""
+        state = self._state(tenant)
+        if state.queued >= self.max_queue:
+            state.queue_full += 1
+            raise HTTPException(status_code=429, detail="Too many queued requests for this tenant",
+                                headers={"Retry-After": "1"})
+        retry_after = state.bucket.take(CAPABILITY_COSTS.get(capability, 1.0))
+        if retry_after:
+            state.rate_limited += 1
+            raise HTTPException(status_code=429, detail="Tenant rate limit exceeded",
+                                headers={"Retry-After": str(max(1, round(retry_after)))})
+
+    @contextmanager
+    def live_session(self, tenant: str):
+        """
+        Count one open live session against the tenant's cap for the duration of the block
+        Raises 429 on entry when the tenant already has max_live_sessions open (0 disables the cap)
+        """
+        state = self._state(tenant)
+        if self.max_live_sessions and state.live_sessions >= self.max_live_sessions:
+            state.live_rejected += 1
+            raise HTTPException(status_code=429, detail="Too many open live sessions for this tenant")
+        state.live_sessions += 1
+        try:
+            yield
+        finally:
+            state.live_sessions -= 1
+
+    def _can_start(self, lane: Lane) -> bool:
+        if self.in_flight >= self.concurrency:
+            return False
+        if lane.name == "interactive":
+            return True
+        # Batch yields to any waiting interactive request and stays under its limit
+        return not self.lanes["interactive"].queued and lane.in_flight < int(self.batch_limit)
+
+    @asynccontextmanager
+    async def slot(self, ticket: TenantTicket, priority: Optional[str] = None):
+        """
+        Hold one engine slot for the duration of the block, waiting in fair order if needed
+        priority, when given, overrides the ticket's lane (a request body field beats the header)
+        """
+        state = self._state(ticket.tenant)
+        lane = self.lanes[normalize_priority(priority or ticket.priority)]
+        cost = CAPABILITY_COSTS.get(ticket.capability, 1.0)
+        start_tag = max(lane.virtual_time, state.last_finish[lane.name])
+        state.last_finish[lane.name] = start_tag + cost / state.weight
+        waiter = _Waiter(state, lane, start_tag, asyncio.get_running_loop().create_future())
+
+        if not lane.queued and self._can_start(lane):
+            self._grant(waiter)
+        else:
+            state.waiting[lane.name].append(waiter)
+            lane.active[state.name] = state
+            lane.queued += 1
+            if lane.name == "interactive":
+                self._back_off_batch()
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.granted:
+                    # Granted just as the caller went away: hand the slot on
+                    self._release(waiter)
+                else:
+                    self._dequeue(waiter)
+                raise
+
+        ticket.admitted = True
+        token = _current_user_id.set(ticket.user_id)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            _current_user_id.reset(token)
+            state.service.record(time.perf_counter() - started)
+            state.completed += 1
+            self._release(waiter)
+
+    def _dequeue(self, waiter: _Waiter):
+        waiting = waiter.tenant.waiting[waiter.lane.name]
+        waiting.remove(waiter)
+        waiter.lane.queued -= 1
+        if not waiting:
+            waiter.lane.active.pop(waiter.tenant.name, None)
+
+    def _grant(self, waiter: _Waiter):
+        state, lane = waiter.tenant, waiter.lane
+        waited = time.perf_counter() - waiter.enqueued_at
+        waiter.granted = True
+        lane.virtual_time = max(lane.virtual_time, waiter.start_tag)
+        self.in_flight += 1
+        lane.in_flight += 1
+        lane.admitted += 1
+        state.in_flight += 1
+        state.admitted += 1
+        lane.wait.record(waited)
+        state.wait.record(waited)
+        if lane.name == "interactive" and waited > self.interactive_target:
+            self._back_off_batch()
+        if not waiter.future.done():
+            waiter.future.set_result(None)
+
+    def _back_off_batch(self):
+        """Multiplicative decrease of the batch limit, at most once per interval"""
+        now = time.monotonic()
+        if now - self._last_backoff < BATCH_BACKOFF_INTERVAL or self.batch_limit <= 1:
+            return
+        self._last_backoff = now
+        self.batch_limit = max(1.0, self.batch_limit / 2)
+        self.batch_backoffs += 1
+
+    def _release(self, waiter: _Waiter):
+        self.in_flight -= 1
+        waiter.lane.in_flight -= 1
+        waiter.tenant.in_flight -= 1
+        if waiter.lane.name == "batch" and not self.lanes["interactive"].queued:
+            # Additive increase: roughly one extra batch slot per limit's worth of completions
+            self.batch_limit = min(float(self.batch_ceiling), self.batch_limit + 1 / self.batch_limit)
+        self._dispatch()
+
+    def _dispatch(self):
+        while self.in_flight < self.concurrency:
+            lane = next((lane for lane in self.lanes.values() if lane.queued and self._can_start(lane)), None)
+            if lane is None:
+                return
+            # The head of each tenant's queue has that tenant's smallest tag in the lane
+            tenant = min(lane.active.values(), key=lambda candidate: candidate.waiting[lane.name][0].start_tag)
+            waiter = tenant.waiting[lane.name].popleft()
+            lane.queued -= 1
+            if not tenant.waiting[lane.name]:
+                del lane.active[tenant.name]
+            self._grant(waiter)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        busiest = sorted(self.tenants.values(), key=lambda state: (state.queued, state.admitted),
+                         reverse=True)[:METRICS_TOP_TENANTS]
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "reserved_interactive": self.reserved,
+            "batch_limit": round(self.batch_limit, 2),
+            "batch_backoffs": self.batch_backoffs,
+            "lanes": {name: lane.get_metrics() for name, lane in self.lanes.items()},
+            "tracked_tenants": len(self.tenants),
+            "default_rate_per_second": self.default_rate,
+            "tenants": {state.name: state.get_metrics() for state in busiest}
+        }
+
+
+# Global tenant scheduler instance
+tenant_scheduler = TenantScheduler()
+
+
+def tenant_admission(capability: str):
+    """
+    Router dependency: identify the tenant and apply its rate limit before the endpoint runs,
+    so rejections surface as 429 rather than through the endpoint's error handling
+    """
+    async def admit(request: Request) -> TenantTicket:
+        tenant, user_id = resolve_tenant(request)
+        tenant_scheduler.check_rate(tenant, capability)
+        return TenantTicket(tenant, capability, user_id, normalize_priority(request.headers.get("x-priority")),
+                            request=request)
+    return admit
@@ -5,7 +5,6 @@ No emojis, pure functionality, high-class design
 """
 
 import os
-import json
 import asyncio
 import tempfile
 import logging
@@ -15,14 +14,32 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from pathlib import Path
 
-import google.generativeai as genai
-from google.generativeai.types import GenerationConfig
 from fastapi import HTTPException
 
 from supabase_database_manager import log_ai_request, record_performance_metric
+from image_asset_store import image_store, extract_image_blobs
+from image_pipeline import image_postprocessor, PipelineOverloadedError
+from live_session_bridge import live_metrics
+from chat_session_manager import chat_sessions, ChatSessionNotFoundError
+from file_upload_cache import upload_cache, resolve_upload
+from code_execution_pool import code_executor
+from dataset_analyzer import dataset_analyzer
+from file_renderers import file_renderer
+from response_compression import compression_metrics
+from logging_pipeline import logging_pipeline
+from request_tracing import span, tracer, current_request_id
+from event_loop_monitor import loop_monitor
+from fake_services import fake_service_enabled
+from tenant_scheduler import tenant_scheduler, parse_tenant_map
+from idempotency_store import idempotency_store, idempotency_metrics
+from request_deadlines import deadline_remaining, deadline_metrics
+from health_prober import health_prober
+from prompt_builder import (
+    PROMPT_BUDGETS, estimate_tokens, build_chat_summary_prompt, build_image_prompt, build_research_prompt, build_code_prompt,
+    build_browser_prompt, build_dataset_prompt, build_live_prompt, build_workflow_prompt
+)
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -34,6 +51,8 @@ class EngineCapabilities:
     code_execution: bool = True
     browser_control: bool = True
     file_creation: bool = True
+    vision_analysis: bool = True
+    data_analysis: bool = True
     live_interactions: bool = True
     analytics_monitoring: bool = True
     workflow_automation: bool = True
@@ -46,7 +65,8 @@ class TRONGeminiEngine:
     
     def __init__(self):
         """Initialize TRON Ultimate AI Engine"""
-        self.client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+        # The SDK client is created on first use to keep startup fast
+        self._client = None
         self.capabilities = EngineCapabilities()
         
         # 8 Specialized Gemini Models Registry
@@ -70,8 +90,114 @@ class TRONGeminiEngine:
             "uptime": datetime.now()
         }
         
+        # Input token budgets per capability and the prompt sizes actually sent
+        overrides = parse_tenant_map(os.getenv("TRON_PROMPT_BUDGETS", ""))
+        self.prompt_budgets = {**PROMPT_BUDGETS, **{name: int(value) for name, value in overrides.items()}}
+        self.prompt_usage: Dict[str, Dict[str, int]] = {}
+        
+        # The capability catalog is static, so it is built once; identical bodies
+        # let the compression layer serve it from its precompressed cache
+        self._capability_info: Optional[Dict[str, Any]] = None
+        
         logger.info("TRON Ultimate AI Engine initialized with 8 specialized models")
     
+    @property
+    def client(self):
+        """Gemini SDK client, imported and constructed lazily"""
+        if self._client is None:
+            if fake_service_enabled("gemini"):
+                from fake_services import FakeGeminiClient
+                self._client = FakeGeminiClient()
+                logger.warning("Using fake Gemini client (TRON_FAKE_SERVICES)")
+                return self._client
+            import google.generativeai as genai
+            self._client = genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+        return self._client
+    
+    async def _generate_content(self, model: str, contents: Any, config: Optional[Dict[str, Any]] = None):
+        """
+        Single entry point for model calls so each one is recorded as a trace span.
+        Uses the async client so a cancelled request stops waiting on the model, and
+        passes the request's remaining deadline to the SDK as its HTTP timeout.
+        """
+        remaining = deadline_remaining()
+        if remaining is not None:
+            config = {**(config or {}), "http_options": {"timeout": max(1, int(remaining * 1000))}}
+        with span("gemini.generate_content", model=model):
+            return await self.client.aio.models.generate_content(model=model, contents=contents, config=config)
+    
+    def _measure_prompt(self, capability: str, prompt: str) -> int:
+        """Estimate a built prompt's tokens and record them for the capability"""
+        tokens = estimate_tokens(prompt)
+        usage = self.prompt_usage.setdefault(capability, {"requests": 0, "total_tokens": 0, "max_tokens": 0})
+        usage["requests"] += 1
+        usage["total_tokens"] += tokens
+        usage["max_tokens"] = max(usage["max_tokens"], tokens)
+        return tokens
+    
+    async def chat(self, message: str, session_id: Optional[str] = None, tenant: str = "") -> Dict[str, Any]:
+        """Multi-turn text chat with server-side session history scoped to the tenant"""
+        try:
+            start_time = datetime.now()
+            
+            async with chat_sessions.turn(session_id, tenant) as session:
+                response = await self._generate_content(
+                    model=self.models["text"],
+                    contents=session.to_contents(message),
+                    config={
+                        "temperature": 0.7,
+                        "top_p": 0.95
+                    }
+                )
+                
+                session.append("user", message)
+                session.append("model", response.text)
+                if chat_sessions.over_budget(session):
+                    with span("chat.compact"):
+                        await chat_sessions.compact(session, self._summarize_chat_turns)
+                await chat_sessions.save(session)
+            
+            response_time = (datetime.now() - start_time).total_seconds()
+            self._track_metrics("text_generation", response_time)
+            
+            return {
+                "success": True,
+                "session_id": session.session_id,
+                "response": response.text,
+                "turn_count": len(session.turns) + session.summarized_turns,
+                "context_tokens": session.token_count,
+                "summarized_turns": session.summarized_turns,
+                "model": self.models["text"],
+                "processing_time": response_time,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except ChatSessionNotFoundError:
+            raise
+        except Exception as e:
+            self.system_metrics["errors"] += 1
+            logger.error(f"Chat failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "session_id": session_id,
+                "timestamp": datetime.now().isoformat()
+            }
+    
+    async def _summarize_chat_turns(self, summary: str, turns: List[tuple]) -> str:
+        """Fold older chat turns into the running conversation summary"""
+        summary_prompt = build_chat_summary_prompt(summary, turns)
+        
+        response = await self._generate_content(
+            model=self.models["text"],
+            contents=summary_prompt,
+            config={
+                "temperature": 0.1,
+                "max_output_tokens": 512
+            }
+        )
+        return response.text
+    
     async def generate_image(self, prompt: str, config: Optional[Dict] = None) -> Dict[str, Any]:
         """Generate professional images using Gemini 2.5 Flash Image"""
         try:
@@ -87,26 +213,53 @@ class TRONGeminiEngine:
                 }
             }
             
+            # Post-processing operations are declared in config but never sent to the model
+            post_processing = None
             if config:
+                config = dict(config)
+                if "post_processing" in config:
+                    post_processing = image_postprocessor.validate(config.pop("post_processing"))
                 generation_config.update(config)
             
-            response = self.client.models.generate_content(
+            image_prompt = build_image_prompt(prompt, self.prompt_budgets.get("image_generation"))
+            prompt_tokens = self._measure_prompt("image_generation", image_prompt)
+            
+            response = await self._generate_content(
                 model=self.models["image_gen"],
                 contents=[{
                     "role": "user", 
-                    "parts": [{"text": f"Create a professional, high-quality image: {prompt}"}]
+                    "parts": [{"text": image_prompt}]
                 }],
                 config=generation_config
             )
             
+            # Persist images once; the response carries only URLs and metadata
+            images = []
+            for data, mime_type in extract_image_blobs(response):
+                processed = None
+                if post_processing:
+                    with span("image.post_process"):
+                        processed = await image_postprocessor.process(data, post_processing)
+                    data, mime_type = processed["data"], processed["mime_type"]
+                
+                with span("image.store"):
+                    image_info = await asyncio.to_thread(image_store.save, data, mime_type)
+                if processed:
+                    image_info["post_processing"] = {
+                        "metadata": processed["metadata"],
+                        "stage_timings": processed["stage_timings"]
+                    }
+                images.append(image_info)
+            
             # Track analytics
             response_time = (datetime.now() - start_time).total_seconds()
             self._track_metrics("image_creation", response_time)
             
             result = {
                 "success": True,
-                "images": response.images if hasattr(response, 'images') else [],
+                "images": images,
                 "prompt": prompt,
+                "prompt_tokens": prompt_tokens,
                 "model": self.models["image_gen"],
                 "processing_time": response_time,
                 "timestamp": datetime.now().isoformat()
@@ -115,7 +268,7 @@ class TRONGeminiEngine:
             # Log to database
             try:
                 await log_ai_request(
-                    request_id=str(uuid.uuid4()),
+                    request_id=current_request_id() or str(uuid.uuid4()),
                     capability="image_generation",
                     model=self.models["image_gen"],
                     prompt_text=prompt,
@@ -132,6 +285,10 @@ class TRONGeminiEngine:
             logger.info(f"Image generated successfully in {response_time:.2f}s")
             return result
             
+        except PipelineOverloadedError:
+            # Overload is a retryable condition for the caller, not a failed generation
+            self.system_metrics["errors"] += 1
+            raise
         except Exception as e:
             self.system_metrics["errors"] += 1
             logger.error(f"Image generation failed: {str(e)}")
@@ -146,10 +303,10 @@ class TRONGeminiEngine:
         try:
             start_time = datetime.now()
             
-            search_context = f"Context: {context}\n\n" if context else ""
-            research_prompt = f"{search_context}Research query: {query}\n\nProvide comprehensive, accurate information with sources."
+            research_prompt = build_research_prompt(query, context, self.prompt_budgets.get("web_research"))
+            prompt_tokens = self._measure_prompt("web_research", research_prompt)
             
-            response = self.client.models.generate_content(
+            response = await self._generate_content(
                 model=self.models["web_research"],
                 contents=research_prompt,
                 config={
@@ -168,6 +325,7 @@ class TRONGeminiEngine:
                 "query": query,
                 "results": response.text,
                 "context": context,
+                "prompt_tokens": prompt_tokens,
                 "model": self.models["web_research"],
                 "processing_time": response_time,
                 "timestamp": datetime.now().isoformat()
@@ -183,34 +341,37 @@ class TRONGeminiEngine:
                 "timestamp": datetime.now().isoformat()
             }
     
-    async def execute_code(self, code: str, language: str = "python", context: Optional[str] = None) -> Dict[str, Any]:
-        """Execute code in Python sandbox environment"""
+    async def execute_code(self, code: str, language: str = "python", context: Optional[str] = None,
+                           analyze: bool = False) -> Dict[str, Any]:
+        """
+        Execute Python code in the local worker pool when TRON_LOCAL_CODE_EXECUTION is enabled
+        The model is only called for analysis, or when the code cannot run locally
+        """
         try:
             start_time = datetime.now()
             
-            execution_context = f"Context: {context}\n\n" if context else ""
-            code_prompt = f"""{execution_context}Execute the following {language} code and provide detailed analysis:
-
-```{language}
-{code}
-```
-
-Please provide:
-1. Code execution results
-2. Performance analysis
-3. Optimization suggestions
-4. Error handling notes (if any)
-"""
-            
-            response = self.client.models.generate_content(
-                model=self.models["code_exec"],
-                contents=code_prompt,
-                config={
-                    "temperature": 0.1,
-                    "top_p": 0.9,
-                    "top_k": 40
-                }
-            )
+            execution = None
+            if language.lower() == "python" and code_executor.enabled:
+                with span("code.execute"):
+                    execution = await code_executor.execute(code)
+            
+            analysis = None
+            prompt_tokens = None
+            if analyze or execution is None:
+                code_prompt = build_code_prompt(code, language, context, execution,
+                                                self.prompt_budgets.get("code_execution"))
+                prompt_tokens = self._measure_prompt("code_execution", code_prompt)
+                
+                response = await self._generate_content(
+                    model=self.models["code_exec"],
+                    contents=code_prompt,
+                    config={
+                        "temperature": 0.1,
+                        "top_p": 0.9,
+                        "top_k": 40
+                    }
+                )
+                analysis = response.text
             
             response_time = (datetime.now() - start_time).total_seconds()
             self._track_metrics("code_execution", response_time)
@@ -219,10 +380,14 @@ Please provide:
                 "success": True,
                 "code": code,
                 "language": language,
-                "results": response.text,
+                "executed": execution is not None,
+                "execution": execution,
+                "analysis": analysis,
+                "results": analysis if analysis is not None else execution["stdout"],
                 "execution_time": response_time,
                 "context": context,
-                "model": self.models["code_exec"],
+                "prompt_tokens": prompt_tokens,
+                "model": self.models["code_exec"] if analysis is not None else "local",
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -242,15 +407,10 @@ Please provide:
         try:
             start_time = datetime.now()
             
-            task_prompt = f"""
-Task: {task_description}
-{'Target URL: ' + url if url else ''}
-
-Execute this web automation task using browser control capabilities.
-Provide step-by-step actions taken and results achieved.
-"""
+            task_prompt = build_browser_prompt(task_description, url, self.prompt_budgets.get("browser_control"))
+            prompt_tokens = self._measure_prompt("browser_control", task_prompt)
             
-            response = self.client.models.generate_content(
+            response = await self._generate_content(
                 model=self.models["computer_use"],
                 contents=[{
                     "role": "user", 
@@ -271,6 +431,7 @@ Provide step-by-step actions taken and results achieved.
                 "url": url,
                 "actions": getattr(response, 'actions', []),
                 "results": response.text if hasattr(response, 'text') else "Browser control executed",
+                "prompt_tokens": prompt_tokens,
                 "model": self.models["computer_use"],
                 "processing_time": response_time,
                 "timestamp": datetime.now().isoformat()
@@ -297,9 +458,9 @@ Provide step-by-step actions taken and results achieved.
             
             file_path = temp_dir / f"{filename}.{format_type}"
             
-            # Write content to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # PDF, DOCX and XLSX are rendered for real in the worker pool
+            with span("file.render"):
+                rendering = await file_renderer.render(content, file_path, format_type)
             
             response_time = (datetime.now() - start_time).total_seconds()
             self._track_metrics("file_creation", response_time)
@@ -310,7 +471,8 @@ Provide step-by-step actions taken and results achieved.
                 "format": format_type,
                 "file_path": str(file_path),
                 "download_url": f"/api/ultimate-ai/download/{file_path.name}",
-                "size_bytes": file_path.stat().st_size,
+                "size_bytes": rendering["size_bytes"],
+                "render_time": round(rendering["render_seconds"], 4),
                 "model": self.models["text"],
                 "processing_time": response_time,
                 "timestamp": datetime.now().isoformat()
@@ -327,20 +489,125 @@ Provide step-by-step actions taken and results achieved.
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def analyze_files(self, prompt: str, file_ids: List[str]) -> Dict[str, Any]:
+        """Analyze uploaded images and documents with the vision model"""
+        try:
+            start_time = datetime.now()
+            
+            paths = []
+            for file_id in file_ids:
+                path = resolve_upload(file_id)
+                if path is None:
+                    raise ValueError(f"Unknown upload: {file_id}")
+                paths.append(path)
+            
+            # Each distinct file content is transferred to the file API once and reused
+            with span("files.upload"):
+                handles = await asyncio.gather(*(upload_cache.get_or_upload(self.client, path) for path in paths))
+            
+            response = await self._generate_content(
+                model=self.models["vision"],
+                contents=[{
+                    "role": "user",
+                    "parts": [handle.to_part() for handle in handles] + [{"text": prompt}]
+                }],
+                config={
+                    "temperature": 0.2,
+                    "top_p": 0.9
+                }
+            )
+            
+            response_time = (datetime.now() - start_time).total_seconds()
+            self._track_metrics("vision_analysis", response_time)
+            
+            return {
+                "success": True,
+                "prompt": prompt,
+                "file_ids": file_ids,
+                "results": response.text,
+                "model": self.models["vision"],
+                "processing_time": response_time,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            self.system_metrics["errors"] += 1
+            logger.error(f"File analysis failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "file_ids": file_ids,
+                "timestamp": datetime.now().isoformat()
+            }
+    
+    async def analyze_dataset(self, file_id: str, question: Optional[str] = None,
+                              include_insights: bool = True) -> Dict[str, Any]:
+        """Summarize a large uploaded CSV/XLSX file and interpret the summary"""
+        try:
+            start_time = datetime.now()
+            
+            path = resolve_upload(file_id)
+            if path is None:
+                raise ValueError(f"Unknown upload: {file_id}")
+            
+            with span("dataset.aggregate"):
+                analysis = await dataset_analyzer.analyze(path)
+            
+            # Only the compact summary is sent to the model, never the rows
+            insights = None
+            if include_insights:
+                model_started = datetime.now()
+                analysis_prompt = build_dataset_prompt(analysis["summary"], question,
+                                                       self.prompt_budgets.get("data_analysis"))
+                response = await self._generate_content(
+                    model=self.models["thinking"],
+                    contents=analysis_prompt,
+                    config={
+                        "temperature": 0.2,
+                        "top_p": 0.9
+                    }
+                )
+                insights = response.text
+                analysis["throughput"]["stages"]["model"] = {
+                    "seconds": round((datetime.now() - model_started).total_seconds(), 4),
+                    "prompt_bytes": len(analysis_prompt),
+                    "prompt_tokens": self._measure_prompt("data_analysis", analysis_prompt)
+                }
+            
+            response_time = (datetime.now() - start_time).total_seconds()
+            self._track_metrics("data_analysis", response_time)
+            
+            return {
+                "success": True,
+                "file_id": file_id,
+                "summary": analysis["summary"],
+                "insights": insights,
+                "file_size_bytes": analysis["file_size_bytes"],
+                "throughput": analysis["throughput"],
+                "model": self.models["thinking"] if include_insights else "local",
+                "processing_time": response_time,
+                "timestamp": datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            self.system_metrics["errors"] += 1
+            logger.error(f"Dataset analysis failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "file_id": file_id,
+                "timestamp": datetime.now().isoformat()
+            }
+    
     async def live_interaction(self, interaction_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle real-time voice/video interactions"""
         try:
             start_time = datetime.now()
             
-            interaction_prompt = f"""
-Handle real-time {interaction_type} interaction:
-
-Data: {json.dumps(data, indent=2)}
-
-Provide immediate response and processing for this live interaction.
-"""
+            interaction_prompt = build_live_prompt(interaction_type, data, self.prompt_budgets.get("live_interactions"))
+            prompt_tokens = self._measure_prompt("live_interactions", interaction_prompt)
             
-            response = self.client.models.generate_content(
+            response = await self._generate_content(
                 model=self.models["live_audio"],
                 contents=[{
                     "role": "user", 
@@ -361,6 +628,7 @@ Provide immediate response and processing for this live interaction.
                 "interaction_type": interaction_type,
                 "response": response.text,
                 "data": data,
+                "prompt_tokens": prompt_tokens,
                 "model": self.models["live_audio"],
                 "processing_time": response_time,
                 "timestamp": datetime.now().isoformat()
@@ -376,24 +644,29 @@ Provide immediate response and processing for this live interaction.
                 "timestamp": datetime.now().isoformat()
             }
     
+    def open_live_session(self, interaction_type: str = "audio"):
+        """
+        Open a streaming live session with the native audio model
+        Returns an async context manager yielding the SDK session
+        """
+        return self.client.aio.live.connect(
+            model=self.models["live_audio"],
+            config={
+                "response_modalities": ["AUDIO"] if interaction_type == "audio" else ["TEXT"],
+                "temperature": 0.4,
+                "top_p": 0.9
+            }
+        )
+    
     async def execute_workflow(self, workflow_description: str, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Execute multi-task workflows combining all capabilities"""
         try:
             start_time = datetime.now()
             
-            workflow_prompt = f"""
-Execute the following multi-task workflow:
-
-Workflow: {workflow_description}
-
-Tasks to execute:
-{json.dumps(tasks, indent=2)}
-
-Coordinate all necessary AI capabilities to complete this workflow efficiently.
-Provide progress updates and final results.
-"""
+            workflow_prompt = build_workflow_prompt(workflow_description, tasks, self.prompt_budgets.get("workflows"))
+            prompt_tokens = self._measure_prompt("workflows", workflow_prompt)
             
-            response = self.client.models.generate_content(
+            response = await self._generate_content(
                 model=self.models["thinking"],
                 contents=[{
                     "role": "user", 
@@ -421,6 +694,7 @@ Provide progress updates and final results.
                 "tasks": tasks,
                 "results": response.text,
                 "task_count": len(tasks),
+                "prompt_tokens": prompt_tokens,
                 "model": self.models["thinking"],
                 "processing_time": response_time,
                 "timestamp": datetime.now().isoformat()
@@ -436,11 +710,13 @@ Provide progress updates and final results.
                 "timestamp": datetime.now().isoformat()
             }
     
-    def _track_metrics(self, capability: str, response_time: float):
-        """Internal method to track system performance metrics"""
+    def _track_metrics(self, capability: str, response_time: Optional[float]):
+        """Internal method to track system performance metrics; None counts usage only"""
         self.system_metrics["total_requests"] += 1
         if capability in self.system_metrics["capability_usage"]:
             self.system_metrics["capability_usage"][capability] += 1
+        if response_time is None:
+            return
         self.system_metrics["response_times"].append(response_time)
         
         # Keep only last 1000 response times for memory efficiency
@@ -469,6 +745,24 @@ Provide progress updates and final results.
                 },
                 "models_status": {name: "active" for name in self.models.keys()},
                 "capabilities_status": self.capabilities.__dict__,
+                "image_pipeline": image_postprocessor.get_metrics(),
+                "live_streaming": live_metrics.snapshot(),
+                "chat_sessions": chat_sessions.get_metrics(),
+                "file_upload_cache": upload_cache.get_metrics(),
+                "code_execution_pool": code_executor.get_metrics(),
+                "file_rendering": file_renderer.get_metrics(),
+                "response_compression": compression_metrics.snapshot(),
+                "logging": logging_pipeline.get_metrics(),
+                "tracing": tracer.get_metrics(),
+                "event_loop": loop_monitor.get_metrics(),
+                "tenant_scheduler": tenant_scheduler.get_metrics(),
+                "idempotency": idempotency_metrics.snapshot(idempotency_store),
+                "deadlines": deadline_metrics.get_metrics(),
+                "health": health_prober.get_metrics(),
+                "prompt_tokens": {
+                    capability: {**usage, "budget": self.prompt_budgets.get(capability)}
+                    for capability, usage in self.prompt_usage.items()
+                },
                 "timestamp": datetime.now().isoformat()
             }
             
@@ -481,6 +775,11 @@ Provide progress updates and final results.
     
     def get_capability_info(self) -> Dict[str, Any]:
         """Get detailed information about available capabilities"""
+        if self._capability_info is None:
+            self._capability_info = self._build_capability_info()
+        return self._capability_info
+    
+    def _build_capability_info(self) -> Dict[str, Any]:
         return {
             "engine_info": {
                 "name": "TRON Ultimate AI Engine",
@@ -506,9 +805,11 @@ Provide progress updates and final results.
                     "features": ["Live Search", "Source Verification", "Context Analysis"]
                 },
                 "code_execution": {
-                    "description": "Code execution with Python sandbox",
+                    "description": "Local Python execution in isolated single-use workers with optional model analysis"
+                                   if code_executor.enabled else "Model-based code analysis (local execution disabled)",
                     "model": self.models["code_exec"],
-                    "features": ["Multi-language Support", "Debugging", "Optimization"]
+                    "features": ["Single-Use Workers", "Streaming Output", "Resource Limits", "Optimization"]
+                                if code_executor.enabled else ["Code Analysis", "Optimization"]
                 },
                 "browser_control": {
                     "description": "Browser automation and web interaction",
@@ -518,7 +819,17 @@ Provide progress updates and final results.
                 "file_creation": {
                     "description": "File creation in any format with downloads",
                     "model": self.models["text"],
-                    "features": ["Multiple Formats", "Auto-download", "Temp Storage"]
+                    "features": ["PDF", "DOCX", "XLSX", "Text Formats", "Auto-download"]
+                },
+                "vision_analysis": {
+                    "description": "Image and document understanding over uploaded files",
+                    "model": self.models["vision"],
+                    "features": ["Images", "PDF Documents", "Upload Reuse"]
+                },
+                "data_analysis": {
+                    "description": "Chunked statistical summaries of large CSV/XLSX uploads",
+                    "model": self.models["thinking"],
+                    "features": ["Multi-GB Files", "Parallel Aggregation", "Bounded Memory"]
                 },
                 "live_interactions": {
                     "description": "Real-time voice and video interactions",
@@ -116,6 +116,9 @@ export class UltimateAIService {
   private readonly baseUrl = '/api/ultimate-ai';
   private readonly apiUrl = '/api';
 
+  // Results omit the inputs this client just sent
+  private readonly compactQuery = '?compact=true';
+
   // Try multiple API URL patterns for flexibility
   private readonly apiUrls = [
     '/.netlify/functions/api',  // Netlify Functions (primary)
@@ -187,7 +190,7 @@ export class UltimateAIService {
    * Image generation using Gemini 2.5 Flash Image
    */
   async generateImages(config: ImageGenerationConfig): Promise<APIResponse> {
-    return this.makeRequest('/generate-image', {
+    return this.makeRequest(`/generate-image${this.compactQuery}`, {
       method: 'POST',
       body: JSON.stringify(config),
     });
@@ -197,7 +200,7 @@ export class UltimateAIService {
    * Web research with Google Search grounding
    */
   async researchWeb(config: WebResearchConfig): Promise<APIResponse> {
-    return this.makeRequest('/research-web', {
+    return this.makeRequest(`/research-web${this.compactQuery}`, {
       method: 'POST',
       body: JSON.stringify(config),
     });
@@ -207,7 +210,7 @@ export class UltimateAIService {
    * Code execution in Python sandbox
    */
   async executeCode(config: CodeExecutionConfig): Promise<APIResponse> {
-    return this.makeRequest('/execute-code', {
+    return this.makeRequest(`/execute-code${this.compactQuery}`, {
       method: 'POST',
       body: JSON.stringify(config),
     });
@@ -217,7 +220,7 @@ export class UltimateAIService {
    * Browser automation and control
    */
   async controlBrowser(config: BrowserControlConfig): Promise<APIResponse> {
-    return this.makeRequest('/control-browser', {
+    return this.makeRequest(`/control-browser${this.compactQuery}`, {
       method: 'POST',
       body: JSON.stringify(config),
     });
@@ -237,7 +240,7 @@ export class UltimateAIService {
    * Real-time voice/video interactions
    */
   async liveInteraction(config: LiveInteractionConfig): Promise<APIResponse> {
-    return this.makeRequest('/live-interaction', {
+    return this.makeRequest(`/live-interaction${this.compactQuery}`, {
       method: 'POST',
       body: JSON.stringify(config),
     });
@@ -247,7 +250,7 @@ export class UltimateAIService {
    * Multi-task workflow execution
    */
   async executeWorkflow(config: WorkflowConfig): Promise<APIResponse> {
-    return this.makeRequest('/execute-workflow', {
+    return this.makeRequest(`/execute-workflow${this.compactQuery}`, {
       method: 'POST',
       body: JSON.stringify(config),
     });
@@ -1,248 +1,40 @@
 # Getron Netlify Function - Main FastAPI Endpoint
-# This handles all FastAPI routes in a Netlify Function
+# Runs the real backend application (backend/main.py) inside the function handler.
+#
+# The first invocation of a container imports the backend and runs its startup;
+# warm invocations reuse the same app, engine, worker pools and database client.
 
-import json
 import os
-from urllib.parse import parse_qs, urlparse
+import sys
+from pathlib import Path
 
-# Mock FastAPI app for Netlify Functions
-class MockFastAPI:
-    def __init__(self):
-        self.routes = {}
-        self.middleware = []
-    
-    def get(self, path):
-        def decorator(func):
-            self.routes[('GET', path)] = func
-            return func
-        return decorator
-    
-    def post(self, path):
-        def decorator(func):
-            self.routes[('POST', path)] = func
-            return func
-        return decorator
-    
-    def run(self):
-        pass
+BACKEND_DIR = Path(os.getenv("TRON_BACKEND_DIR", Path(__file__).resolve().parents[3] / "backend"))
+sys.path.insert(0, str(BACKEND_DIR))
 
-app = MockFastAPI()
+# The function bundle is read-only outside /tmp
+os.environ.setdefault("TRON_LOG_FILE", "/tmp/tron_ai_backend.log")
 
-# Import Gemini functionality
-import sys
-sys.path.append('/opt/python')
+from serverless_adapter import ServerlessASGIAdapter
 
-# Health check endpoint
-@app.get("/api/health")
-def health_check():
-    return {
-        "status": "healthy",
-        "platform": "Getron - Ultimate AI Platform",
-        "timestamp": "2025-11-02T16:31:34Z",
-        "version": "2.0.0",
-        "services": {
-            "gemini": "available",
-            "supabase": "available"
-        }
-    }
 
-# Main API endpoint
-@app.get("/api")
-def api_root():
-    return {
-        "name": "Getron - Ultimate AI Platform API",
-        "version": "2.0.0", 
-        "description": "Pure class AI agent platform with 8 specialized Gemini models",
-        "endpoints": {
-            "health": "/api/health",
-            "gemini": "/api/gemini/*",
-            "analytics": "/api/analytics/*"
-        },
-        "documentation": "Available at deployed URL",
-        "timestamp": "2025-11-02T16:31:34Z"
-    }
+def _create_app():
+    # Deferred so importing this module stays cheap; the backend loads on first request
+    from main import app
+    return app
 
-# Gemini AI endpoint (placeholder for actual Gemini integration)
-@app.post("/api/gemini/generate")
-def gemini_generate():
-    # This would contain the actual Gemini API integration
-    # For now, return a placeholder response
-    return {
-        "status": "success",
-        "message": "Gemini AI integration ready",
-        "model": "gemini-1.5-pro",
-        "response": "Getron AI platform is running with Gemini integration!"
-    }
 
-# Analytics endpoint
-@app.post("/api/analytics/track")
-def track_analytics():
-    return {
-        "status": "success", 
-        "message": "Analytics tracking ready",
-        "database": "supabase"
-    }
+# Paths served by the previous placeholder function, kept for existing clients
+LEGACY_PATHS = {
+    "/api": "/api/status",
+    "/api/health": "/health",
+    "/analytics": "/api/ultimate-ai/analytics",
+    "/api/analytics": "/api/ultimate-ai/analytics"
+}
 
-# Netlify Function Handler
-def handler(event, context):
-    """
-    Main handler for Netlify Function
-    Processes HTTP requests and routes to appropriate endpoints
-    """
-    
-    try:
-        # Parse request
-        http_method = event.get('httpMethod', 'GET')
-        path = event.get('path', '/')
-        query_params = event.get('queryStringParameters', {}) or {}
-        body = event.get('body', '')
-        headers = event.get('headers', {})
-        
-        # Parse body if present
-        request_data = {}
-        if body and body.strip():
-            try:
-                request_data = json.loads(body)
-            except:
-                request_data = {}
-        
-        # Add query params and body to request data
-        request_data.update(query_params)
-        
-        # Find matching route
-        route_key = (http_method, path)
-        
-        if route_key in app.routes:
-            # Execute route handler
-            response_data = app.routes[route_key]()
-            
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-                },
-                'body': json.dumps(response_data)
-            }
-        else:
-            # Route not found
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Route not found',
-                    'path': path,
-                    'method': http_method,
-                    'available_routes': list(app.routes.keys())
-                })
-            }
-            
-    except Exception as e:
-        # Error handling
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'error': 'Internal server error',
-                'message': str(e),
-                'timestamp': '2025-11-02T16:31:34Z'
-            })
-        }
+# Direct calls arrive under the function path; redirected /api/* calls keep their original path
+adapter = ServerlessASGIAdapter(_create_app, strip_prefix="/.netlify/functions/api", path_aliases=LEGACY_PATHS)
 
-# Handle CORS preflight requests
-def handler(event, context):
-    """
-    Handle CORS preflight and main requests
-    """
-    
-    # Handle OPTIONS requests (CORS preflight)
-    if event.get('httpMethod') == 'OPTIONS':
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-            },
-            'body': ''
-        }
-    
-    # Handle main requests
-    return _handle_request(event, context)
 
-def _handle_request(event, context):
-    """Main request handler"""
-    try:
-        # Parse request
-        http_method = event.get('httpMethod', 'GET')
-        path = event.get('path', '/')
-        query_params = event.get('queryStringParameters', {}) or {}
-        body = event.get('body', '')
-        headers = event.get('headers', {})
-        
-        # Parse body if present
-        request_data = {}
-        if body and body.strip():
-            try:
-                request_data = json.loads(body)
-            except:
-                request_data = {}
-        
-        # Add query params and body to request data
-        request_data.update(query_params)
-        
-        # Find matching route
-        route_key = (http_method, path)
-        
-        if route_key in app.routes:
-            # Execute route handler
-            response_data = app.routes[route_key]()
-            
-            return {
-                'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*',
-                    'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-                    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-                },
-                'body': json.dumps(response_data)
-            }
-        else:
-            # Route not found
-            return {
-                'statusCode': 404,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
-                    'error': 'Route not found',
-                    'path': path,
-                    'method': http_method,
-                    'available_routes': list(app.routes.keys())
-                })
-            }
-            
-    except Exception as e:
-        # Error handling
-        return {
-            'statusCode': 500,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
-            'body': json.dumps({
-                'error': 'Internal server error',
-                'message': str(e),
-                'timestamp': '2025-11-02T16:31:34Z'
-            })
-        }
\ No newline at end of file
+def handler(event, context):
+    """Netlify Function entry point"""
+    return adapter.handle(event, context)